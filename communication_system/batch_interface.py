@@ -0,0 +1,29 @@
+import argparse
+import os
+from modules.communication_module.batch_runner import DEFAULT_PARALLELISM, run_batch
+
+# OpenAI API Key - typically this would be stored securely or passed as an environment variable
+api_key = os.environ.get("OPENAI_API_KEY", "")
+
+def main():
+    parser = argparse.ArgumentParser(description="Answer a JSONL file of questions through the encrypted assistants")
+    parser.add_argument("input", help="JSONL with one {\"question\": ...} object per line")
+    parser.add_argument("output", help="JSONL results; rerun with the same file to resume")
+    parser.add_argument("--parallelism", type=int, default=DEFAULT_PARALLELISM,
+                        help="Questions in flight at once; the concurrent runs cap (default 8) is raised to match")
+    parser.add_argument("--method", default="1", help="Encryption method for items that do not set one")
+    parser.add_argument("--approach", default="1", help="Assistant approach for items that do not set one")
+    parser.add_argument("--min-unchanged-weight", type=float, default=None,
+                        help="Approach 3 weight for items that do not set one (default 50.0)")
+    parser.add_argument("--profile-table", default="distortion_profiles.json")
+    parser.add_argument("--assistant-registry", default="assistant_registry.json")
+    parser.add_argument("--base-url", default=None, help="OpenAI-compatible endpoint, e.g. openai_stub_server.py")
+    parser.add_argument("--metrics", default=None, help="Write aggregate metrics here (.prom or JSON)")
+    args = parser.parse_args()
+
+    run_batch(api_key, args.input, args.output, args.parallelism, args.method, args.approach,
+              args.min_unchanged_weight, args.profile_table, args.base_url, args.metrics,
+              args.assistant_registry)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+import numpy as np
+from ga.distortionFuntions import DISTORTION_TYPES, assign_distortions, distort_text
+from benchmarks.bench_utils import measure, result, sample_text
+
+TEXT_LENGTHS = [64, 256, 1024, 4096]
+
+# Weight profiles from light to heavy distortion (percentages summing to 100)
+WEIGHT_PROFILES = {
+    "light": dict(zip(DISTORTION_TYPES, [86, 2, 2, 2, 2, 2, 2, 2])),
+    "balanced": dict(zip(DISTORTION_TYPES, [50, 7, 7, 8, 7, 7, 7, 7])),
+    "heavy": dict(zip(DISTORTION_TYPES, [16, 12, 12, 12, 12, 12, 12, 12]))
+}
+
+def run(quick=False):
+    """Benchmark distort_text and assign_distortions across text lengths and weight profiles"""
+    lengths = TEXT_LENGTHS[:2] if quick else TEXT_LENGTHS
+    repeat = 3 if quick else 7
+    results = []
+    for length in lengths:
+        text = sample_text(length)
+        for profile, weights in WEIGHT_PROFILES.items():
+            params = {"text_length": length, "profile": profile}
+            for name, function in (("distort_text", distort_text), ("assign_distortions", assign_distortions)):
+                rng = np.random.default_rng(0)
+                stats = measure(lambda: function(text, weights, rng=rng), repeat=repeat)
+                stats["chars_per_sec"] = stats["ops_per_sec"] * length
+                results.append(result("distortion", name, params, stats))
+    return results
@@ -0,0 +1,32 @@
+from modules.communication_module.communication_encryptor import (
+    ENCRYPTION_METHODS,
+    encrypt_question,
+    encrypt_questions,
+    generate_encryption_keys
+)
+from benchmarks.bench_utils import measure, result, sample_text
+
+PAYLOAD_SIZES = [16, 256, 4096, 65536]
+BATCH_SIZE = 100
+
+def run(quick=False):
+    """Benchmark every cipher in communication_encryptor across payload sizes"""
+    sizes = PAYLOAD_SIZES[:3] if quick else PAYLOAD_SIZES
+    repeat = 3 if quick else 7
+    keys = generate_encryption_keys()
+    results = []
+    for method, name in ENCRYPTION_METHODS.items():
+        for size in sizes:
+            payload = sample_text(size)
+            stats = measure(lambda: encrypt_question(payload, method, keys), repeat=repeat)
+            stats["bytes_per_sec"] = stats["ops_per_sec"] * size
+            results.append(result("encryption", name, {"payload_bytes": size}, stats))
+
+        # Many messages under one key: one call per message against one batch call
+        payloads = [sample_text(256)[i:] + str(i) for i in range(BATCH_SIZE)]
+        params = {"payload_bytes": 256, "messages": BATCH_SIZE}
+        stats = measure(lambda: [encrypt_question(payload, method, keys) for payload in payloads], repeat=repeat)
+        results.append(result("encryption", f"{name} loop", params, stats))
+        stats = measure(lambda: encrypt_questions(payloads, method, keys), repeat=repeat)
+        results.append(result("encryption", f"{name} batch", params, stats))
+    return results
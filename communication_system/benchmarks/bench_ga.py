@@ -0,0 +1,52 @@
+import time
+from ga.fitnessBackends import NgramPrivacyBackend, TableInversionUsabilityBackend
+from ga.gaDistorter import GeneticTextDistorter
+from modules.communication_module.communication_encryptor import generate_encryption_keys
+from modules.instruction_module.instruction_module import generate_text_key_guide_text
+from benchmarks.bench_utils import result
+
+POPULATION_SIZES = [10, 30, 100]
+GENERATION_COUNTS = [5, 20]
+
+def run(quick=False):
+    """Benchmark full GeneticTextDistorter.train runs with the local fitness backends.
+
+    The n-gram privacy and table-inversion usability backends stand in for the
+    OpenAI calls, so the numbers measure the GA itself rather than the network.
+    """
+    populations = POPULATION_SIZES[:2] if quick else POPULATION_SIZES
+    generation_counts = GENERATION_COUNTS[:1] if quick else GENERATION_COUNTS
+    repeat = 2 if quick else 5
+    text = generate_text_key_guide_text("2", generate_encryption_keys())
+    results = []
+    for population_size in populations:
+        for generations in generation_counts:
+            samples = []
+            for seed in range(repeat):
+                distorter = GeneticTextDistorter(
+                    api_key=None,
+                    population_size=population_size,
+                    seed=seed,
+                    min_unchanged_weight=50.0,
+                    privacy_backend=NgramPrivacyBackend(),
+                    usability_backend=TableInversionUsabilityBackend()
+                )
+                start = time.perf_counter()
+                training = distorter.train(text, generations=generations)
+                samples.append((time.perf_counter() - start, training))
+
+            seconds = sorted(elapsed for elapsed, _ in samples)
+            mean = sum(seconds) / len(seconds)
+            evaluations = sum(training['stopping']['evaluations'] for _, training in samples) / len(samples)
+            stats = {
+                "samples": repeat,
+                "mean_ms": mean * 1000,
+                "min_ms": seconds[0] * 1000,
+                "max_ms": seconds[-1] * 1000,
+                "ms_per_generation": mean * 1000 / generations,
+                "evaluations_per_sec": evaluations / mean,
+                "mean_reward": sum(training['reward'] for _, training in samples) / len(samples)
+            }
+            params = {"population_size": population_size, "generations": generations}
+            results.append(result("ga", "train", params, stats))
+    return results
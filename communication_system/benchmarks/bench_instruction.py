@@ -0,0 +1,20 @@
+from modules.instruction_module.instruction_module import hex_to_text, number_to_words
+from benchmarks.bench_utils import measure, result
+
+# Hex lengths of the DES key, the ChaCha20 nonce and the AES/ChaCha20 keys
+HEX_LENGTHS = [16, 24, 64]
+
+def run(quick=False):
+    """Benchmark the key-to-words helpers used to build guide texts"""
+    repeat = 3 if quick else 7
+    results = []
+    for length in HEX_LENGTHS:
+        hex_str = ("0123456789abcdef" * (length // 16 + 1))[:length]
+        stats = measure(lambda: hex_to_text(hex_str), repeat=repeat)
+        results.append(result("instruction", "hex_to_text", {"hex_length": length}, stats))
+
+    # Every Caesar shift the key generator can produce
+    stats = measure(lambda: [number_to_words(n) for n in range(1, 26)], repeat=repeat)
+    stats["words_per_sec"] = stats["ops_per_sec"] * 25
+    results.append(result("instruction", "number_to_words", {"values": "1-25"}, stats))
+    return results
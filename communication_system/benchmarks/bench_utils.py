@@ -0,0 +1,51 @@
+import statistics
+import time
+
+def measure(function, repeat=7, min_time=0.05, max_number=100000):
+    """Time function() and return latency and throughput statistics.
+
+    The call count per sample is calibrated so one sample takes at least
+    min_time seconds; the statistics are per call across repeat samples.
+    """
+    # Warm up caches and calibrate the number of calls per sample
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or number >= max_number:
+            break
+        number = min(max_number, number * 10 if elapsed < min_time / 10 else number * 2)
+
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        samples.append((time.perf_counter() - start) / number)
+
+    samples.sort()
+    mean = statistics.fmean(samples)
+    return {
+        "calls_per_sample": number,
+        "samples": repeat,
+        "mean_ms": mean * 1000,
+        "median_ms": statistics.median(samples) * 1000,
+        "min_ms": samples[0] * 1000,
+        "max_ms": samples[-1] * 1000,
+        "stdev_ms": statistics.stdev(samples) * 1000 if repeat > 1 else 0.0,
+        "ops_per_sec": 1 / mean if mean > 0 else float("inf")
+    }
+
+def result(suite, name, params, stats, **extra):
+    """Build one benchmark record for the results file"""
+    record = {"suite": suite, "name": name, "params": params, "stats": stats}
+    record.update(extra)
+    return record
+
+def sample_text(length):
+    """Guide-text-like input of roughly length characters"""
+    base = ("Understand my encrypted query using a [ Data Encryption Standard ] cipher in "
+            "[ Electronic Code Book ] mode. Key: [ One Two Alpha Bravo ] [ Nine Echo Four Delta ]. ")
+    return (base * (length // len(base) + 1))[:length]
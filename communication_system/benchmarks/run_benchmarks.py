@@ -0,0 +1,89 @@
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+import numpy as np
+from benchmarks import bench_distortion, bench_encryption, bench_ga, bench_instruction
+
+SUITES = {
+    "distortion": bench_distortion,
+    "encryption": bench_encryption,
+    "instruction": bench_instruction,
+    "ga": bench_ga
+}
+
+def git_revision():
+    """Current commit hash, or None outside a git checkout"""
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def result_key(record):
+    return (record["suite"], record["name"], json.dumps(record["params"], sort_keys=True))
+
+def compare(results, baseline_path, threshold):
+    """Print the change in mean latency against a previous results file; return the regressions"""
+    with open(baseline_path, "r") as f:
+        baseline = {result_key(record): record for record in json.load(f)["results"]}
+
+    regressions = []
+    for record in results:
+        previous = baseline.get(result_key(record))
+        if previous is None:
+            continue
+        ratio = record["stats"]["mean_ms"] / previous["stats"]["mean_ms"]
+        label = f"{record['suite']}/{record['name']} {record['params']}"
+        print(f"{label}: {previous['stats']['mean_ms']:.4f} ms -> {record['stats']['mean_ms']:.4f} ms ({ratio:.2f}x)")
+        if ratio > 1 + threshold:
+            regressions.append(label)
+    return regressions
+
+def run_benchmarks(suites, quick=False):
+    """Run the named suites and return the results document"""
+    results = []
+    for name in suites:
+        print(f"Running {name} benchmarks...")
+        start = time.perf_counter()
+        results.extend(SUITES[name].run(quick=quick))
+        print(f"  done in {time.perf_counter() - start:.1f}s")
+
+    return {
+        "metadata": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "git_revision": git_revision(),
+            "python": sys.version.split()[0],
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "processor": platform.processor(),
+            "quick": quick
+        },
+        "results": results
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the distortion, encryption and GA hot paths")
+    parser.add_argument("--suites", nargs="+", choices=list(SUITES), default=list(SUITES))
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--quick", action="store_true", help="Fewer sizes and samples, for a smoke run")
+    parser.add_argument("--compare", default=None, help="Previous results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="Relative slowdown reported as a regression with --compare")
+    args = parser.parse_args()
+
+    document = run_benchmarks(args.suites, args.quick)
+    with open(args.output, "w") as f:
+        json.dump(document, f, indent=2)
+    print(f"Wrote {len(document['results'])} results to {args.output}")
+
+    if args.compare is not None:
+        regressions = compare(document["results"], args.compare, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s) above {args.threshold:.0%}")
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+import argparse
+import os
+from modules.communication_module.batch_runner import DEFAULT_PARALLELISM
+from modules.evaluation_module.evaluation_runner import DEFAULT_MIN_UNCHANGED_WEIGHTS, run_evaluation
+
+# OpenAI API Key - typically this would be stored securely or passed as an environment variable
+api_key = os.environ.get("OPENAI_API_KEY", "")
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Measure decryption success rate and response time per approach, cipher and distortion level")
+    parser.add_argument("--output", default="evaluation_results.parquet",
+                        help="Results table (.parquet needs pyarrow, otherwise CSV is written)")
+    parser.add_argument("--checkpoint", default=None,
+                        help="JSONL of raw results used to resume (default: output with a .jsonl suffix)")
+    parser.add_argument("--questions", default=None, help="JSONL of {\"question\", \"expected\"} objects")
+    parser.add_argument("--approaches", nargs="+", default=None, help="Assistant approaches (default: all)")
+    parser.add_argument("--methods", nargs="+", default=None, help="Encryption method keys (default: all)")
+    parser.add_argument("--min-unchanged-weights", type=float, nargs="+", default=DEFAULT_MIN_UNCHANGED_WEIGHTS,
+                        help="Approach 3 distortion levels")
+    parser.add_argument("--repeats", type=int, default=1, help="Trials per question in each cell")
+    parser.add_argument("--parallelism", type=int, default=DEFAULT_PARALLELISM,
+                        help="Trials in flight at once; the concurrent runs cap (default 8) is raised to match")
+    parser.add_argument("--profile-table", default="distortion_profiles.json")
+    parser.add_argument("--assistant-registry", default="assistant_registry.json")
+    parser.add_argument("--base-url", default=None, help="OpenAI-compatible endpoint, e.g. openai_stub_server.py")
+    parser.add_argument("--metrics", default=None, help="Write aggregate metrics here (.prom or JSON)")
+    args = parser.parse_args()
+
+    run_evaluation(api_key, args.output, args.questions, args.approaches, args.methods,
+                   args.min_unchanged_weights, args.repeats, args.parallelism, args.checkpoint,
+                   args.profile_table, args.base_url, args.metrics, args.assistant_registry)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,356 @@
+import asyncio
+import inspect
+import random
+import threading
+import time
+import weakref
+from typing import Any, Callable, Dict, Optional
+import openai
+from .metrics import METRICS
+
+# Errors worth retrying: rate limits, server errors and dropped connections
+RETRYABLE_ERRORS = (
+    openai.RateLimitError,
+    openai.InternalServerError,
+    openai.APIConnectionError
+)
+
+# Concurrent in-flight requests allowed per endpoint (None = no cap)
+DEFAULT_ENDPOINT_LIMITS = {
+    "embeddings": 8,
+    "chat.completions": 16,
+    "beta.threads.runs": 8
+}
+
+class TokenBucket:
+    """Thread-safe token bucket refilled continuously at a per-minute rate.
+
+    reserve() takes the tokens straight away, letting the level go negative, and
+    returns how long the caller must wait before using them. Callers are therefore
+    served in arrival order without holding a lock while they sleep.
+    """
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self._level = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float) -> float:
+        """Take amount tokens and return the wait in seconds before they are available"""
+        with self._lock:
+            now = time.monotonic()
+            self._level = min(self.capacity, self._level + (now - self._updated) * self.rate)
+            self._updated = now
+
+            # A single request larger than the bucket still goes through once it is full
+            self._level -= min(amount, self.capacity)
+            return max(0.0, -self._level / self.rate)
+
+def estimate_tokens(kwargs: Dict[str, Any]) -> int:
+    """Rough token count of a request (about four characters per token) plus its completion budget"""
+    characters = 0
+    inputs = kwargs.get("input")
+    if isinstance(inputs, str):
+        characters += len(inputs)
+    elif inputs is not None:
+        characters += sum(len(item) for item in inputs if isinstance(item, str))
+    for message in kwargs.get("messages") or []:
+        if isinstance(message.get("content"), str):
+            characters += len(message["content"])
+    if isinstance(kwargs.get("content"), str):
+        characters += len(kwargs["content"])
+    return characters // 4 + int(kwargs.get("max_tokens") or 0)
+
+class RequestScheduler:
+    """Process-wide limiter for OpenAI requests.
+
+    Every request takes one token from the requests-per-minute bucket and its
+    estimated size from the tokens-per-minute bucket, waits for a per-endpoint
+    concurrency slot and is retried with jittered exponential backoff on rate
+    limits and transient errors. The last error is raised once max_retries is used
+    up, so callers never mistake a throttled request for a real result.
+    """
+
+    def __init__(self, requests_per_minute: Optional[float] = 500,
+                 tokens_per_minute: Optional[float] = 200000,
+                 endpoint_limits: Optional[Dict[str, Optional[int]]] = None,
+                 max_retries: int = 6,
+                 base_delay: float = 0.5,
+                 max_delay: float = 30.0):
+        self.request_bucket = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.token_bucket = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.endpoint_limits = dict(DEFAULT_ENDPOINT_LIMITS if endpoint_limits is None else endpoint_limits)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.requests = 0
+        self.retries = 0
+        self.failures = 0
+        self.throttled_seconds = 0.0
+        self._lock = threading.Lock()
+        self._thread_slots = {}
+        # asyncio semaphores belong to one event loop, so they are kept per loop
+        self._loop_slots = weakref.WeakKeyDictionary()
+
+    def _limit(self, endpoint: str) -> Optional[int]:
+        """Concurrency cap for endpoint, matching the longest configured prefix"""
+        parts = endpoint.split(".")
+        for depth in range(len(parts), 0, -1):
+            prefix = ".".join(parts[:depth])
+            if prefix in self.endpoint_limits:
+                return self.endpoint_limits[prefix]
+        return None
+
+    def raise_endpoint_limit(self, prefix: str, limit: int) -> None:
+        """Allow at least limit concurrent requests under prefix; an uncapped prefix stays uncapped.
+
+        Slots already handed out keep their old size until the requests holding
+        them finish; new requests use the raised cap.
+        """
+        with self._lock:
+            current = self._limit(prefix)
+            if current is None or current >= limit:
+                return
+            self.endpoint_limits[prefix] = limit
+
+            def covered(endpoint):
+                return endpoint == prefix or endpoint.startswith(prefix + ".")
+            self._thread_slots = {e: s for e, s in self._thread_slots.items() if not covered(e)}
+            for slots in list(self._loop_slots.values()):
+                for endpoint in [e for e in slots if covered(e)]:
+                    del slots[endpoint]
+
+    def _thread_slot(self, endpoint: str) -> Optional[threading.BoundedSemaphore]:
+        limit = self._limit(endpoint)
+        if limit is None:
+            return None
+        with self._lock:
+            if endpoint not in self._thread_slots:
+                self._thread_slots[endpoint] = threading.BoundedSemaphore(limit)
+            return self._thread_slots[endpoint]
+
+    def _loop_slot(self, endpoint: str) -> Optional[asyncio.Semaphore]:
+        limit = self._limit(endpoint)
+        if limit is None:
+            return None
+        slots = self._loop_slots.setdefault(asyncio.get_running_loop(), {})
+        if endpoint not in slots:
+            slots[endpoint] = asyncio.Semaphore(limit)
+        return slots[endpoint]
+
+    def _admission_delay(self, endpoint: str, tokens: int) -> float:
+        """Reserve rate budget for one request and return how long to wait for it"""
+        delay = 0.0
+        if self.request_bucket is not None:
+            delay = max(delay, self.request_bucket.reserve(1))
+        if self.token_bucket is not None:
+            delay = max(delay, self.token_bucket.reserve(tokens))
+        with self._lock:
+            self.requests += 1
+            self.throttled_seconds += delay
+        if delay > 0:
+            METRICS.count("api_throttled_seconds", delay, endpoint=endpoint)
+        return delay
+
+    def _retry_delay(self, endpoint: str, error: Exception, attempt: int) -> Optional[float]:
+        """Backoff before the next attempt, or None when the error should be raised"""
+        if not isinstance(error, RETRYABLE_ERRORS) or attempt >= self.max_retries:
+            with self._lock:
+                self.failures += 1
+            METRICS.count("api_failures", endpoint=endpoint, error=type(error).__name__)
+            return None
+
+        # Full jitter keeps concurrent callers from retrying in lockstep
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+        response = getattr(error, "response", None)
+        retry_after = response.headers.get("retry-after") if response is not None else None
+        try:
+            delay = max(delay, min(self.max_delay, float(retry_after)))
+        except (TypeError, ValueError):
+            pass
+        with self._lock:
+            self.retries += 1
+        METRICS.count("api_retries", endpoint=endpoint, error=type(error).__name__)
+        return delay
+
+    def _completed(self, endpoint: str, start: float, result: Any) -> Any:
+        """Record a successful request, including its retries and throttling, and return its result"""
+        if METRICS.enabled:
+            METRICS.record("api_request", time.perf_counter() - start, start=start, endpoint=endpoint)
+            METRICS.count("api_calls", endpoint=endpoint)
+            usage = getattr(result, "usage", None)
+            if getattr(usage, "total_tokens", None) is not None:
+                METRICS.count("api_tokens", usage.total_tokens, endpoint=endpoint)
+        return result
+
+    def call(self, endpoint: str, function: Callable, *args, **kwargs) -> Any:
+        """Run a blocking request under the rate limits, retrying transient failures"""
+        tokens = estimate_tokens(kwargs)
+        slot = self._thread_slot(endpoint)
+        start = time.perf_counter()
+        attempt = 0
+        while True:
+            time.sleep(self._admission_delay(endpoint, tokens))
+            try:
+                if slot is None:
+                    result = function(*args, **kwargs)
+                else:
+                    with slot:
+                        result = function(*args, **kwargs)
+            except Exception as e:
+                delay = self._retry_delay(endpoint, e, attempt)
+                if delay is None:
+                    raise
+            else:
+                return self._completed(endpoint, start, result)
+            time.sleep(delay)
+            attempt += 1
+
+    async def acall(self, endpoint: str, function: Callable, *args, **kwargs) -> Any:
+        """Await a request under the rate limits, retrying transient failures"""
+        tokens = estimate_tokens(kwargs)
+        slot = self._loop_slot(endpoint)
+        start = time.perf_counter()
+        attempt = 0
+        while True:
+            await asyncio.sleep(self._admission_delay(endpoint, tokens))
+            try:
+                if slot is None:
+                    result = await _resolve(function(*args, **kwargs))
+                else:
+                    async with slot:
+                        result = await _resolve(function(*args, **kwargs))
+            except Exception as e:
+                delay = self._retry_delay(endpoint, e, attempt)
+                if delay is None:
+                    raise
+            else:
+                return self._completed(endpoint, start, result)
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    def stats(self) -> Dict[str, float]:
+        """Return request, retry and throttling counters"""
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'retries': self.retries,
+                'failures': self.failures,
+                'throttled_seconds': self.throttled_seconds
+            }
+
+# Methods returning stream managers, which only send their request when entered
+STREAM_METHODS = frozenset({"stream", "create_and_stream"})
+
+async def _resolve(result: Any) -> Any:
+    """Await awaitable results such as coroutines and paginators; pass through stream managers"""
+    if inspect.isawaitable(result):
+        return await result
+    return result
+
+class _ScheduledStreamManager:
+    """Stream manager whose request goes through the scheduler when it is entered.
+
+    Opening the stream is admitted, rate limited and retried like any other call;
+    each attempt enters a fresh manager from factory. Once events are flowing a
+    dropped stream is not retried, as its events have already been handled.
+    """
+
+    def __init__(self, scheduler: RequestScheduler, endpoint: str, factory: Callable):
+        self._scheduler = scheduler
+        self._endpoint = endpoint
+        self._factory = factory
+        self._manager = None
+
+    def __enter__(self):
+        def open_stream():
+            manager = self._factory()
+            return manager, manager.__enter__()
+        self._manager, stream = self._scheduler.call(self._endpoint, open_stream)
+        return stream
+
+    def __exit__(self, *exc):
+        return self._manager.__exit__(*exc)
+
+    async def __aenter__(self):
+        async def open_stream():
+            manager = self._factory()
+            return manager, await manager.__aenter__()
+        self._manager, stream = await self._scheduler.acall(self._endpoint, open_stream)
+        return stream
+
+    async def __aexit__(self, *exc):
+        return await self._manager.__aexit__(*exc)
+
+class _ScheduledResource:
+    """Proxy for an OpenAI resource whose method calls go through the scheduler"""
+
+    def __init__(self, target: Any, scheduler: RequestScheduler, path: str, asynchronous: bool):
+        self._target = target
+        self._scheduler = scheduler
+        self._path = path
+        self._asynchronous = asynchronous
+
+    def __getattr__(self, name: str) -> Any:
+        attribute = getattr(self._target, name)
+        path = f"{self._path}.{name}" if self._path else name
+        if type(attribute).__module__.startswith("openai.resources"):
+            return _ScheduledResource(attribute, self._scheduler, path, self._asynchronous)
+        if not callable(attribute) or not self._path:
+            return attribute
+
+        endpoint = self._path
+        if name in STREAM_METHODS:
+            def scheduled_stream(*args, **kwargs):
+                return _ScheduledStreamManager(self._scheduler, endpoint,
+                                               lambda: attribute(*args, **kwargs))
+            return scheduled_stream
+        if self._asynchronous:
+            def scheduled(*args, **kwargs):
+                return self._scheduler.acall(endpoint, attribute, *args, **kwargs)
+        else:
+            def scheduled(*args, **kwargs):
+                return self._scheduler.call(endpoint, attribute, *args, **kwargs)
+        return scheduled
+
+class ScheduledClient(_ScheduledResource):
+    """OpenAI or AsyncOpenAI client whose API calls are rate limited and retried.
+
+    Call sites are unchanged: client.embeddings.create(...) is routed through
+    scheduler.call (or scheduler.acall for AsyncOpenAI) under the endpoint
+    "embeddings". The wrapped client's own retries are disabled so only the
+    scheduler retries.
+    """
+
+    def __init__(self, client: Any, scheduler: RequestScheduler):
+        super().__init__(client, scheduler, "", isinstance(client, openai.AsyncOpenAI))
+
+    @property
+    def scheduler(self) -> RequestScheduler:
+        return self._scheduler
+
+# One scheduler and one client per (API key, base URL) for the whole process
+SHARED_SCHEDULER = RequestScheduler()
+_shared_clients = {}
+_shared_clients_lock = threading.Lock()
+
+def get_shared_client(api_key: Optional[str] = None, base_url: Optional[str] = None,
+                      asynchronous: bool = False) -> ScheduledClient:
+    """Return the pooled, scheduled client for these credentials, creating it once.
+
+    Every caller in the process shares the client's HTTP connection pool and
+    SHARED_SCHEDULER's rate limits.
+    """
+    key = (api_key, base_url, asynchronous)
+    with _shared_clients_lock:
+        if key not in _shared_clients:
+            client_class = openai.AsyncOpenAI if asynchronous else openai.OpenAI
+            client = client_class(api_key=api_key, base_url=base_url, max_retries=0)
+            _shared_clients[key] = ScheduledClient(client, SHARED_SCHEDULER)
+        return _shared_clients[key]
+
+def get_shared_async_client(api_key: Optional[str] = None, base_url: Optional[str] = None) -> ScheduledClient:
+    """Return the pooled, scheduled AsyncOpenAI client for these credentials"""
+    return get_shared_client(api_key, base_url, asynchronous=True)
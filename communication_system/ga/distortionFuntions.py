@@ -1,5 +1,8 @@
-from typing import Dict
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Union
 import random
+import string
+import numpy as np
 
 # Keyboard adjacency for realistic typos (QWERTY layout)
 keyboard_adjacent = {
@@ -29,39 +32,29 @@ symbol_map = {
 
 punctuation = ['!', '?', '*', '~', '.', ',', '#', '$', '%', '&']
 
-def assign_distortions(text: str, weights: Dict[str, float]) -> list:
+# Column order of weight matrices passed to distort_texts
+DISTORTION_TYPES = ["unchanged", "capitalization", "symbol", "adjacent",
+                    "swap", "insert", "repeat", "punctuation"]
+
+# Lookup tables for the vectorized engine, built once at import
+_SYMBOL_OPTIONS = {char: tuple(options) for char, options in symbol_map.items()}
+_ADJACENT_OPTIONS = {char: tuple(options) for char, options in keyboard_adjacent.items()}
+_INSERT_LETTERS = np.array(list(string.ascii_lowercase), dtype=object)
+_PUNCTUATION = np.array(punctuation, dtype=object)
+
+def assign_distortions(text: str, weights: Dict[str, float],
+                       rng: Optional[np.random.Generator] = None) -> list:
     """Assign distortion types to each character position based on weights"""
-    char_positions = list(range(len(text)))
-    assignments = []
-    
-    # Normalize weights to percentages if they don't sum to 100
-    total_weight = sum(weights.values())
-    normalized_weights = {k: (v / total_weight) * 100 for k, v in weights.items()}
-    
-    # First, identify capital letters and mark them as unchanged
-    capital_positions = [i for i, char in enumerate(text) if char.isupper()]
-    for pos in capital_positions:
-        if pos in char_positions:
-            char_positions.remove(pos)
-            assignments.append((pos, "unchanged"))
-    
-    # Calculate number of positions for each distortion type on remaining characters
-    remaining_positions = len(char_positions)
-    for distortion_type, percentage in normalized_weights.items():
-        count = int((percentage / 100) * remaining_positions)
-        if count > 0 and char_positions:
-            positions = random.sample(char_positions, min(count, len(char_positions)))
-            assignments.extend([(pos, distortion_type) for pos in positions])
-            char_positions = [pos for pos in char_positions if pos not in positions]
-    
-    # Assign any remaining positions as unchanged
-    assignments.extend([(pos, "unchanged") for pos in char_positions])
-    
-    # Sort by position
-    assignments.sort(key=lambda x: x[0])
-    return [dist_type for _, dist_type in assignments]
-
-def apply_distortion(char: str, distortion_type: str, context: list = None) -> str:
+    types = list(weights.keys())
+    plan = _plan_text(text)
+    rng = rng if rng is not None else _default_rng()
+    codes = _sample_assignments(plan, weights_to_matrix([weights], types),
+                                rng.random((1, len(plan.free_positions))))[0]
+    # Capitals and leftover positions are marked unchanged
+    return [types[code] if code >= 0 else "unchanged" for code in codes]
+
+def apply_distortion(char: str, distortion_type: str, context: list = None,
+                     rng: Optional[np.random.Generator] = None) -> str:
     """Apply a specific distortion to a character"""
     if not char.strip() or distortion_type == "unchanged":
         return char
@@ -69,61 +62,188 @@ def apply_distortion(char: str, distortion_type: str, context: list = None) -> s
     # Skip all distortions for uppercase letters
     if char.isupper():
         return char
+    
+    def choice(options: Sequence[str]) -> str:
+        generator = rng if rng is not None else _default_rng()
+        return options[int(generator.integers(len(options)))]
         
     if distortion_type == "capitalization":
         return char.upper() if char.islower() else char.lower()
         
     elif distortion_type == "symbol" and char.lower() in symbol_map:
-        return random.choice(symbol_map[char.lower()])
+        return choice(symbol_map[char.lower()])
         
     elif distortion_type == "adjacent" and char.lower() in keyboard_adjacent:
-        return random.choice(keyboard_adjacent[char.lower()])
+        return choice(keyboard_adjacent[char.lower()])
         
     elif distortion_type == "repeat":
         return char * 2
         
     elif distortion_type == "insert":
-        return char + random.choice("abcdefghijklmnopqrstuvwxyz")
+        return char + choice(string.ascii_lowercase)
         
     elif distortion_type == "punctuation":
-        return char + random.choice(punctuation)
+        return char + choice(punctuation)
         
     return char
 
-def distort_text(text: str, distortion_weights: Dict[str, float] = None) -> str:
-    # Get distortion assignments for each character
-    distortions = assign_distortions(text, distortion_weights)
-    
-    # Convert text to list for easier manipulation
-    chars = list(text)
-    result = []
-    
-    # Apply distortions
-    i = 0
-    while i < len(chars):
-        if i >= len(distortions):
-            # If we've run out of distortion assignments, just append the remaining characters
-            result.append(chars[i])
-            i += 1
-            continue
-            
-        dist_type = distortions[i]
+def weights_to_matrix(weights_list: Sequence[Dict[str, float]],
+                      distortion_types: Sequence[str] = DISTORTION_TYPES) -> np.ndarray:
+    """Stack weight dictionaries into a matrix with one row per individual"""
+    return np.array([[weights.get(t, 0.0) for t in distortion_types] for weights in weights_list],
+                    dtype=float).reshape(len(weights_list), len(distortion_types))
+
+# One generator for the whole batch, or one independent stream per row
+RandomStreams = Union[np.random.Generator, Sequence[np.random.Generator]]
+
+def _default_rng() -> np.random.Generator:
+    """Seed a NumPy generator from the global random module so random.seed still applies"""
+    return np.random.default_rng(random.getrandbits(64))
+
+def _draw_uniforms(rng: RandomStreams, rows: int, size: int,
+                   common_random_numbers: bool) -> np.ndarray:
+    """Draw a rows x size matrix of uniforms from the given streams.
+    
+    With common random numbers every row shares one draw, so candidates are
+    compared on the same positions and differ only through their weights.
+    """
+    streams = [rng] if isinstance(rng, np.random.Generator) else list(rng)
+    if common_random_numbers:
+        return np.broadcast_to(streams[0].random((1, size)), (rows, size))
+    if len(streams) == 1:
+        return streams[0].random((rows, size))
+    if len(streams) != rows:
+        raise ValueError(f"Expected {rows} random streams, got {len(streams)}")
+    return np.stack([stream.random(size) for stream in streams]).reshape(rows, size)
+
+class _TextPlan:
+    """Per-text lookup arrays shared by every weight vector distorting that text"""
+    def __init__(self, text: str):
+        n = len(text)
+        self.length = n
+        self.chars = np.array(list(text), dtype=object)
+        is_upper = np.array([char.isupper() for char in text], dtype=bool)
+        is_blank = np.array([not char.strip() for char in text], dtype=bool)
         
-        # Handle swap distortion specially
-        if dist_type == "swap" and i < len(chars) - 1:
-            next_char = chars[i + 1]
-            # Only swap if next character is not uppercase
-            if not next_char.isupper():
-                # Append the swapped characters to result
-                result.append(next_char)
-                result.append(chars[i])
-                i += 2  # Skip both characters as we've handled them
-                continue
-            # If swap wasn't applied, fall through to normal processing
+        # Capitals are never sampled, so only the remaining positions take distortions
+        self.free_positions = np.flatnonzero(~is_upper)
+        # Per-character distortions skip blanks and uppercase letters
+        self.applicable = ~is_blank & ~is_upper
         
-        # Apply normal (non-swap) distortion
-        distorted_char = apply_distortion(chars[i], dist_type)
-        result.append(distorted_char)
-        i += 1
+        self.swapped_case = np.array(
+            [char.upper() if char.islower() else char.lower() for char in text], dtype=object
+        )
+        self.doubled = self.chars + self.chars
+        self.symbol_table, self.symbol_counts = self._options(text, _SYMBOL_OPTIONS)
+        self.adjacent_table, self.adjacent_counts = self._options(text, _ADJACENT_OPTIONS)
+        
+        # A swap needs a following character that is not uppercase
+        self.swap_ok = np.zeros(n, dtype=bool)
+        if n > 1:
+            self.swap_ok[:-1] = ~is_upper[1:]
+        self.swap_pairs = np.empty(n, dtype=object)
+        self.swap_pairs[:] = ""
+        if n > 1:
+            self.swap_pairs[:-1] = self.chars[1:] + self.chars[:-1]
+
+    @staticmethod
+    def _options(text: str, table: Dict[str, tuple]):
+        """Gather replacement options per position into a padded matrix"""
+        options = [table.get(char.lower(), ()) for char in text]
+        width = max([len(o) for o in options] + [1])
+        matrix = np.empty((len(text), width), dtype=object)
+        matrix[:] = ""
+        for i, opts in enumerate(options):
+            matrix[i, :len(opts)] = opts
+        return matrix, np.array([len(o) for o in options], dtype=int)
+
+@lru_cache(maxsize=128)
+def _plan_text(text: str) -> _TextPlan:
+    return _TextPlan(text)
+
+def _sample_assignments(plan: _TextPlan, weight_matrix: np.ndarray,
+                        position_keys: np.ndarray) -> np.ndarray:
+    """Sample a distortion type index per position for every row (-1 = unchanged)"""
+    rows = weight_matrix.shape[0]
+    free = plan.free_positions
+    remaining = len(free)
+    
+    # Same counts as sampling each type in turn from the positions still available
+    percentages = weight_matrix / weight_matrix.sum(axis=1, keepdims=True) * 100
+    counts = (percentages / 100 * remaining).astype(int)
+    ends = np.minimum(np.cumsum(counts, axis=1), remaining)
     
-    return "".join(result)
\ No newline at end of file
+    # A random permutation per row; consecutive slices of it go to each type
+    order = np.argsort(position_keys, axis=1, kind="stable")
+    ranks = np.arange(remaining)
+    type_of_rank = (ranks[None, None, :] >= ends[:, :, None]).sum(axis=1)
+    type_of_rank[type_of_rank >= weight_matrix.shape[1]] = -1
+    
+    assignments = np.full((rows, plan.length), -1, dtype=int)
+    assignments[np.arange(rows)[:, None], free[order]] = type_of_rank
+    return assignments
+
+def distort_texts(text: str, weight_matrix: Union[np.ndarray, Sequence[Dict[str, float]]],
+                  distortion_types: Sequence[str] = DISTORTION_TYPES,
+                  rng: Optional[RandomStreams] = None,
+                  common_random_numbers: bool = False) -> List[str]:
+    """Distort one text under many weight vectors (one row per individual) in a single call.
+    
+    rng is a single generator for the batch or one generator per row; per-row
+    streams make each individual's result independent of the batch it is in.
+    """
+    if not isinstance(weight_matrix, np.ndarray):
+        if len(weight_matrix) and distortion_types is DISTORTION_TYPES:
+            distortion_types = list(weight_matrix[0].keys())
+        weight_matrix = weights_to_matrix(weight_matrix, distortion_types)
+    weight_matrix = np.atleast_2d(np.asarray(weight_matrix, dtype=float))
+    rng = rng if rng is not None else _default_rng()
+    
+    plan = _plan_text(text)
+    rows, n = weight_matrix.shape[0], plan.length
+    uniforms = _draw_uniforms(rng, rows, len(plan.free_positions) + n, common_random_numbers)
+    position_keys, choice = uniforms[:, :len(plan.free_positions)], uniforms[:, len(plan.free_positions):]
+    assignments = _sample_assignments(plan, weight_matrix, position_keys)
+    
+    def code(name: str) -> int:
+        return list(distortion_types).index(name) if name in distortion_types else -2
+    
+    pieces = np.broadcast_to(plan.chars, (rows, n)).copy()
+    
+    mask = (assignments == code("capitalization")) & plan.applicable
+    pieces[mask] = np.broadcast_to(plan.swapped_case, (rows, n))[mask]
+    
+    for name, table, counts in (("symbol", plan.symbol_table, plan.symbol_counts),
+                                ("adjacent", plan.adjacent_table, plan.adjacent_counts)):
+        mask = (assignments == code(name)) & plan.applicable & (counts > 0)
+        columns = np.nonzero(mask)[1]
+        picks = (choice[mask] * counts[columns]).astype(int)
+        pieces[mask] = table[columns, picks]
+    
+    mask = (assignments == code("repeat")) & plan.applicable
+    pieces[mask] = np.broadcast_to(plan.doubled, (rows, n))[mask]
+    
+    for name, extras in (("insert", _INSERT_LETTERS), ("punctuation", _PUNCTUATION)):
+        mask = (assignments == code(name)) & plan.applicable
+        picks = (choice[mask] * len(extras)).astype(int)
+        pieces[mask] = pieces[mask] + extras[picks]
+    
+    # Swaps scan left to right: a swapped pair consumes the next position, so in a
+    # run of eligible positions only every other one (from the run start) swaps
+    eligible = (assignments == code("swap")) & plan.swap_ok
+    previous = np.zeros_like(eligible)
+    previous[:, 1:] = eligible[:, :-1]
+    positions = np.broadcast_to(np.arange(n), (rows, n))
+    run_start = np.maximum.accumulate(np.where(eligible & ~previous, positions, 0), axis=1)
+    active = eligible & ((positions - run_start) % 2 == 0)
+    consumed = np.zeros_like(active)
+    consumed[:, 1:] = active[:, :-1]
+    pieces[active] = np.broadcast_to(plan.swap_pairs, (rows, n))[active]
+    pieces[consumed] = ""
+    
+    return ["".join(row) for row in pieces.tolist()]
+
+def distort_text(text: str, distortion_weights: Dict[str, float] = None,
+                 rng: Optional[np.random.Generator] = None) -> str:
+    """Distort text under a single weight dictionary"""
+    return distort_texts(text, [distortion_weights], rng=rng)[0]
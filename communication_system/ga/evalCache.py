@@ -0,0 +1,148 @@
+import hashlib
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+import numpy as np
+from .metrics import METRICS
+
+class TieredCache(ABC):
+    """Thread-safe LRU cache with an optional SQLite tier that survives restarts.
+
+    Subclasses define how values are serialized for the on-disk tier.
+    """
+    table = "cache"
+
+    def __init__(self, max_entries: int = 10000, db_path: Optional[str] = None):
+        self.max_entries = max_entries
+        self.db_path = db_path
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+
+        if db_path is not None:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.table} (key TEXT PRIMARY KEY, value BLOB NOT NULL)"
+            )
+            self._db.commit()
+
+    @abstractmethod
+    def _encode(self, value: Any) -> bytes:
+        """Serialize a value for the on-disk tier"""
+
+    @abstractmethod
+    def _decode(self, data: bytes) -> Any:
+        """Deserialize a value read from the on-disk tier"""
+
+    def _remember(self, key: str, value: Any) -> None:
+        """Insert into the memory tier, evicting the least recently used entry"""
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, key: str) -> Optional[Any]:
+        """Look up a key in memory, then on disk; returns None on a miss"""
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                METRICS.count("cache_lookups", cache=self.table, result="hit")
+                return self._memory[key]
+
+            if self._db is not None:
+                row = self._db.execute(
+                    f"SELECT value FROM {self.table} WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    value = self._decode(row[0])
+                    self._remember(key, value)
+                    self.disk_hits += 1
+                    METRICS.count("cache_lookups", cache=self.table, result="disk_hit")
+                    return value
+
+            self.misses += 1
+            METRICS.count("cache_lookups", cache=self.table, result="miss")
+            return None
+
+    def put(self, key: str, value: Any) -> None:
+        """Store a value in memory and, if configured, on disk"""
+        with self._lock:
+            self._remember(key, value)
+            if self._db is not None:
+                self._db.execute(
+                    f"INSERT OR REPLACE INTO {self.table} (key, value) VALUES (?, ?)",
+                    (key, self._encode(value))
+                )
+                self._db.commit()
+
+    def stats(self) -> Dict[str, float]:
+        """Return hit/miss counters for confirming the cache saves API calls"""
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'hit_rate': (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+                'entries': len(self._memory)
+            }
+
+    def close(self) -> None:
+        """Close the on-disk tier"""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+class EmbeddingCache(TieredCache):
+    """Content-addressed embedding cache keyed on (model, text hash)"""
+    table = "embeddings"
+
+    @staticmethod
+    def make_key(model: str, text: str) -> str:
+        """Build the cache key from the model name and a hash of the text"""
+        return f"{model}:{hashlib.sha256(text.encode()).hexdigest()}"
+
+    def _encode(self, value: np.ndarray) -> bytes:
+        return np.asarray(value, dtype=np.float32).tobytes()
+
+    def _decode(self, data: bytes) -> np.ndarray:
+        return np.frombuffer(data, dtype=np.float32).astype(np.float64)
+
+    def get_embedding(self, model: str, text: str) -> Optional[np.ndarray]:
+        """Return the cached embedding for text, or None on a miss"""
+        return self.get(self.make_key(model, text))
+
+    def put_embedding(self, model: str, text: str, embedding: np.ndarray) -> None:
+        """Cache the embedding for text"""
+        self.put(self.make_key(model, text), embedding)
+
+class ReconstructionCache(TieredCache):
+    """Memo of GPT reconstructions keyed on (model, system prompt, distorted text)"""
+    table = "reconstructions"
+
+    @staticmethod
+    def make_key(model: str, system_prompt: str, distorted_text: str) -> str:
+        """Build the cache key from the model, prompt and distorted text"""
+        digest = hashlib.sha256(f"{system_prompt}\0{distorted_text}".encode()).hexdigest()
+        return f"{model}:{digest}"
+
+    def _encode(self, value: str) -> bytes:
+        return value.encode()
+
+    def _decode(self, data: bytes) -> str:
+        return data.decode()
+
+    def get_reconstruction(self, model: str, system_prompt: str, distorted_text: str) -> Optional[str]:
+        """Return the cached reconstruction, or None on a miss"""
+        return self.get(self.make_key(model, system_prompt, distorted_text))
+
+    def put_reconstruction(self, model: str, system_prompt: str, distorted_text: str, reconstruction: str) -> None:
+        """Cache a successful reconstruction"""
+        self.put(self.make_key(model, system_prompt, distorted_text), reconstruction)
@@ -0,0 +1,244 @@
+import zlib
+from abc import ABC, abstractmethod
+from typing import Iterable, List, Optional, Tuple
+import numpy as np
+from .distortionFuntions import punctuation, symbol_map
+
+class PrivacyBackend(ABC):
+    """Scores a generation of distorted texts against the original (higher = more private)"""
+
+    def pin_reference(self, text: str) -> None:
+        """Prepare anything derived from the original text once per training run"""
+        pass
+
+    @abstractmethod
+    def privacy_scores(self, original_text: str, distorted_texts: List[str]) -> np.ndarray:
+        """Return one privacy score per distorted text"""
+
+class NgramPrivacyBackend(PrivacyBackend):
+    """Local surrogate for embedding privacy using hashed character n-gram vectors.
+
+    Each text becomes a bag of character n-grams hashed into a fixed number of
+    buckets, and privacy is 1 - cosine similarity to the original, as with the
+    OpenAI embeddings. No network access is needed.
+    """
+
+    def __init__(self, ngram_range: Tuple[int, int] = (2, 4), dimensions: int = 4096,
+                 lowercase: bool = False):
+        self.ngram_range = ngram_range
+        self.dimensions = dimensions
+        self.lowercase = lowercase
+        self._reference_text = None
+        self._reference_vector = None
+
+    def _bucket_ids(self, text: str) -> List[int]:
+        """Hash every n-gram of text into a bucket index"""
+        if self.lowercase:
+            text = text.lower()
+        encoded = text.encode()
+        low, high = self.ngram_range
+        # crc32 is stable across processes, unlike the built-in hash
+        return [zlib.crc32(encoded[i:i + n]) % self.dimensions
+                for n in range(low, high + 1)
+                for i in range(len(encoded) - n + 1)]
+
+    def vectorize(self, texts: List[str]) -> np.ndarray:
+        """Build the n-gram count matrix, one row per text"""
+        ids = [self._bucket_ids(text) for text in texts]
+        rows = np.repeat(np.arange(len(texts)), [len(row) for row in ids])
+        matrix = np.zeros((len(texts), self.dimensions))
+        np.add.at(matrix, (rows, np.fromiter((i for row in ids for i in row), dtype=np.int64)), 1.0)
+        return matrix
+
+    def pin_reference(self, text: str) -> None:
+        self._reference_text = text
+        self._reference_vector = self.vectorize([text])[0]
+
+    def privacy_scores(self, original_text: str, distorted_texts: List[str]) -> np.ndarray:
+        if not distorted_texts:
+            return np.zeros(0)
+        if original_text != self._reference_text:
+            self.pin_reference(original_text)
+
+        vectors = self.vectorize(distorted_texts)
+        norms = np.linalg.norm(vectors, axis=1) * np.linalg.norm(self._reference_vector)
+        similarities = np.divide(vectors @ self._reference_vector, norms,
+                                 out=np.zeros(len(distorted_texts)), where=norms > 0)
+        return 1 - similarities
+
+# Words the guide texts are built from: number words, hex digit words and template words
+KEY_VOCABULARY = [
+    "zero", "one", "two", "three", "four", "five", "six", "seven", "eight", "nine", "ten",
+    "eleven", "twelve", "thirteen", "fourteen", "fifteen", "sixteen", "seventeen", "eighteen",
+    "nineteen", "twenty", "thirty", "forty", "fifty", "sixty", "seventy", "eighty", "ninety",
+    "alpha", "bravo", "charlie", "delta", "echo", "freddy",
+    "understand", "my", "encrypted", "query", "using", "a", "cipher", "with", "key", "key:",
+    "in", "mode", "mode.", "and", "of", "caesar", "data", "encryption", "standard", "electronic",
+    "code", "book", "advanced", "block", "chaining", "pkcs7", "padding", "embedded",
+    "initialization", "vector", "at", "the", "beginning", "question.", "chacha20", "nonce:",
+    "[", "]", "].", "(rfc", "7539)"
+]
+
+# Reverse lookup of the distortion tables, longest symbols first
+_REVERSE_SYMBOLS = sorted(
+    ((symbol, char) for char, symbols in symbol_map.items() for symbol in symbols),
+    key=lambda pair: -len(pair[0])
+)
+_PUNCTUATION_CHARS = set(punctuation)
+
+class UsabilityBackend(ABC):
+    """Scores how recoverable each distorted text is (fraction of original words recovered)"""
+
+    @abstractmethod
+    def usability_scores(self, original_text: str, distorted_texts: List[str]) -> np.ndarray:
+        """Return one usability score per distorted text"""
+
+class TableInversionUsabilityBackend(UsabilityBackend):
+    """Local usability estimate that inverts the known distortion tables.
+
+    Each distorted word is normalized (lowercased, symbols mapped back through a
+    reverse symbol_map, with and without inserted punctuation) and then matched to
+    the nearest vocabulary word by edit distance with transpositions, which undoes
+    adjacent-key typos, swaps, repeats and inserts. The vocabulary is the original
+    text's words plus KEY_VOCABULARY as distractors, and the score uses the same
+    word-overlap measure as the GPT reconstruction.
+    """
+
+    def __init__(self, vocabulary: Optional[Iterable[str]] = None, max_error_rate: float = 0.34):
+        self.extra_vocabulary = list(vocabulary) if vocabulary is not None else KEY_VOCABULARY
+        self.max_error_rate = max_error_rate
+        self._vocabulary_text = None
+        self._words = []
+        self._word_set = set()
+        self._codes = None
+        self._lengths = None
+        self._histograms = None
+        self._allowed = None
+        self._matches = {}
+
+    def _set_vocabulary(self, original_text: str) -> None:
+        """Rebuild the padded vocabulary matrix when the original text changes"""
+        words = list(dict.fromkeys(original_text.lower().split() + [w.lower() for w in self.extra_vocabulary]))
+        self._codes, self._lengths, self._histograms = self._encode(words)
+        self._allowed = np.maximum(1, (self.max_error_rate * self._lengths).astype(int))
+        self._words = words
+        self._word_set = set(words)
+        self._vocabulary_text = original_text
+        self._matches = {}
+
+    @staticmethod
+    def _encode(words: List[str]):
+        """Pad words into a code matrix (-1 = padding) with character histograms"""
+        width = max([len(word) for word in words] + [1])
+        codes = np.full((len(words), width), -1, dtype=np.int64)
+        for i, word in enumerate(words):
+            codes[i, :len(word)] = [ord(char) for char in word]
+        histograms = np.zeros((len(words), 64), dtype=np.int16)
+        rows, columns = np.nonzero(codes >= 0)
+        np.add.at(histograms, (rows, codes[rows, columns] % 64), 1)
+        return codes, np.array([len(word) for word in words]), histograms
+
+    def _distances(self, tokens: List[str]) -> np.ndarray:
+        """Edit distance (with adjacent transpositions) from every token to every vocabulary word.
+        
+        A character-histogram lower bound prunes pairs that cannot be within the
+        allowed error; only the remaining pairs run the dynamic programme, vectorized
+        across pairs. Pruned pairs keep their lower bound, which exceeds the limit.
+        """
+        codes, lengths, histograms = self._encode(tokens)
+        
+        # Each edit changes the histogram L1 distance by at most 2
+        bound = np.maximum(
+            (np.abs(histograms[:, None, :] - self._histograms[None, :, :]).sum(axis=2) + 1) // 2,
+            np.abs(lengths[:, None] - self._lengths[None, :])
+        )
+        distances = bound.astype(np.int64)
+        token_index, word_index = np.nonzero(bound <= self._allowed[None, :])
+        if len(token_index) == 0:
+            return distances
+        
+        source, target = codes[token_index], self._codes[word_index]
+        source_lengths, target_lengths = lengths[token_index], self._lengths[word_index]
+        pairs, width = len(token_index), target.shape[1]
+        
+        before = None
+        previous = np.tile(np.arange(width + 1), (pairs, 1))
+        exact = target_lengths.copy()  # distance from an empty token
+        for i in range(1, source.shape[1] + 1):
+            current = np.empty((pairs, width + 1), dtype=np.int64)
+            current[:, 0] = i
+            for j in range(1, width + 1):
+                cost = target[:, j - 1] != source[:, i - 1]
+                current[:, j] = np.minimum(np.minimum(previous[:, j], current[:, j - 1]) + 1,
+                                           previous[:, j - 1] + cost)
+                if i > 1 and j > 1:
+                    transposed = (target[:, j - 1] == source[:, i - 2]) & (target[:, j - 2] == source[:, i - 1])
+                    current[:, j] = np.where(transposed, np.minimum(current[:, j], before[:, j - 2] + 1),
+                                             current[:, j])
+            finished = source_lengths == i
+            exact[finished] = current[finished, target_lengths[finished]]
+            before, previous = previous, current
+        
+        distances[token_index, word_index] = exact
+        return distances
+
+    @staticmethod
+    def _normalize(token: str) -> List[str]:
+        """Candidate spellings of a distorted token with the symbol table inverted"""
+        token = token.lower()
+        stripped = "".join(char for char in token if char not in _PUNCTUATION_CHARS) or token
+        candidates = [token, stripped]
+        for variant in (token, stripped):
+            for symbol, char in _REVERSE_SYMBOLS:
+                variant = variant.replace(symbol, char)
+            candidates.append(variant)
+        return list(dict.fromkeys(candidates))
+
+    def _recover_all(self, tokens: Iterable[str]) -> None:
+        """Match every unseen distorted token to its most likely vocabulary word (or None)"""
+        pending = {}
+        for token in tokens:
+            if token in self._matches or token in pending:
+                continue
+            candidates = self._normalize(token)
+            exact = [candidate for candidate in candidates if candidate in self._word_set]
+            if exact:
+                self._matches[token] = exact[0]
+            else:
+                pending[token] = candidates
+        if not pending:
+            return
+
+        spellings = list(dict.fromkeys(c for candidates in pending.values() for c in candidates))
+        distances = dict(zip(spellings, self._distances(spellings)))
+        for token, candidates in pending.items():
+            best_word, best_distance = None, None
+            for candidate in candidates:
+                # Only words within their own error allowance are acceptable matches
+                within = np.where(distances[candidate] <= self._allowed, distances[candidate], np.iinfo(np.int64).max)
+                index = int(np.argmin(within))
+                if within[index] <= self._allowed[index] and (best_distance is None or within[index] < best_distance):
+                    best_word, best_distance = self._words[index], within[index]
+            self._matches[token] = best_word
+
+    def reconstruct(self, original_text: str, distorted_text: str) -> str:
+        """Best local reconstruction of distorted_text"""
+        return self.reconstruct_all(original_text, [distorted_text])[0]
+
+    def reconstruct_all(self, original_text: str, distorted_texts: List[str]) -> List[str]:
+        """Reconstruct a batch, matching all unseen words in one edit-distance pass"""
+        if original_text != self._vocabulary_text:
+            self._set_vocabulary(original_text)
+        token_lists = [distorted_text.split() for distorted_text in distorted_texts]
+        self._recover_all(token for tokens in token_lists for token in tokens)
+        return [" ".join(self._matches[token] or token.lower() for token in tokens)
+                for tokens in token_lists]
+
+    def usability_scores(self, original_text: str, distorted_texts: List[str]) -> np.ndarray:
+        original_words = set(original_text.lower().split())
+        if not original_words:
+            return np.zeros(len(distorted_texts))
+
+        reconstructions = self.reconstruct_all(original_text, distorted_texts)
+        return np.array([len(original_words & set(reconstruction.split())) / len(original_words)
+                         for reconstruction in reconstructions])
@@ -1,22 +1,120 @@
+import asyncio
+import threading
 import numpy as np
-from typing import Tuple
-from openai import OpenAI
+from concurrent.futures import Executor
+from typing import Dict, List, Optional, Tuple
+from openai import AsyncOpenAI, OpenAI
 from .gaOperations import Individual
-from .distortionFuntions import distort_text
+from .distortionFuntions import RandomStreams, distort_text, distort_texts
+from .apiScheduler import RETRYABLE_ERRORS
+from .metrics import METRICS
+from .evalCache import EmbeddingCache, ReconstructionCache
+from .fitnessBackends import PrivacyBackend, UsabilityBackend
+
+USABILITY_SYSTEM_PROMPT = "Reconstruct the distorted paragraph exactly as it should be. Respond with only the corrected paragraph and nothing else."
+# USABILITY_SYSTEM_PROMPT = "Recover the distorted hexadecimal key provided. Respond with the recovered key only and nothing else."
 
 class FitnessCalculator:
     def __init__(self, client: OpenAI, 
-                 embedding_model: str = "text-embedding-3-small"):
+                 embedding_model: str = "text-embedding-3-small",
+                 embedding_batch_size: int = 2048,
+                 embedding_cache: Optional[EmbeddingCache] = None,
+                 usability_model: str = "gpt-4o-mini",
+                 reconstruction_cache: Optional[ReconstructionCache] = None,
+                 privacy_backend: Optional[PrivacyBackend] = None,
+                 usability_backend: Optional[UsabilityBackend] = None):
         self.client = client
+        # None keeps the OpenAI embedding/chat paths; a backend replaces them, e.g. a local one
+        self.privacy_backend = privacy_backend
+        self.usability_backend = usability_backend
         self.embedding_model = embedding_model
-        
+        # Pass a shared or on-disk cache to reuse embeddings across calculators and runs
+        self.embedding_cache = embedding_cache if embedding_cache is not None else EmbeddingCache()
+        self.usability_model = usability_model
+        self.reconstruction_cache = reconstruction_cache if reconstruction_cache is not None else ReconstructionCache()
+        self.embedding_batch_size = embedding_batch_size  # API limit on inputs per request
+        self._reference_text = None
+        self._reference_embedding = None
+        # Network requests made so far, for API-call budgets
+        self.api_calls = 0
+        self._api_calls_lock = threading.Lock()
+
+    def _count_api_call(self) -> None:
+        """Record one request to the OpenAI API"""
+        with self._api_calls_lock:
+            self.api_calls += 1
+
+    def api_call_bound(self, count: int, reference: bool = False) -> int:
+        """Most requests scoring count individuals can make, including pinning the reference if asked"""
+        calls = 0
+        if self.privacy_backend is None:
+            calls += -(-count // self.embedding_batch_size) + int(reference)
+        if self.usability_backend is None:
+            calls += count
+        return calls
+
     def get_embedding(self, text: str) -> np.ndarray:
         """Get embedding for text using OpenAI's API"""
+        cached = self.embedding_cache.get_embedding(self.embedding_model, text)
+        if cached is not None:
+            return cached
+        
+        self._count_api_call()
         response = self.client.embeddings.create(
             input=text,
             model=self.embedding_model
         )
-        return np.array(response.data[0].embedding)
+        embedding = np.array(response.data[0].embedding)
+        self.embedding_cache.put_embedding(self.embedding_model, text, embedding)
+        return embedding
+
+    def _cached_embeddings(self, texts: List[str]) -> Tuple[Dict[str, Optional[np.ndarray]], List[List[str]]]:
+        """Look texts up in the cache; return the hits and request-sized batches of misses"""
+        embeddings = {}
+        for text in texts:
+            if text not in embeddings:
+                embeddings[text] = self.embedding_cache.get_embedding(self.embedding_model, text)
+        
+        # Only request texts the cache could not answer
+        missing = [text for text, embedding in embeddings.items() if embedding is None]
+        batches = [missing[start:start + self.embedding_batch_size]
+                   for start in range(0, len(missing), self.embedding_batch_size)]
+        return embeddings, batches
+
+    def _store_embeddings(self, batch_texts: List[str], response, embeddings: Dict) -> None:
+        """Place a multi-input response into embeddings and the cache"""
+        # The API may return items out of order, so place them by index
+        for item in response.data:
+            embedding = np.array(item.embedding)
+            embeddings[batch_texts[item.index]] = embedding
+            self.embedding_cache.put_embedding(self.embedding_model, batch_texts[item.index], embedding)
+
+    def get_embeddings(self, texts: List[str]) -> np.ndarray:
+        """Get embeddings for many texts with multi-input requests, one row per text"""
+        embeddings, batches = self._cached_embeddings(texts)
+        for batch_texts in batches:
+            self._count_api_call()
+            response = self.client.embeddings.create(
+                input=batch_texts,
+                model=self.embedding_model
+            )
+            self._store_embeddings(batch_texts, response, embeddings)
+        
+        return np.array([embeddings[text] for text in texts])
+
+    def pin_reference(self, text: str) -> None:
+        """Embed the original text once so later privacy scores reuse it"""
+        if self.privacy_backend is not None:
+            self.privacy_backend.pin_reference(text)
+            return
+        self._reference_text = text
+        self._reference_embedding = self.get_embedding(text)
+
+    def get_reference_embedding(self, text: str) -> np.ndarray:
+        """Return the pinned embedding for text, or embed it if it is not pinned"""
+        if self._reference_embedding is not None and text == self._reference_text:
+            return self._reference_embedding
+        return self.get_embedding(text)
 
     def cosine_similarity(self, vec1: np.ndarray, vec2: np.ndarray) -> float:
         """Calculate cosine similarity between vectors"""
@@ -24,54 +122,320 @@ class FitnessCalculator:
 
     def calculate_privacy_score(self, original_text: str, distorted_text: str) -> float:
         """Calculate privacy score using embeddings"""
-        original_embedding = self.get_embedding(original_text)
+        if self.privacy_backend is not None:
+            return float(self.privacy_backend.privacy_scores(original_text, [distorted_text])[0])
+        original_embedding = self.get_reference_embedding(original_text)
         distorted_embedding = self.get_embedding(distorted_text)
         
         return 1 - self.cosine_similarity(original_embedding, distorted_embedding)
+
+    def calculate_privacy_scores(self, original_text: str, distorted_texts: List[str]) -> np.ndarray:
+        """Calculate privacy scores for many distorted texts with one batched embedding request"""
+        if self.privacy_backend is not None:
+            return self.privacy_backend.privacy_scores(original_text, distorted_texts)
+        if not distorted_texts:
+            return np.zeros(0)
+        original_embedding = self.get_reference_embedding(original_text)
+        distorted_embeddings = self.get_embeddings(distorted_texts)
+        
+        return self._privacy_from_embeddings(original_embedding, distorted_embeddings)
+
+    def _privacy_from_embeddings(self, original_embedding: np.ndarray, distorted_embeddings: np.ndarray) -> np.ndarray:
+        """Cosine similarity of every row against the reference in one matrix operation"""
+        similarities = (distorted_embeddings @ original_embedding) / (
+            np.linalg.norm(distorted_embeddings, axis=1) * np.linalg.norm(original_embedding)
+        )
+        return 1 - similarities
     
     def compare_words(self, original, modified):
         matches = sum(1 for i in range(len(original)) if i < len(modified) and original[i] == modified[i])
         total = len(original)
         return matches / total
 
+    def _reconstruction_request(self, distorted_text: str) -> Dict:
+        """Chat completion arguments for reconstructing distorted text"""
+        # Temperature 0 makes the reconstruction a function of the distorted text
+        return {
+            "model": self.usability_model,
+            "messages": [
+                {"role": "system", "content": USABILITY_SYSTEM_PROMPT},
+                {"role": "user", "content": distorted_text}
+            ],
+            "temperature": 0,
+            "max_tokens": 100
+        }
+
+    def _cached_reconstruction(self, distorted_text: str) -> Optional[str]:
+        """Return a memoized reconstruction, or None on a miss"""
+        return self.reconstruction_cache.get_reconstruction(
+            self.usability_model, USABILITY_SYSTEM_PROMPT, distorted_text
+        )
+
+    def _store_reconstruction(self, distorted_text: str, response) -> str:
+        """Extract the reconstruction from a successful response and cache it"""
+        reconstruction = response.choices[0].message.content.lower().strip()
+        self.reconstruction_cache.put_reconstruction(
+            self.usability_model, USABILITY_SYSTEM_PROMPT, distorted_text, reconstruction
+        )
+        return reconstruction
+
+    def get_reconstruction(self, distorted_text: str) -> str:
+        """Reconstruct distorted text with the GPT model, memoizing successful responses"""
+        cached = self._cached_reconstruction(distorted_text)
+        if cached is not None:
+            return cached
+        
+        self._count_api_call()
+        response = self.client.chat.completions.create(**self._reconstruction_request(distorted_text))
+        return self._store_reconstruction(distorted_text, response)
+
+    def _word_overlap(self, original_text: str, gpt_answer: str) -> float:
+        """Fraction of the original words present in the reconstruction"""
+        words1 = set(original_text.lower().split())
+        words2 = set(gpt_answer.lower().split())
+        
+        if not words1:
+            return 0.0
+            
+        matching_words = words1.intersection(words2)
+        return len(matching_words) / len(words1)
+
     def get_usability_score(self, original_text: str, distorted_text: str) -> float:
         """Calculate usability score using GPT model"""
+        if self.usability_backend is not None:
+            return float(self.usability_backend.usability_scores(original_text, [distorted_text])[0])
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": "Reconstruct the distorted paragraph exactly as it should be. Respond with only the corrected paragraph and nothing else."},
-                    # {"role": "system", "content": "Recover the distorted hexadecimal key provided. Respond with the recovered key only and nothing else."},
-                    {"role": "user", "content": distorted_text}
-                ],
-                temperature=0,
-                max_tokens=100
+            # Failed calls raise here, so they are never cached
+            gpt_answer = self.get_reconstruction(distorted_text)
+        except RETRYABLE_ERRORS:
+            # Throttling that outlasts the scheduler's retries must not score as 0.0
+            raise
+        except Exception as e:
+            print(f"Error getting GPT response: {e}")
+            return 0.0
+        
+        return self._word_overlap(original_text, gpt_answer)
+
+    def score_distorted_text(self, text: str, distorted_text: str, alpha: float) -> Tuple[float, float, float]:
+        """Calculate fitness, privacy and usability for an already distorted text"""
+        privacy_score = self.calculate_privacy_score(text, distorted_text)
+        usability_score = self.get_usability_score(text, distorted_text)
+        
+        return self._combine_scores(privacy_score, usability_score, alpha)
+
+    def _combine_scores(self, privacy_score: float, usability_score: float, alpha: float) -> Tuple[float, float, float]:
+        """Calculate fitness as weighted sum of privacy and usability"""
+        fitness = (alpha * privacy_score) + ((1 - alpha) * usability_score)
+        
+        return fitness, privacy_score, usability_score
+
+    def calculate_fitness(self, individual: Individual, text: str, alpha: float,
+                          rng: Optional[np.random.Generator] = None) -> Tuple[float, float, float]:
+        """Calculate fitness based on privacy and usability scores"""
+        distorted_text = distort_text(text, individual.weights, rng=rng)
+        individual.distorted_text = distorted_text
+        
+        return self.score_distorted_text(text, distorted_text, alpha)
+
+    def calculate_population_fitness(self, individuals: List[Individual], text: str, alpha: float,
+                                     executor: Optional[Executor] = None,
+                                     rng: Optional[RandomStreams] = None,
+                                     common_random_numbers: bool = False) -> List[Tuple[float, float, float]]:
+        """Calculate fitness for a whole generation, optionally scoring on a worker pool.
+        
+        Distortions are drawn up front in one batch, so the random stream and
+        therefore the results match the serial path for a fixed seed. Privacy is scored
+        with one batched embedding request; usability calls run on the executor
+        unless a usability backend scores the batch itself.
+        """
+        distorted_texts = self._distort_population(individuals, text, rng, common_random_numbers)
+        with METRICS.span("fitness_privacy"):
+            privacy_scores = self.calculate_privacy_scores(text, distorted_texts)
+        
+        def usability(distorted_text: str) -> float:
+            return self.get_usability_score(text, distorted_text)
+        
+        with METRICS.span("fitness_usability"):
+            if self.usability_backend is not None:
+                usability_scores = [float(score) for score in
+                                    self.usability_backend.usability_scores(text, distorted_texts)]
+            elif executor is None:
+                usability_scores = [usability(distorted_text) for distorted_text in distorted_texts]
+            else:
+                # Worker threads report to the caller's turn trace
+                usability_scores = list(executor.map(METRICS.bind(usability), distorted_texts))
+        
+        return self._combine_population(privacy_scores, usability_scores, alpha)
+
+    def _distort_population(self, individuals: List[Individual], text: str,
+                            rng: Optional[RandomStreams], common_random_numbers: bool) -> List[str]:
+        """Distort the text for every individual in one vectorized call"""
+        distorted_texts = distort_texts(
+            text, [individual.weights for individual in individuals],
+            rng=rng, common_random_numbers=common_random_numbers
+        )
+        for individual, distorted_text in zip(individuals, distorted_texts):
+            individual.distorted_text = distorted_text
+        return distorted_texts
+
+    def _combine_population(self, privacy_scores, usability_scores, alpha: float) -> List[Tuple[float, float, float]]:
+        """Combine per-individual privacy and usability into fitness tuples"""
+        return [
+            self._combine_scores(float(privacy), float(usability_score), alpha)
+            for privacy, usability_score in zip(privacy_scores, usability_scores)
+        ]
+
+class AsyncFitnessCalculator(FitnessCalculator):
+    """FitnessCalculator built on AsyncOpenAI, for use inside an event loop.
+    
+    Caches, backends and scoring are shared with FitnessCalculator; only the
+    network calls are awaited, so many fitness evaluations (and unrelated
+    conversations) can be in flight on one thread.
+    """
+
+    def __init__(self, client: AsyncOpenAI, embedding_model: str = "text-embedding-3-small",
+                 concurrency: int = 8, **kwargs):
+        super().__init__(client, embedding_model, **kwargs)
+        self.concurrency = concurrency
+
+    async def get_embedding(self, text: str) -> np.ndarray:
+        """Get embedding for text using OpenAI's API"""
+        cached = self.embedding_cache.get_embedding(self.embedding_model, text)
+        if cached is not None:
+            return cached
+        
+        self._count_api_call()
+        response = await self.client.embeddings.create(
+            input=text,
+            model=self.embedding_model
+        )
+        embedding = np.array(response.data[0].embedding)
+        self.embedding_cache.put_embedding(self.embedding_model, text, embedding)
+        return embedding
+
+    async def get_embeddings(self, texts: List[str]) -> np.ndarray:
+        """Get embeddings for many texts, sending the batches concurrently"""
+        embeddings, batches = self._cached_embeddings(texts)
+        
+        async def fetch(batch_texts: List[str]) -> None:
+            self._count_api_call()
+            response = await self.client.embeddings.create(
+                input=batch_texts,
+                model=self.embedding_model
             )
-            
-            gpt_answer = response.choices[0].message.content.lower().strip()
-            
-            words1 = set(original_text.lower().split())
-            words2 = set(gpt_answer.lower().split())
-            
-            if not words1:
-                return 0.0
-                
-            matching_words = words1.intersection(words2)
-            return len(matching_words) / len(words1)
-            
+            self._store_embeddings(batch_texts, response, embeddings)
+        
+        await asyncio.gather(*(fetch(batch_texts) for batch_texts in batches))
+        return np.array([embeddings[text] for text in texts])
+
+    async def pin_reference(self, text: str) -> None:
+        """Embed the original text once so later privacy scores reuse it"""
+        if self.privacy_backend is not None:
+            self.privacy_backend.pin_reference(text)
+            return
+        self._reference_text = text
+        self._reference_embedding = await self.get_embedding(text)
+
+    async def get_reference_embedding(self, text: str) -> np.ndarray:
+        """Return the pinned embedding for text, or embed it if it is not pinned"""
+        if self._reference_embedding is not None and text == self._reference_text:
+            return self._reference_embedding
+        return await self.get_embedding(text)
+
+    async def calculate_privacy_score(self, original_text: str, distorted_text: str) -> float:
+        """Calculate privacy score using embeddings"""
+        if self.privacy_backend is not None:
+            return float(self.privacy_backend.privacy_scores(original_text, [distorted_text])[0])
+        original_embedding, distorted_embedding = await asyncio.gather(
+            self.get_reference_embedding(original_text), self.get_embedding(distorted_text)
+        )
+        
+        return 1 - self.cosine_similarity(original_embedding, distorted_embedding)
+
+    async def calculate_privacy_scores(self, original_text: str, distorted_texts: List[str]) -> np.ndarray:
+        """Privacy score for every distorted text, with one batched embedding request"""
+        if self.privacy_backend is not None:
+            return self.privacy_backend.privacy_scores(original_text, distorted_texts)
+        original_embedding, distorted_embeddings = await asyncio.gather(
+            self.get_reference_embedding(original_text), self.get_embeddings(distorted_texts)
+        )
+        
+        return self._privacy_from_embeddings(original_embedding, distorted_embeddings)
+
+    async def get_reconstruction(self, distorted_text: str) -> str:
+        """Reconstruct distorted text with the GPT model, memoizing successful responses"""
+        cached = self._cached_reconstruction(distorted_text)
+        if cached is not None:
+            return cached
+        
+        self._count_api_call()
+        response = await self.client.chat.completions.create(**self._reconstruction_request(distorted_text))
+        return self._store_reconstruction(distorted_text, response)
+
+    async def get_usability_score(self, original_text: str, distorted_text: str) -> float:
+        """Calculate usability score using GPT model"""
+        if self.usability_backend is not None:
+            return float(self.usability_backend.usability_scores(original_text, [distorted_text])[0])
+        try:
+            # Failed calls raise here, so they are never cached
+            gpt_answer = await self.get_reconstruction(distorted_text)
+        except RETRYABLE_ERRORS:
+            # Throttling that outlasts the scheduler's retries must not score as 0.0
+            raise
         except Exception as e:
             print(f"Error getting GPT response: {e}")
             return 0.0
+        
+        return self._word_overlap(original_text, gpt_answer)
 
-    def calculate_fitness(self, individual: Individual, text: str, alpha: float) -> Tuple[float, float, float]:
+    async def score_distorted_text(self, text: str, distorted_text: str, alpha: float) -> Tuple[float, float, float]:
+        """Calculate fitness, privacy and usability for an already distorted text"""
+        privacy_score, usability_score = await asyncio.gather(
+            self.calculate_privacy_score(text, distorted_text),
+            self.get_usability_score(text, distorted_text)
+        )
+        
+        return self._combine_scores(privacy_score, usability_score, alpha)
+
+    async def calculate_fitness(self, individual: Individual, text: str, alpha: float,
+                                rng: Optional[np.random.Generator] = None) -> Tuple[float, float, float]:
         """Calculate fitness based on privacy and usability scores"""
-        distorted_text = distort_text(text, individual.weights)
+        distorted_text = distort_text(text, individual.weights, rng=rng)
         individual.distorted_text = distorted_text
         
-        privacy_score = self.calculate_privacy_score(text, distorted_text)
-        usability_score = self.get_usability_score(text, distorted_text)
+        return await self.score_distorted_text(text, distorted_text, alpha)
+
+    async def calculate_population_fitness(self, individuals: List[Individual], text: str, alpha: float,
+                                           rng: Optional[RandomStreams] = None,
+                                           common_random_numbers: bool = False) -> List[Tuple[float, float, float]]:
+        """Calculate fitness for a whole generation with concurrent requests.
         
-        # Calculate fitness as weighted sum of privacy and usability
-        fitness = (alpha * privacy_score) + ((1 - alpha) * usability_score)
+        Distortions are drawn up front exactly as in the synchronous path, so a
+        fixed seed gives the same results. At most self.concurrency usability
+        calls are awaited at once, alongside the batched privacy request.
+        """
+        distorted_texts = self._distort_population(individuals, text, rng, common_random_numbers)
+        
+        async def privacy() -> np.ndarray:
+            with METRICS.span("fitness_privacy"):
+                return await self.calculate_privacy_scores(text, distorted_texts)
+        
+        if self.usability_backend is not None:
+            privacy_scores = await privacy()
+            with METRICS.span("fitness_usability"):
+                usability_scores = [float(score) for score in
+                                    self.usability_backend.usability_scores(text, distorted_texts)]
+            return self._combine_population(privacy_scores, usability_scores, alpha)
+        
+        semaphore = asyncio.Semaphore(self.concurrency)
+        
+        async def usability(distorted_text: str) -> float:
+            async with semaphore:
+                return await self.get_usability_score(text, distorted_text)
+        
+        async def all_usability() -> List[float]:
+            with METRICS.span("fitness_usability"):
+                return await asyncio.gather(*(usability(distorted_text) for distorted_text in distorted_texts))
         
-        return fitness, privacy_score, usability_score
\ No newline at end of file
+        privacy_scores, usability_scores = await asyncio.gather(privacy(), all_usability())
+        return self._combine_population(privacy_scores, usability_scores, alpha)
@@ -1,34 +1,113 @@
+import random
+import time
 import numpy as np
-from typing import Dict
-import openai
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Dict, Generator, List, Optional, Tuple
 from .gaOperations import Individual, GeneticOperations
-from .fitnessEval import FitnessCalculator
+from .fitnessEval import AsyncFitnessCalculator, FitnessCalculator
+from .apiScheduler import get_shared_async_client, get_shared_client
+from .evalCache import EmbeddingCache, ReconstructionCache
+from .fitnessBackends import PrivacyBackend, UsabilityBackend
+from .surrogate import FitnessSurrogate
+from .metrics import METRICS
 
 class GeneticTextDistorter:
+    # Every distorter shares the process-wide rate-limited client
+    client_factory = staticmethod(get_shared_client)
+    calculator_class = FitnessCalculator
+
     def __init__(
         self,
-        api_key: str,
+        api_key: Optional[str],
         population_size: int = 10,
         elite_size: int = 2,
         mutation_rate: float = 0.2,
         alpha: float = 0.5,
         embedding_model: str = "text-embedding-3-small",
-        min_unchanged_weight: float = 0.0  # Added minimum threshold for unchanged weight
+        min_unchanged_weight: float = 0.0,  # Added minimum threshold for unchanged weight
+        max_workers: int = 1,  # Concurrent fitness evaluations per generation (1 = serial)
+        embedding_cache: Optional[EmbeddingCache] = None,  # Shared across distorters if given
+        reconstruction_cache: Optional[ReconstructionCache] = None,
+        seed: Optional[int] = None,  # Fixes every random stream in the run; random if None
+        common_random_numbers: bool = False,  # Share position draws across a generation
+        privacy_backend: Optional[PrivacyBackend] = None,  # Defaults to OpenAI embeddings
+        usability_backend: Optional[UsabilityBackend] = None,  # Defaults to GPT reconstruction
+        surrogate_top_k: Optional[int] = None,  # Offspring per generation promoted to full evaluation
+        surrogate_explore: int = 1,  # Extra random offspring promoted for exploration
+        memo_resolution: float = 0.01,  # Weight quantum (percentage points) for the genome memo
+        base_url: Optional[str] = None  # OpenAI-compatible endpoint, e.g. openai_stub_server.py
     ):
-        self.client = openai.OpenAI(api_key=api_key)
+        # Fully local backends need no API client
+        needs_client = api_key is not None or privacy_backend is None or usability_backend is None
+        self.client = self.client_factory(api_key, base_url) if needs_client else None
         self.population_size = population_size
         self.elite_size = elite_size
         self.alpha = alpha
         self.best_solution = None
         self.min_unchanged_weight = min_unchanged_weight
+        self.max_workers = max(1, max_workers)
+        self.common_random_numbers = common_random_numbers
+        
+        # Surrogate-assisted mode screens offspring cheaply before the API-backed evaluation
+        if surrogate_top_k is not None:
+            if surrogate_top_k < 0 or surrogate_explore < 0:
+                raise ValueError("surrogate_top_k and surrogate_explore must not be negative")
+            if surrogate_top_k + surrogate_explore < 1:
+                raise ValueError("Surrogate mode must promote at least one offspring per generation "
+                                 "(surrogate_top_k + surrogate_explore >= 1)")
+        self.surrogate_top_k = surrogate_top_k
+        self.surrogate_explore = surrogate_explore
+        self.surrogate = FitnessSurrogate(alpha) if surrogate_top_k is not None else None
+        
+        # Scores of genomes already evaluated in the current run, keyed on quantized weights
+        self.memo_resolution = memo_resolution
+        self._evaluation_memo = {}
+        self.evaluation_stats = {'evaluations': 0, 'memo_hits': 0}
         
-        self.fitness_calculator = FitnessCalculator(
+        # Record the effective seed so an unseeded run can still be reproduced
+        self._seed_sequence = np.random.SeedSequence(seed)
+        self.seed = self._seed_sequence.entropy
+        
+        self.fitness_calculator = self.calculator_class(
             self.client,
-            embedding_model=embedding_model
+            embedding_model=embedding_model,
+            embedding_cache=embedding_cache,
+            reconstruction_cache=reconstruction_cache,
+            privacy_backend=privacy_backend,
+            usability_backend=usability_backend
+        )
+        self.genetic_ops = GeneticOperations(
+            mutation_rate, min_unchanged_weight, rng=random.Random(self.seed)
         )
-        self.genetic_ops = GeneticOperations(mutation_rate, min_unchanged_weight)
 
-    def _adjust_weights_for_privacy(self, individual: Individual, current_privacy: float) -> None:
+    def _enforce_min_unchanged(self, individual: Individual) -> None:
+        """Raise the unchanged weight to the minimum, scaling the other weights down"""
+        if individual.weights["unchanged"] < self.min_unchanged_weight:
+            deficit = self.min_unchanged_weight - individual.weights["unchanged"]
+            individual.weights["unchanged"] = self.min_unchanged_weight
+            
+            # Proportionally reduce other weights
+            other_ops = [op for op in individual.weights.keys() if op != "unchanged"]
+            total_other_weights = sum(individual.weights[op] for op in other_ops)
+            if total_other_weights > 0:
+                reduction_factor = (100 - self.min_unchanged_weight) / total_other_weights
+                for op in other_ops:
+                    individual.weights[op] *= reduction_factor
+            
+            # Renormalize weights
+            total = sum(individual.weights.values())
+            individual.weights = {k: (v/total)*100 for k, v in individual.weights.items()}
+
+    def _repair_weights(self, individual: Individual) -> None:
+        """Apply every weight repair before the individual is scored.
+        
+        The privacy adjustment does not depend on the measured privacy, so it can
+        run up front and each individual needs only one evaluation.
+        """
+        self._enforce_min_unchanged(individual)
+        self._adjust_weights_for_privacy(individual)
+
+    def _adjust_weights_for_privacy(self, individual: Individual, current_privacy: Optional[float] = None) -> None:
         """Adjust weights to better control privacy score while maintaining minimum unchanged weight"""
         # Calculate adjustment factor based on privacy
         adjustment = 0.5
@@ -62,112 +141,300 @@ class GeneticTextDistorter:
         total = sum(individual.weights.values())
         individual.weights = {k: (v/total)*100 for k, v in individual.weights.items()}
 
-    def train(self, text: str, generations: int = 5) -> Dict:
-        """Train the genetic algorithm with improved privacy control"""
+    def _distortion_streams(self, count: int) -> Dict:
+        """Spawn the random streams for distorting one batch of individuals.
+        
+        Each individual gets its own child stream of the run seed; with common
+        random numbers the whole batch shares a single stream instead.
+        """
+        if self.common_random_numbers:
+            streams = [np.random.default_rng(self._seed_sequence.spawn(1)[0])]
+        else:
+            streams = [np.random.default_rng(child) for child in self._seed_sequence.spawn(count)]
+        return {'rng': streams, 'common_random_numbers': self.common_random_numbers}
+
+    def _genome_key(self, weights: Dict[str, float]) -> tuple:
+        """Quantize a weight vector so near-identical genomes share a memo entry"""
+        return tuple((key, round(value / self.memo_resolution)) for key, value in weights.items())
+
+    def _evaluation_steps(self, individuals: List[Individual], text: str) -> Generator:
+        """Score each individual once in place, reusing earlier scores for duplicate genomes.
+        
+        Yields one ("score", (unique_individuals, streams)) request for the driver
+        and expects the fitness tuples back.
+        """
+        pending = {}
+        for individual in individuals:
+            key = self._genome_key(individual.weights)
+            if key in self._evaluation_memo:
+                scores = self._evaluation_memo[key]
+                self.evaluation_stats['memo_hits'] += 1
+            else:
+                pending.setdefault(key, []).append(individual)
+                continue
+            individual.fitness, individual.privacy_score, individual.usability_score, individual.distorted_text = scores
+        
+        # Duplicates within the batch are evaluated once as well
+        unique = [group[0] for group in pending.values()]
+        if not unique:
+            return
+        results = yield ("score", (unique, self._distortion_streams(len(unique))))
+        self.evaluation_stats['evaluations'] += len(unique)
+        
+        for (key, group), (fitness, privacy, usability) in zip(pending.items(), results):
+            scores = (fitness, privacy, usability, group[0].distorted_text)
+            self._evaluation_memo[key] = scores
+            self.evaluation_stats['memo_hits'] += len(group) - 1
+            for individual in group:
+                individual.fitness, individual.privacy_score, individual.usability_score, individual.distorted_text = scores
+
+    def _screen_offspring(self, children: List[Individual], text: str) -> List[Individual]:
+        """Score offspring with the surrogate and return those promoted to full evaluation"""
+        if not children:
+            return []
+        features = self.surrogate.features(children, text, **self._distortion_streams(len(children)))
+        promoted, predictions = self.surrogate.screen(
+            features, self.surrogate_top_k, self.surrogate_explore, self.genetic_ops.rng
+        )
+        
+        # Offspring that are not promoted keep surrogate estimates and never become the best solution
+        for index, child in enumerate(children):
+            child.fitness = float(predictions[index])
+            child.privacy_score = float(features[index, -3])
+            child.usability_score = float(features[index, -2])
+            child.evaluated = index in promoted
+        return [children[index] for index in sorted(promoted)]
+
+    def _observe_evaluations(self, individuals: List[Individual], text: str) -> None:
+        """Refit the surrogate on individuals that just had a full evaluation.
+        
+        Features come from the distorted texts that produced each fitness, so the
+        training pairs match and no random draws are spent.
+        """
+        if not individuals:
+            return
+        features = self.surrogate.text_features(
+            individuals, text, [individual.distorted_text for individual in individuals]
+        )
+        self.surrogate.observe(features, [individual.fitness for individual in individuals])
+
+    def train(self, text: str, generations: int = 5,
+              max_api_calls: Optional[int] = None,
+              deadline: Optional[float] = None,
+              plateau_generations: Optional[int] = None,
+              plateau_tolerance: float = 1e-4,
+              min_diversity: Optional[float] = None) -> Dict:
+        """Train the genetic algorithm with improved privacy control.
+        
+        Training stops early, returning the best solution so far, when the next
+        generation would exceed max_api_calls or the deadline (seconds from now),
+        when the best fitness has improved by no more than plateau_tolerance over
+        plateau_generations generations, or when diversity drops below min_diversity.
+        The rule that fired is reported under results['stopping'].
+        
+        The initial population is shrunk so that pinning the reference and scoring
+        it fit max_api_calls. ValueError is raised, naming the rule, when not even
+        one individual fits or the deadline passes before any is scored.
+        """
+        executor = ThreadPoolExecutor(max_workers=self.max_workers) if self.max_workers > 1 else None
+        limits = self._stopping_limits(max_api_calls, deadline, plateau_generations,
+                                       plateau_tolerance, min_diversity)
+        try:
+            return self._train(text, generations, executor, limits)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+    @staticmethod
+    def _stopping_limits(max_api_calls, deadline, plateau_generations, plateau_tolerance, min_diversity) -> Dict:
+        """Collect the early-stopping arguments of train"""
+        return {
+            'max_api_calls': max_api_calls,
+            'deadline': deadline,
+            'plateau_generations': plateau_generations,
+            'plateau_tolerance': plateau_tolerance,
+            'min_diversity': min_diversity
+        }
+
+    def _train(self, text: str, generations: int, executor: Optional[Executor], limits: Dict) -> Dict:
+        """Drive the GA loop, scoring each generation on the given executor"""
+        steps = self._training_steps(text, generations, limits)
+        reply = None
+        while True:
+            try:
+                kind, payload = steps.send(reply)
+            except StopIteration as finished:
+                return finished.value
+            
+            if kind == "pin":
+                reply = self.fitness_calculator.pin_reference(payload)
+            else:
+                individuals, streams = payload
+                reply = self.fitness_calculator.calculate_population_fitness(
+                    individuals, text, self.alpha, executor, **streams
+                )
+
+    def _initial_population_size(self, limits: Dict) -> int:
+        """Largest initial population whose reference pin and scoring fit the API budget"""
+        size = self.population_size
+        if limits['max_api_calls'] is not None:
+            while size > 0 and self.fitness_calculator.api_call_bound(size, reference=True) > limits['max_api_calls']:
+                size -= 1
+        return size
+
+    def _next_generation_calls(self, evaluated_count: int) -> int:
+        """Most API requests the next generation's offspring can make"""
+        offspring = self.population_size - min(self.elite_size, evaluated_count)
+        if self.surrogate is not None:
+            offspring = min(offspring, self.surrogate_top_k + self.surrogate_explore)
+        return self.fitness_calculator.api_call_bound(offspring)
+
+    def _stopping_rule(self, limits: Dict, api_calls: int, elapsed: float,
+                       generation_calls: int, generation_time: float,
+                       best_fitness_history: List[float], diversity_history: List[float]) -> Optional[str]:
+        """Return the name of the first stopping rule that fires before the next generation"""
+        # The budget is checked against the most the next generation can cost, the
+        # deadline against the time the last one took
+        if limits['max_api_calls'] is not None and api_calls + generation_calls > limits['max_api_calls']:
+            return "api_budget"
+        if limits['deadline'] is not None and elapsed + generation_time > limits['deadline']:
+            return "deadline"
+        
+        window = limits['plateau_generations']
+        if window is not None and len(best_fitness_history) > window:
+            improvement = best_fitness_history[-1] - best_fitness_history[-1 - window]
+            if improvement <= limits['plateau_tolerance']:
+                return "plateau"
+        
+        if limits['min_diversity'] is not None and diversity_history and diversity_history[-1] < limits['min_diversity']:
+            return "diversity"
+        return None
+
+    @staticmethod
+    def _check_deadline(limits: Dict, start_time: float) -> None:
+        """Fail fast when the deadline passes before the initial population is scored"""
+        if limits['deadline'] is not None and time.monotonic() - start_time >= limits['deadline']:
+            raise ValueError("Stopping rule 'deadline' fired before the initial population: "
+                             f"deadline={limits['deadline']}s left no time to score it")
+
+    def _update_best(self, population: List[Individual]) -> None:
+        """Keep the fittest fully evaluated individual seen so far"""
+        evaluated = [ind for ind in population if ind.evaluated]
+        if evaluated:
+            best = max(evaluated, key=lambda x: x.fitness)
+            if self.best_solution is None or best.fitness > self.best_solution.fitness:
+                self.best_solution = best
+
+    def _training_steps(self, text: str, generations: int, limits: Dict) -> Generator[Tuple[str, object], object, Dict]:
+        """Run the GA loop, yielding each network-bound step to the driver.
+        
+        Requests are ("pin", text) and ("score", (individuals, streams)); the driver
+        sends back the result, so train and the async train share this loop.
+        """
+        start_time = time.monotonic()
+        start_calls = self.fitness_calculator.api_calls
+        
+        # The memo is only valid for this text
+        self._evaluation_memo = {}
+        self.evaluation_stats = {'evaluations': 0, 'memo_hits': 0}
+        
+        # Both limits are enforced before any request, so even the initial population stays within them
+        initial_size = self._initial_population_size(limits)
+        if initial_size == 0:
+            raise ValueError("Stopping rule 'api_budget' fired before the initial population: "
+                             f"max_api_calls={limits['max_api_calls']} cannot score a single individual")
+        self._check_deadline(limits, start_time)
+        
+        # Embed the original text once for every privacy score in this run
+        yield ("pin", text)
+        self._check_deadline(limits, start_time)
+        
         # Initialize population with privacy-aware weights
         population = []
-        for _ in range(self.population_size):
+        for _ in range(initial_size):
             individual = self.genetic_ops.create_individual()
             
-            # Ensure initial weights meet minimum unchanged threshold
-            if individual.weights["unchanged"] < self.min_unchanged_weight:
-                deficit = self.min_unchanged_weight - individual.weights["unchanged"]
-                individual.weights["unchanged"] = self.min_unchanged_weight
-                
-                # Proportionally reduce other weights
-                other_ops = [op for op in individual.weights.keys() if op != "unchanged"]
-                total_other_weights = sum(individual.weights[op] for op in other_ops)
-                if total_other_weights > 0:
-                    reduction_factor = (100 - self.min_unchanged_weight) / total_other_weights
-                    for op in other_ops:
-                        individual.weights[op] *= reduction_factor
-                
-                # Renormalize weights
-                total = sum(individual.weights.values())
-                individual.weights = {k: (v/total)*100 for k, v in individual.weights.items()}
-            
-            fitness, privacy, usability = self.fitness_calculator.calculate_fitness(
-                individual, text, self.alpha
-            )
-            
-            # Adjust weights based on privacy score
-            self._adjust_weights_for_privacy(individual, privacy)
-            
-            # Recalculate fitness after adjustment
-            fitness, privacy, usability = self.fitness_calculator.calculate_fitness(
-                individual, text, self.alpha
-            )
+            # Apply all weight repairs so each individual is evaluated once
+            self._repair_weights(individual)
             
-            individual.fitness = fitness
-            individual.privacy_score = privacy
-            individual.usability_score = usability
             population.append(individual)
         
+        yield from self._evaluation_steps(population, text)
+        if self.surrogate is not None:
+            self._observe_evaluations(population, text)
+        
         best_fitness_history = []
         avg_fitness_history = []
         diversity_history = []
         
+        stopping_rule = "generations"
+        generations_run = 0
+        generation_time = time.monotonic() - start_time
+        METRICS.record("ga_initial_population", generation_time)
+        
         for generation in range(generations):
             # Sort population by fitness
             population.sort(key=lambda x: x.fitness, reverse=True)
             
+            # Only fully evaluated individuals can be the best solution or elites
+            evaluated = [ind for ind in population if ind.evaluated]
+            
             # Update best solution
-            if self.best_solution is None or population[0].fitness > self.best_solution.fitness:
-                self.best_solution = population[0]
+            self._update_best(population)
+            
+            rule = self._stopping_rule(
+                limits,
+                self.fitness_calculator.api_calls - start_calls,
+                time.monotonic() - start_time,
+                self._next_generation_calls(len(evaluated)), generation_time,
+                best_fitness_history, diversity_history
+            )
+            if rule is not None:
+                stopping_rule = rule
+                break
+            generation_start = time.monotonic()
             
             # Create new population
             new_population = []
             
             # Elitism - keep best solutions
-            for i in range(min(self.elite_size, len(population))):
-                new_population.append(population[i])
+            for i in range(min(self.elite_size, len(evaluated))):
+                new_population.append(evaluated[i])
             
             # Create rest of new population
-            while len(new_population) < self.population_size:
+            children = []
+            while len(new_population) + len(children) < self.population_size:
                 parent1 = self.genetic_ops.rank_based_selection(population)
                 parent2 = self.genetic_ops.rank_based_selection(population)
                 
                 child = self.genetic_ops.crossover(parent1, parent2)
                 self.genetic_ops.mutate(child)
                 
-                # Ensure child meets minimum unchanged weight
-                if child.weights["unchanged"] < self.min_unchanged_weight:
-                    deficit = self.min_unchanged_weight - child.weights["unchanged"]
-                    child.weights["unchanged"] = self.min_unchanged_weight
-                    
-                    # Proportionally reduce other weights
-                    other_ops = [op for op in child.weights.keys() if op != "unchanged"]
-                    total_other_weights = sum(child.weights[op] for op in other_ops)
-                    if total_other_weights > 0:
-                        reduction_factor = (100 - self.min_unchanged_weight) / total_other_weights
-                        for op in other_ops:
-                            child.weights[op] *= reduction_factor
-                    
-                    # Renormalize weights
-                    total = sum(child.weights.values())
-                    child.weights = {k: (v/total)*100 for k, v in child.weights.items()}
-                
-                fitness, privacy, usability = self.fitness_calculator.calculate_fitness(
-                    child, text, self.alpha
-                )
-                
-                # Adjust weights based on privacy score
-                self._adjust_weights_for_privacy(child, privacy)
-                fitness, privacy, usability = self.fitness_calculator.calculate_fitness(
-                    child, text, self.alpha
-                )
-                
-                child.fitness = fitness
-                child.privacy_score = privacy
-                child.usability_score = usability
+                # Apply all weight repairs so each child is evaluated once
+                self._repair_weights(child)
                 
-                new_population.append(child)
+                children.append(child)
+            
+            # In surrogate mode only the promoted offspring reach the API-backed evaluation
+            promoted = self._screen_offspring(children, text) if self.surrogate is not None else children
+            
+            # Evaluate the whole generation at once so API calls can run concurrently
+            yield from self._evaluation_steps(promoted, text)
+            if self.surrogate is not None:
+                self._observe_evaluations(promoted, text)
+            new_population.extend(children)
             
             population = new_population
             
-            # Calculate metrics
-            best_fitness = max(population, key=lambda x: x.fitness).fitness
-            avg_fitness = sum(ind.fitness for ind in population) / len(population)
+            # Calculate metrics from fully evaluated individuals
+            evaluated = [ind for ind in population if ind.evaluated]
+            if evaluated:
+                best_fitness = max(evaluated, key=lambda x: x.fitness).fitness
+                avg_fitness = sum(ind.fitness for ind in evaluated) / len(evaluated)
+            else:
+                # Nothing was fully evaluated this generation; carry the previous figures forward
+                best_fitness = best_fitness_history[-1] if best_fitness_history else 0.0
+                avg_fitness = avg_fitness_history[-1] if avg_fitness_history else 0.0
             
             diversity = np.mean([
                 np.std([ind.weights[key] for ind in population])
@@ -177,13 +444,32 @@ class GeneticTextDistorter:
             best_fitness_history.append(best_fitness)
             avg_fitness_history.append(avg_fitness)
             diversity_history.append(diversity)
+            
+            generations_run += 1
+            generation_time = time.monotonic() - generation_start
+            METRICS.record("ga_generation", generation_time)
+        
+        # The last generation's offspring can hold the best solution too
+        self._update_best(population)
         
+        stopping = {
+            'rule': stopping_rule,
+            'generations_run': generations_run,
+            'api_calls': self.fitness_calculator.api_calls - start_calls,
+            'elapsed_seconds': time.monotonic() - start_time,
+            'evaluations': self.evaluation_stats['evaluations'],
+            'skipped_evaluations': self.evaluation_stats['memo_hits']
+        }
+        METRICS.record("ga_train", stopping['elapsed_seconds'], rule=stopping_rule)
+        METRICS.count("ga_evaluations", stopping['evaluations'])
+        METRICS.count("ga_memo_hits", stopping['skipped_evaluations'])
         return self._create_results_dict(best_fitness_history, 
                                        avg_fitness_history, 
-                                       diversity_history)
+                                       diversity_history,
+                                       stopping)
 
     def _create_results_dict(self, best_fitness_history, avg_fitness_history, 
-                            diversity_history) -> Dict:
+                            diversity_history, stopping=None) -> Dict:
         """Create dictionary with training results"""
         if self.best_solution is None:
             raise ValueError("No valid solution found")
@@ -204,9 +490,49 @@ class GeneticTextDistorter:
                 'best_fitness_history': best_fitness_history,
                 'avg_fitness_history': avg_fitness_history,
                 'diversity_history': diversity_history
-            }
+            },
+            'stopping': stopping
         }
 
+class AsyncGeneticTextDistorter(GeneticTextDistorter):
+    """GeneticTextDistorter whose train is a coroutine built on AsyncOpenAI.
+    
+    The GA loop is shared with the synchronous class; fitness requests are awaited,
+    with up to concurrency usability calls in flight per generation, so many
+    trainings can share one event loop.
+    """
+    client_factory = staticmethod(get_shared_async_client)
+    calculator_class = AsyncFitnessCalculator
+
+    def __init__(self, api_key: Optional[str], concurrency: int = 8, **kwargs):
+        super().__init__(api_key, **kwargs)
+        self.fitness_calculator.concurrency = concurrency
+
+    async def train(self, text: str, generations: int = 5,
+                    max_api_calls: Optional[int] = None,
+                    deadline: Optional[float] = None,
+                    plateau_generations: Optional[int] = None,
+                    plateau_tolerance: float = 1e-4,
+                    min_diversity: Optional[float] = None) -> Dict:
+        """Train the genetic algorithm; see GeneticTextDistorter.train"""
+        limits = self._stopping_limits(max_api_calls, deadline, plateau_generations,
+                                       plateau_tolerance, min_diversity)
+        steps = self._training_steps(text, generations, limits)
+        reply = None
+        while True:
+            try:
+                kind, payload = steps.send(reply)
+            except StopIteration as finished:
+                return finished.value
+            
+            if kind == "pin":
+                reply = await self.fitness_calculator.pin_reference(payload)
+            else:
+                individuals, streams = payload
+                reply = await self.fitness_calculator.calculate_population_fitness(
+                    individuals, text, self.alpha, **streams
+                )
+
 # def main():
 #     """Example usage"""
 #     api_key = ""
@@ -1,6 +1,6 @@
 from dataclasses import dataclass
 import random
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 @dataclass
 class Individual:
@@ -10,43 +10,52 @@ class Individual:
     privacy_score: float = 0.0
     usability_score: float = 0.0
     distorted_text: str = ""
+    evaluated: bool = True  # False while scores are only surrogate estimates
+
+def normalize_weights(weights: Dict[str, float], min_unchanged_weight: float) -> Dict[str, float]:
+    """Normalize weights to sum to 100 while keeping "unchanged" at or above min_unchanged_weight"""
+    weights = dict(weights)
+    # First ensure unchanged meets minimum
+    if weights["unchanged"] < min_unchanged_weight:
+        weights["unchanged"] = min_unchanged_weight
+        
+        # Adjust other weights proportionally
+        other_ops = [op for op in weights.keys() if op != "unchanged"]
+        remaining_weight = 100 - min_unchanged_weight
+        total_other_weights = sum(weights[op] for op in other_ops)
+        
+        if total_other_weights > 0:
+            scale_factor = remaining_weight / total_other_weights
+            for op in other_ops:
+                weights[op] *= scale_factor
+    
+    # Normalize to ensure sum is 100
+    total = sum(weights.values())
+    return {k: (v/total)*100 for k, v in weights.items()}
 
 class GeneticOperations:
-    def __init__(self, mutation_rate: float = 0.2, min_unchanged_weight: float = 30.0):
+    def __init__(self, mutation_rate: float = 0.2, min_unchanged_weight: float = 30.0,
+                 rng: Optional[random.Random] = None):
         self.mutation_rate = mutation_rate
         self.min_unchanged_weight = min_unchanged_weight
+        # Explicit stream for reproducible runs; falls back to the global random module
+        self.rng = rng if rng is not None else random
 
     def _normalize_weights_with_minimum(self, weights: Dict[str, float]) -> Dict[str, float]:
         """Normalize weights while ensuring minimum unchanged weight"""
-        # First ensure unchanged meets minimum
-        if weights["unchanged"] < self.min_unchanged_weight:
-            weights["unchanged"] = self.min_unchanged_weight
-            
-            # Adjust other weights proportionally
-            other_ops = [op for op in weights.keys() if op != "unchanged"]
-            remaining_weight = 100 - self.min_unchanged_weight
-            total_other_weights = sum(weights[op] for op in other_ops)
-            
-            if total_other_weights > 0:
-                scale_factor = remaining_weight / total_other_weights
-                for op in other_ops:
-                    weights[op] *= scale_factor
-        
-        # Normalize to ensure sum is 100
-        total = sum(weights.values())
-        return {k: (v/total)*100 for k, v in weights.items()}
+        return normalize_weights(weights, self.min_unchanged_weight)
 
     def create_individual(self) -> Individual:
         """Create a random individual with normalized weights and minimum unchanged weight"""
         weights = {
-            "unchanged": max(random.random(), self.min_unchanged_weight/100),
-            "capitalization": random.random(),
-            "symbol": random.random(),
-            "adjacent": random.random(),
-            "swap": random.random(),
-            "insert": random.random(),
-            "repeat": random.random(),
-            "punctuation": random.random()
+            "unchanged": max(self.rng.random(), self.min_unchanged_weight/100),
+            "capitalization": self.rng.random(),
+            "symbol": self.rng.random(),
+            "adjacent": self.rng.random(),
+            "swap": self.rng.random(),
+            "insert": self.rng.random(),
+            "repeat": self.rng.random(),
+            "punctuation": self.rng.random()
         }
         
         normalized_weights = self._normalize_weights_with_minimum(weights)
@@ -54,7 +63,7 @@ class GeneticOperations:
 
     def rank_based_selection(self, population: List[Individual]) -> Individual:
         """Select individual using tournament selection"""
-        tournament = random.sample(population, 3)
+        tournament = self.rng.sample(population, 3)
         return max(tournament, key=lambda x: x.fitness)
 
     def crossover(self, parent1: Individual, parent2: Individual) -> Individual:
@@ -64,7 +73,7 @@ class GeneticOperations:
         # Special handling for unchanged weight
         if parent1.weights["unchanged"] >= self.min_unchanged_weight and parent2.weights["unchanged"] >= self.min_unchanged_weight:
             # Both parents meet minimum - normal crossover for unchanged
-            child_weights["unchanged"] = parent1.weights["unchanged"] if random.random() < 0.5 else parent2.weights["unchanged"]
+            child_weights["unchanged"] = parent1.weights["unchanged"] if self.rng.random() < 0.5 else parent2.weights["unchanged"]
         else:
             # At least one parent doesn't meet minimum - use minimum
             child_weights["unchanged"] = self.min_unchanged_weight
@@ -72,7 +81,7 @@ class GeneticOperations:
         # Normal crossover for other weights
         for key in parent1.weights:
             if key != "unchanged":
-                if random.random() < 0.5:
+                if self.rng.random() < 0.5:
                     child_weights[key] = parent1.weights[key]
                 else:
                     child_weights[key] = parent2.weights[key]
@@ -83,15 +92,15 @@ class GeneticOperations:
 
     def mutate(self, individual: Individual) -> None:
         """Enhanced mutation while maintaining minimum unchanged weight"""
-        if random.random() < self.mutation_rate:
+        if self.rng.random() < self.mutation_rate:
             # Choose random weight to mutate, excluding unchanged if it would go below minimum
             mutable_keys = list(individual.weights.keys())
             if individual.weights["unchanged"] <= self.min_unchanged_weight:
                 mutable_keys.remove("unchanged")
                 
             if mutable_keys:  # Only mutate if we have mutable weights
-                key_to_mutate = random.choice(mutable_keys)
-                individual.weights[key_to_mutate] = random.uniform(0, 100)
+                key_to_mutate = self.rng.choice(mutable_keys)
+                individual.weights[key_to_mutate] = self.rng.uniform(0, 100)
                 
                 # Normalize while maintaining minimum unchanged weight
                 individual.weights = self._normalize_weights_with_minimum(individual.weights)
\ No newline at end of file
@@ -0,0 +1,248 @@
+import contextvars
+import json
+import threading
+import time
+import uuid
+from bisect import bisect_left
+from collections import deque
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Upper bounds (seconds) of the latency histogram buckets; +Inf is implicit
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Trace of the user turn running in the current thread or task, if any
+_current_trace = contextvars.ContextVar("current_trace", default=None)
+
+LabelKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+def _key(name: str, labels: Dict) -> LabelKey:
+    return name, tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+class _NullSpan:
+    """Span handed out while metrics are disabled; does nothing"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+_NULL_SPAN = _NullSpan()
+
+class _Span:
+    """Times a block and records it as a stage on exit"""
+
+    def __init__(self, metrics: "Metrics", stage: str, labels: Dict):
+        self.metrics = metrics
+        self.stage = stage
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        labels = self.labels if exc_type is None else dict(self.labels, error=exc_type.__name__)
+        self.metrics.record(self.stage, time.perf_counter() - self.start, start=self.start, **labels)
+        return False
+
+class _Turn:
+    """Collects the stages and counters of one user turn into a trace"""
+
+    def __init__(self, metrics: "Metrics", attributes: Dict):
+        self.metrics = metrics
+        self.trace = {
+            "id": uuid.uuid4().hex[:12],
+            "attributes": attributes,
+            "started_at": time.time(),
+            "seconds": None,
+            "stages": [],
+            "counters": {}
+        }
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        self._token = _current_trace.set(self)
+        return self.trace
+
+    def __exit__(self, exc_type, exc, tb):
+        _current_trace.reset(self._token)
+        seconds = time.perf_counter() - self.start
+        self.trace["seconds"] = seconds
+        if exc_type is not None:
+            self.trace["error"] = exc_type.__name__
+        self.metrics.observe("turn_seconds", seconds)
+        self.metrics.add_trace(self.trace)
+        return False
+
+    def add_stage(self, stage: str, seconds: float, start: Optional[float], labels: Dict) -> None:
+        event = {
+            "stage": stage,
+            "offset": (start if start is not None else time.perf_counter() - seconds) - self.start,
+            "seconds": seconds
+        }
+        if labels:
+            event["labels"] = {key: str(value) for key, value in labels.items()}
+        with self._lock:
+            self.trace["stages"].append(event)
+
+    def add_count(self, name: str, value: float, labels: Dict) -> None:
+        key = name if not labels else name + "{" + ",".join(
+            f"{k}={v}" for k, v in sorted(labels.items())) + "}"
+        with self._lock:
+            self.trace["counters"][key] = self.trace["counters"].get(key, 0) + value
+
+class Metrics:
+    """Timing spans, counters and latency histograms with per-turn traces.
+
+    Everything is a no-op while disabled: span() returns a shared null context
+    manager and count()/observe() return straight away. Stages are recorded in the
+    histogram "stage_seconds" labelled by stage, and in the trace of the turn
+    open in the current thread or asyncio task.
+    """
+
+    def __init__(self, enabled: bool = False, buckets: Tuple[float, ...] = DEFAULT_BUCKETS,
+                 max_traces: int = 1000, prefix: str = "comm"):
+        self.enabled = enabled
+        self.buckets = tuple(buckets)
+        self.prefix = prefix
+        self._counters = {}
+        self._histograms = {}
+        self._traces = deque(maxlen=max_traces)
+        self._lock = threading.Lock()
+
+    def enable(self) -> None:
+        self.enabled = True
+
+    def disable(self) -> None:
+        self.enabled = False
+
+    def reset(self) -> None:
+        """Drop all recorded counters, histograms and traces"""
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+            self._traces.clear()
+
+    def span(self, stage: str, **labels):
+        """Context manager timing one stage"""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, stage, labels)
+
+    def turn(self, **attributes):
+        """Context manager collecting one user turn's stages into a trace"""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Turn(self, attributes)
+
+    def record(self, stage: str, seconds: float, start: Optional[float] = None, **labels) -> None:
+        """Record an already timed stage (start is its perf_counter start, if known)"""
+        if not self.enabled:
+            return
+        self.observe("stage_seconds", seconds, stage=stage, **labels)
+        turn = _current_trace.get()
+        if turn is not None:
+            turn.add_stage(stage, seconds, start, labels)
+
+    def count(self, name: str, value: float = 1, **labels) -> None:
+        """Add value to a counter"""
+        if not self.enabled:
+            return
+        key = _key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+        turn = _current_trace.get()
+        if turn is not None:
+            turn.add_count(name, value, labels)
+
+    def observe(self, name: str, value: float, **labels) -> None:
+        """Add an observation to a histogram"""
+        if not self.enabled:
+            return
+        key = _key(name, labels)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = {"counts": [0] * (len(self.buckets) + 1),
+                                                     "sum": 0.0, "count": 0}
+            histogram["counts"][bisect_left(self.buckets, value)] += 1
+            histogram["sum"] += value
+            histogram["count"] += 1
+
+    def add_trace(self, trace: Dict) -> None:
+        with self._lock:
+            self._traces.append(trace)
+
+    def bind(self, function: Callable) -> Callable:
+        """Wrap function so calls on worker threads still report to the caller's turn"""
+        if not self.enabled:
+            return function
+        context = contextvars.copy_context()
+
+        def bound(*args, **kwargs):
+            return context.copy().run(function, *args, **kwargs)
+        return bound
+
+    def snapshot(self) -> Dict:
+        """Counters, histograms (with cumulative buckets) and traces as plain data"""
+        with self._lock:
+            counters = [{"name": name, "labels": dict(labels), "value": value}
+                        for (name, labels), value in sorted(self._counters.items())]
+            histograms = []
+            for (name, labels), histogram in sorted(self._histograms.items()):
+                cumulative, buckets = 0, {}
+                for bound, count in zip([*map(str, self.buckets), "+Inf"], histogram["counts"]):
+                    cumulative += count
+                    buckets[bound] = cumulative
+                histograms.append({"name": name, "labels": dict(labels), "count": histogram["count"],
+                                   "sum": histogram["sum"], "buckets": buckets})
+            traces = list(self._traces)
+        return {"counters": counters, "histograms": histograms, "traces": traces}
+
+    def to_prometheus(self) -> str:
+        """Render counters and histograms in the Prometheus text exposition format"""
+        snapshot = self.snapshot()
+        lines = []
+        declared = set()
+
+        def labels_text(labels: Dict, extra: Optional[Tuple[str, str]] = None) -> str:
+            items = list(labels.items()) + ([extra] if extra else [])
+            if not items:
+                return ""
+            escaped = (value.replace("\\", "\\\\").replace('"', '\\"') for _, value in items)
+            return "{" + ",".join(f'{key}="{value}"' for (key, _), value in zip(items, escaped)) + "}"
+
+        for counter in snapshot["counters"]:
+            name = f"{self.prefix}_{counter['name']}_total"
+            if name not in declared:
+                lines.append(f"# TYPE {name} counter")
+                declared.add(name)
+            lines.append(f"{name}{labels_text(counter['labels'])} {counter['value']}")
+        for histogram in snapshot["histograms"]:
+            name = f"{self.prefix}_{histogram['name']}"
+            if name not in declared:
+                lines.append(f"# TYPE {name} histogram")
+                declared.add(name)
+            for bound, count in histogram["buckets"].items():
+                lines.append(f"{name}_bucket{labels_text(histogram['labels'], ('le', bound))} {count}")
+            lines.append(f"{name}_sum{labels_text(histogram['labels'])} {histogram['sum']}")
+            lines.append(f"{name}_count{labels_text(histogram['labels'])} {histogram['count']}")
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path: str) -> None:
+        """Write the metrics to path: Prometheus text for .prom/.txt, JSON otherwise"""
+        if path.endswith((".prom", ".txt")):
+            content = self.to_prometheus()
+        else:
+            content = json.dumps(self.snapshot(), indent=2)
+        with open(path, "w") as f:
+            f.write(content)
+
+    def traces(self) -> List[Dict]:
+        with self._lock:
+            return list(self._traces)
+
+# Process-wide instance; disabled until enable() is called
+METRICS = Metrics()
@@ -0,0 +1,81 @@
+import numpy as np
+from typing import List, Optional, Tuple
+from .gaOperations import Individual
+from .distortionFuntions import DISTORTION_TYPES, RandomStreams, distort_texts, weights_to_matrix
+from .fitnessBackends import (
+    NgramPrivacyBackend,
+    PrivacyBackend,
+    TableInversionUsabilityBackend,
+    UsabilityBackend
+)
+
+class FitnessSurrogate:
+    """Cheap stand-in for FitnessCalculator.calculate_fitness, refit online.
+
+    Candidates are scored with local privacy and usability backends. Until enough
+    expensive evaluations have been observed, the prediction is just the cheap
+    fitness. After that, a ridge regression maps [weights, cheap privacy, cheap
+    usability, cheap fitness] to the expensive fitness seen so far.
+    """
+
+    def __init__(self, alpha: float,
+                 privacy_backend: Optional[PrivacyBackend] = None,
+                 usability_backend: Optional[UsabilityBackend] = None,
+                 ridge: float = 1e-2,
+                 min_observations: int = 8):
+        self.alpha = alpha
+        self.privacy_backend = privacy_backend if privacy_backend is not None else NgramPrivacyBackend()
+        self.usability_backend = usability_backend if usability_backend is not None else TableInversionUsabilityBackend()
+        self.ridge = ridge
+        self.min_observations = min_observations
+        self._features = []
+        self._targets = []
+        self._coefficients = None
+
+    def features(self, individuals: List[Individual], text: str,
+                 rng: Optional[RandomStreams] = None,
+                 common_random_numbers: bool = False) -> np.ndarray:
+        """Cheap feature rows for a batch, distorting the text afresh; the last column is the cheap fitness"""
+        weights = weights_to_matrix([individual.weights for individual in individuals]) / 100
+        distorted_texts = distort_texts(text, weights, DISTORTION_TYPES, rng=rng,
+                                        common_random_numbers=common_random_numbers)
+        return self.text_features(individuals, text, distorted_texts)
+
+    def text_features(self, individuals: List[Individual], text: str,
+                      distorted_texts: List[str]) -> np.ndarray:
+        """Cheap feature rows for individuals whose distorted texts are already known"""
+        weights = weights_to_matrix([individual.weights for individual in individuals]) / 100
+        privacy = self.privacy_backend.privacy_scores(text, distorted_texts)
+        usability = self.usability_backend.usability_scores(text, distorted_texts)
+        fitness = self.alpha * privacy + (1 - self.alpha) * usability
+        return np.column_stack([weights, privacy, usability, fitness])
+
+    def observe(self, features: np.ndarray, fitness: List[float]) -> None:
+        """Add expensive evaluations and refit the regression"""
+        self._features.extend(features)
+        self._targets.extend(fitness)
+        if len(self._targets) < self.min_observations:
+            return
+
+        # Closed-form ridge regression with an unpenalized intercept
+        X = np.column_stack([np.ones(len(self._features)), np.array(self._features)])
+        y = np.array(self._targets)
+        penalty = self.ridge * np.eye(X.shape[1])
+        penalty[0, 0] = 0.0
+        self._coefficients = np.linalg.solve(X.T @ X + penalty, X.T @ y)
+
+    def predict(self, features: np.ndarray) -> np.ndarray:
+        """Predicted expensive fitness for each feature row"""
+        if self._coefficients is None:
+            return features[:, -1]
+        return np.column_stack([np.ones(len(features)), features]) @ self._coefficients
+
+    def screen(self, features: np.ndarray, top_k: int, explore: int,
+               rng) -> Tuple[List[int], np.ndarray]:
+        """Pick the top_k predicted candidates plus a random exploration sample"""
+        predictions = self.predict(features)
+        order = [int(i) for i in np.argsort(-predictions, kind="stable")]
+        promoted = order[:top_k]
+        rest = order[top_k:]
+        promoted += rng.sample(rest, min(explore, len(rest)))
+        return promoted, predictions
@@ -3,5 +3,20 @@ from modules.communication_module.communication_module import run_cli
 # OpenAI API Key - typically this would be stored securely or passed as an environment variable
 api_key = ""
 
+# Pretrained weight table written by pretrain_profiles.py; loaded at startup if present
+profile_table_path = "distortion_profiles.json"
+
+# Assistant IDs resolved in earlier sessions, so startup needs at most one API call
+assistant_registry_path = "assistant_registry.json"
+
+# OpenAI-compatible endpoint; None uses the real API, "http://127.0.0.1:8089/v1" uses openai_stub_server.py
+base_url = None
+
+# Write per-stage latency traces and histograms here on exit (.prom for Prometheus text, else JSON); None disables
+metrics_path = None
+
+# Print responses token by token as the run streams instead of waiting for the run to finish
+stream_responses = True
+
 if __name__ == "__main__":
-    run_cli(api_key)
\ No newline at end of file
+    run_cli(api_key, profile_table_path, base_url, metrics_path, assistant_registry_path, stream_responses)
\ No newline at end of file
@@ -0,0 +1,69 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+class AssistantRegistry:
+    """Local map from (assistant name, instructions hash) to assistant ID.
+
+    Changing a config's instructions changes its key, so the old entry no longer
+    matches and the assistant is looked up (and updated) again. Entries are kept in
+    memory and, once a path is set, in a JSON file shared across sessions.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self._entries = {}
+        self._lock = threading.Lock()
+
+        if path is not None and os.path.exists(path):
+            self._load()
+
+    @staticmethod
+    def instructions_hash(instructions):
+        return hashlib.sha256(instructions.encode()).hexdigest()[:16]
+
+    @classmethod
+    def make_key(cls, assistant_config):
+        """Build the registry key for an assistant configuration"""
+        return f"{assistant_config['name']}:{cls.instructions_hash(assistant_config['instructions'])}"
+
+    def get(self, assistant_config):
+        """Return the registered assistant ID for the config, or None"""
+        with self._lock:
+            entry = self._entries.get(self.make_key(assistant_config))
+            return entry["assistant_id"] if entry is not None else None
+
+    def put(self, assistant_config, assistant_id):
+        """Record the assistant ID resolved for the config"""
+        with self._lock:
+            self._entries[self.make_key(assistant_config)] = {
+                "assistant_id": assistant_id,
+                "name": assistant_config["name"],
+                "updated_at": time.time()
+            }
+            if self.path is not None:
+                self._save()
+
+    def remove(self, assistant_config):
+        """Forget the config's entry, e.g. after the assistant was deleted"""
+        with self._lock:
+            if self._entries.pop(self.make_key(assistant_config), None) is not None and self.path is not None:
+                self._save()
+
+    def load(self, path):
+        """Use path for persistence, merging in any entries already saved there"""
+        with self._lock:
+            self.path = path
+            if os.path.exists(path):
+                self._load()
+            return len(self._entries)
+
+    def _load(self):
+        with open(self.path, "r") as f:
+            self._entries.update(json.load(f))
+
+    def _save(self):
+        with open(self.path, "w") as f:
+            json.dump(self._entries, f, indent=2)
@@ -0,0 +1,255 @@
+import asyncio
+import json
+import os
+import time
+from Crypto.Random import get_random_bytes
+from ga.metrics import METRICS
+from modules.instruction_module.instruction_module import async_generate_guide_text, get_assistant_configs
+from modules.communication_module.communication_encryptor import ENCRYPTION_METHODS, generate_encryption_keys
+from modules.communication_module.communication_module import (
+    async_create_new_thread,
+    async_get_or_create_assistant,
+    async_send_message_to_assistant,
+    async_setup_client,
+    encrypt_user_question,
+    load_assistant_registry,
+    load_profile_table
+)
+
+# Default number of questions in flight at once
+DEFAULT_PARALLELISM = 8
+
+# Scheduler endpoint of the runs each item polls to completion
+RUNS_ENDPOINT = "beta.threads.runs"
+
+# min_unchanged_weight used for Approach 3 items that do not set one, as in the CLI
+DEFAULT_MIN_UNCHANGED_WEIGHT = 50.0
+
+def load_questions(input_path, method="1", approach="1", min_unchanged_weight=None):
+    """Read batch items from JSONL, filling in defaults for unset settings.
+
+    Each line is an object with a "question" and optionally an "id", "method"
+    (key or name, e.g. "3" or "AES"), "approach" and "min_unchanged_weight".
+    Items without an id are numbered by line.
+    """
+    items = []
+    with open(input_path, "r") as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            item = {
+                "id": str(record.get("id", line_number)),
+                "question": record.get("question"),
+                "method": normalize_method(record.get("method", method)),
+                "approach": str(record.get("approach", approach)),
+                "min_unchanged_weight": record.get("min_unchanged_weight", min_unchanged_weight)
+            }
+            if item["approach"] == "3" and item["min_unchanged_weight"] is None:
+                item["min_unchanged_weight"] = DEFAULT_MIN_UNCHANGED_WEIGHT
+            items.append(item)
+    return items
+
+def normalize_method(method):
+    """Map an encryption method name such as "AES" to its key; keys pass through"""
+    method = str(method)
+    for key, name in ENCRYPTION_METHODS.items():
+        if method.lower() == name.lower():
+            return key
+    return method
+
+def completed_ids(output_path):
+    """Return the ids already answered in output_path, the checkpoint of earlier runs.
+
+    Failed items are not included, so they are retried. A line cut short by a
+    crash is ignored.
+    """
+    done = set()
+    if not os.path.exists(output_path):
+        return done
+    with open(output_path, "r") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if record.get("status") == "ok":
+                done.add(record["id"])
+    return done
+
+def _ends_with_newline(path):
+    with open(path, "rb") as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b"\n"
+
+def _counter_total(trace, name):
+    # Trace counters are keyed "name{label=value,...}"; sum over every label set
+    return sum(value for key, value in trace["counters"].items() if key.split("{")[0] == name)
+
+class BatchRunner:
+    """Answers batch items concurrently, sharing assistants, keys and guide texts.
+
+    One encryption key set is generated per method for the whole run, so every
+    item with the same (approach, method, min_unchanged_weight) reuses a single
+    guide text. Assistants and guide texts are resolved once: concurrent items
+    wait on the same task instead of repeating the work.
+
+    AES items each get a fresh IV, which travels in the ciphertext. The ChaCha20
+    nonce is part of the guide text (and of Approach 2's sample), so every
+    ChaCha20 item of a run shares one key and nonce, and DES items share one ECB
+    key. That reuse is deliberate: it is the price of one guide text per cell.
+
+    Every item holds a runs slot on the client's scheduler for as long as its run
+    is polled, so the scheduler's runs cap (8 by default) would bound the items in
+    flight whatever the parallelism. The cap is raised to parallelism for a
+    scheduled client; as the scheduler is shared, this lasts for the process.
+    """
+
+    def __init__(self, client, api_key=None, parallelism=DEFAULT_PARALLELISM, base_url=None):
+        self.client = client
+        self.api_key = api_key
+        self.parallelism = parallelism
+        scheduler = getattr(client, "scheduler", None)
+        if scheduler is not None:
+            scheduler.raise_endpoint_limit(RUNS_ENDPOINT, parallelism)
+        self.base_url = base_url
+        self.encryption_keys = {method: generate_encryption_keys() for method in ENCRYPTION_METHODS}
+        self._assistants = {}
+        self._guide_texts = {}
+        # Seconds each (approach, method, min_unchanged_weight) guide text took to generate
+        self.guide_seconds = {}
+
+    def _shared(self, tasks, key, make_coroutine):
+        # Start the work once; later callers await the same task. A failed task is
+        # started again so one transient error does not fail every later item
+        task = tasks.get(key)
+        if task is None or (task.done() and (task.cancelled() or task.exception() is not None)):
+            task = tasks[key] = asyncio.ensure_future(make_coroutine())
+        return task
+
+    def assistant(self, approach):
+        config = get_assistant_configs()[approach]
+        return self._shared(self._assistants, approach,
+                            lambda: async_get_or_create_assistant(self.client, config))
+
+    def guide_text(self, approach, method, min_unchanged_weight):
+        cell = (approach, method, min_unchanged_weight)
+
+        async def generate():
+            start = time.perf_counter()
+            guide = await async_generate_guide_text(approach, method, self.encryption_keys[method],
+                                                    min_unchanged_weight, self.api_key, base_url=self.base_url)
+            self.guide_seconds[cell] = round(time.perf_counter() - start, 4)
+            return guide
+        return self._shared(self._guide_texts, cell, generate)
+
+    def message_keys(self, method):
+        """Keys for encrypting one item: the run's keys, with a fresh AES IV"""
+        keys = self.encryption_keys[method]
+        if method == "3":  # AES
+            keys = {**keys, "aes": {**keys["aes"], "iv": get_random_bytes(16)}}
+        return keys
+
+    def build_message(self, guide_text, encrypted_question):
+        """The user message sent for an item, as in the interactive CLI"""
+        return f"{guide_text}\nEncrypted question: {encrypted_question}"
+
+    async def process(self, item):
+        """Answer one item in its own thread and return its output record"""
+        method, approach = item["method"], item["approach"]
+        record = {"id": item["id"], "method": ENCRYPTION_METHODS.get(method, method), "approach": approach,
+                  "min_unchanged_weight": item["min_unchanged_weight"]}
+        start = time.perf_counter()
+        with METRICS.turn(id=item["id"], method=record["method"], approach=approach) as trace:
+            try:
+                if not item["question"]:
+                    raise ValueError("Question cannot be empty")
+                if method not in ENCRYPTION_METHODS:
+                    raise ValueError(f"Unknown encryption method: {method}")
+                if approach not in get_assistant_configs():
+                    raise ValueError(f"Unknown assistant approach: {approach}")
+
+                with METRICS.span("encrypt_question"):
+                    encrypted_question = encrypt_user_question(item["question"], method,
+                                                               self.message_keys(method))
+                with METRICS.span("guide_text", approach=approach):
+                    guide_text = await self.guide_text(approach, method, item["min_unchanged_weight"])
+                assistant, thread = await asyncio.gather(self.assistant(approach),
+                                                         async_create_new_thread(self.client))
+
+                user_message = self.build_message(guide_text, encrypted_question)
+                record["response"] = await async_send_message_to_assistant(self.client, assistant, thread,
+                                                                           user_message)
+                record["status"] = "ok"
+            except Exception as e:
+                record["status"] = "error"
+                record["error"] = f"{type(e).__name__}: {e}"
+
+        record["seconds"] = round(time.perf_counter() - start, 4)
+        if isinstance(trace, dict):
+            stages = {}
+            for event in trace["stages"]:
+                stages[event["stage"]] = round(stages.get(event["stage"], 0.0) + event["seconds"], 4)
+            record["stages"] = stages
+            # Time spent waiting on the client-side rate limits is part of the stages above
+            record["throttled_seconds"] = round(_counter_total(trace, "api_throttled_seconds"), 4)
+            record["api_retries"] = _counter_total(trace, "api_retries")
+        record["finished_at"] = time.time()
+        return record
+
+    async def run(self, items, output_path):
+        """Answer items not yet in output_path, appending each record as it completes"""
+        done = completed_ids(output_path)
+        pending = [item for item in items if item["id"] not in done]
+        if done:
+            print(f"Resuming: {len(items) - len(pending)} of {len(items)} items already answered")
+
+        semaphore = asyncio.Semaphore(self.parallelism)
+
+        async def bounded(item):
+            async with semaphore:
+                return await self.process(item)
+
+        counts = {"ok": 0, "error": 0}
+        with open(output_path, "a") as f:
+            # Start on a fresh line if a crash cut the last record short
+            if f.tell() > 0 and not _ends_with_newline(output_path):
+                f.write("\n")
+            for future in asyncio.as_completed([bounded(item) for item in pending]):
+                record = await future
+                # One flushed line per result, so a crash loses at most the items in flight
+                f.write(json.dumps(record) + "\n")
+                f.flush()
+                counts[record["status"]] += 1
+                finished = counts["ok"] + counts["error"]
+                if finished % 100 == 0 or finished == len(pending):
+                    print(f"{finished}/{len(pending)} answered ({counts['error']} failed)")
+        return counts
+
+def run_batch(api_key, input_path, output_path, parallelism=DEFAULT_PARALLELISM, method="1", approach="1",
+              min_unchanged_weight=None, profile_table_path=None, base_url=None, metrics_path=None,
+              registry_path=None):
+    """Answer every question in input_path, writing one JSONL record per item to output_path.
+
+    Rerunning with the same output file resumes: answered items are skipped and
+    failed ones retried. Stage timings are always collected for the records;
+    metrics_path additionally gets the aggregate metrics on exit.
+    """
+    METRICS.enable()
+    load_assistant_registry(registry_path)
+    load_profile_table(profile_table_path)
+    items = load_questions(input_path, method, approach, min_unchanged_weight)
+
+    async def main():
+        runner = BatchRunner(async_setup_client(api_key, base_url), api_key, parallelism, base_url)
+        return await runner.run(items, output_path)
+
+    try:
+        counts = asyncio.run(main())
+    finally:
+        if metrics_path is not None:
+            METRICS.dump(metrics_path)
+            print(f"Wrote metrics to {metrics_path}")
+    print(f"Done: {counts['ok']} answered, {counts['error']} failed; results in {output_path}")
+    return counts
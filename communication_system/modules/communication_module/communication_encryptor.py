@@ -1,5 +1,7 @@
-import binascii
+import codecs
 import random
+import string
+from functools import lru_cache
 from Crypto.Cipher import DES, ChaCha20, AES
 from Crypto.Random import get_random_bytes
 from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
@@ -14,52 +16,144 @@ ENCRYPTION_METHODS = {
     "4": "ChaCha20"
 }
 
+# Plaintext read per step by the streaming functions
+STREAM_CHUNK_SIZE = 64 * 1024
+
 # Encryption functions
-def caesar_encrypt(text, shift):
-    result = ""
+def _caesar_shift_char(char, shift):
+    # Determine the ASCII offset (65 for uppercase, 97 for lowercase)
+    ascii_offset = 65 if char.isupper() else 97
     
-    for char in text:
-        if char.isalpha():
-            # Determine the ASCII offset (65 for uppercase, 97 for lowercase)
-            ascii_offset = 65 if char.isupper() else 97
-            
-            # Apply the encryption formula: (position + shift) % 26
-            encrypted_char = chr((ord(char) - ascii_offset + shift) % 26 + ascii_offset)
-            result += encrypted_char
-        else:
-            # Keep non-alphabetic characters unchanged
-            result += char    
+    # Apply the encryption formula: (position + shift) % 26
+    return chr((ord(char) - ascii_offset + shift) % 26 + ascii_offset)
+
+@lru_cache(maxsize=32)
+def caesar_table(shift):
+    """Translation table for the ASCII letters under a shift, built once per shift"""
+    letters = string.ascii_uppercase + string.ascii_lowercase
+    return str.maketrans(letters, "".join(_caesar_shift_char(char, shift) for char in letters))
+
+def caesar_encrypt(text, shift):
+    table = caesar_table(shift)
+    if not text.isascii():
+        # Other alphabetic characters go through the same formula as ASCII letters
+        extra = {ord(char): _caesar_shift_char(char, shift)
+                 for char in set(text) if char.isalpha() and not char.isascii()}
+        if extra:
+            table = {**table, **extra}
     
-    return result
+    # Non-alphabetic characters are not in the table and stay unchanged
+    return text.translate(table)
 
 def pad(text):
-    while len(text) % 8 != 0:
-        text += " "  # Padding with spaces
-    return text
+    return text + " " * (-len(text) % 8)  # Padding with spaces to a multiple of 8
+
+def _pkcs7(data, block_size=16):
+    padding_length = block_size - len(data) % block_size
+    return data + bytes([padding_length]) * padding_length
 
 def des_encrypt(plain_text, key):
-    cipher = DES.new(key, DES.MODE_ECB)  # Create DES cipher
-    padded_text = pad(plain_text)  # Ensure text is a multiple of 8
-    encrypted_bytes = cipher.encrypt(padded_text.encode())  # Encrypt text
-    return binascii.hexlify(encrypted_bytes).decode()  # Convert to hex
+    return des_encrypt_batch([plain_text], key)[0]
+
+def aes_encrypt(plainText, key, iv):
+    return aes_encrypt_batch([plainText], key, iv)[0]
+
+def chacha20_encrypt(plaintext, key, nonce):
+    """Encrypts a message using ChaCha20 and returns the ciphertext as hex."""
+    return chacha20_encrypt_batch([plaintext], key, nonce)[0]
 
-def aes_encrypt(plainText, key, iv):    
+# Batch functions: one key and method for many plaintexts
+def caesar_encrypt_batch(texts, shift):
+    return [caesar_encrypt(text, shift) for text in texts]
+
+def des_encrypt_batch(plain_texts, key):
+    cipher = DES.new(key, DES.MODE_ECB)  # ECB keeps no state, so one key schedule serves the batch
+    return [cipher.encrypt(pad(text).encode()).hex() for text in plain_texts]
+
+def aes_encrypt_batch(plain_texts, key, iv):
+    # CBC chains within a message, so each message gets its own encryptor from one Cipher
     cipher = Cipher(algorithms.AES(key), modes.CBC(iv), backend=default_backend())
-    encryptor = cipher.encryptor()
+    iv_hex = iv.hex()
+    results = []
+    for text in plain_texts:
+        encryptor = cipher.encryptor()
+        cipher_text = encryptor.update(_pkcs7(text.encode())) + encryptor.finalize()
+        results.append(iv_hex + cipher_text.hex())
+    return results
+
+def chacha20_encrypt_batch(plaintexts, key, nonce):
+    cipher = ChaCha20.new(key=key, nonce=nonce)
+    results = []
+    for text in plaintexts:
+        # Every message starts at the beginning of the key stream, as with a fresh cipher
+        cipher.seek(0)
+        results.append(cipher.encrypt(text.encode()).hex())
+    return results
+
+# Streaming functions: plaintext from a string, an iterable of chunks or a file-like object,
+# hex ciphertext yielded piece by piece with memory bounded by the chunk size
+def _source_chunks(source, chunk_size):
+    if hasattr(source, "read"):
+        while True:
+            chunk = source.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+    elif isinstance(source, (str, bytes, bytearray)):
+        for start in range(0, len(source), chunk_size):
+            yield source[start:start + chunk_size]
+    else:
+        yield from source
+
+def _byte_chunks(source, chunk_size):
+    for chunk in _source_chunks(source, chunk_size):
+        yield chunk.encode() if isinstance(chunk, str) else bytes(chunk)
+
+def _text_chunks(source, chunk_size):
+    # Byte chunks can split a character, so decode them incrementally
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    for chunk in _source_chunks(source, chunk_size):
+        text = chunk if isinstance(chunk, str) else decoder.decode(chunk)
+        if text:
+            yield text
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+def caesar_encrypt_stream(source, shift, chunk_size=STREAM_CHUNK_SIZE):
+    for text in _text_chunks(source, chunk_size):
+        yield caesar_encrypt(text, shift)
+
+def des_encrypt_stream(source, key, chunk_size=STREAM_CHUNK_SIZE):
+    cipher = DES.new(key, DES.MODE_ECB)
+    remainder = b""
+    for chunk in _byte_chunks(source, chunk_size):
+        data = remainder + chunk
+        whole = len(data) - len(data) % 8
+        if whole:
+            yield cipher.encrypt(data[:whole]).hex()
+        remainder = data[whole:]
     
-    # Pad plaintext to be a multiple of AES block size (16 bytes)
+    # Space padding as in pad(), applied to the final partial block
+    if remainder:
+        yield cipher.encrypt(remainder + b" " * (-len(remainder) % 8)).hex()
+
+def aes_encrypt_stream(source, key, iv, chunk_size=STREAM_CHUNK_SIZE):
+    # The IV prefix comes first, as in aes_encrypt
+    yield iv.hex()
+    encryptor = Cipher(algorithms.AES(key), modes.CBC(iv), backend=default_backend()).encryptor()
     padder = padding.PKCS7(algorithms.AES.block_size).padder()
-    padded_text = padder.update(plainText.encode()) + padder.finalize()
-    
-    cipher_text = encryptor.update(padded_text) + encryptor.finalize()
-    return binascii.hexlify(iv + cipher_text).decode()
+    for chunk in _byte_chunks(source, chunk_size):
+        # Both the padder and the CBC encryptor hold back any partial block
+        cipher_text = encryptor.update(padder.update(chunk))
+        if cipher_text:
+            yield cipher_text.hex()
+    yield (encryptor.update(padder.finalize()) + encryptor.finalize()).hex()
 
-def chacha20_encrypt(plaintext, key, nonce):
-    """Encrypts a message using ChaCha20 and returns a JSON string with nonce and ciphertext."""
+def chacha20_encrypt_stream(source, key, nonce, chunk_size=STREAM_CHUNK_SIZE):
     cipher = ChaCha20.new(key=key, nonce=nonce)
-    ciphertext = cipher.encrypt(plaintext.encode())
-
-    return binascii.hexlify(ciphertext).decode()
+    for chunk in _byte_chunks(source, chunk_size):
+        yield cipher.encrypt(chunk).hex()
 
 def generate_encryption_keys():
     """Generate encryption keys for all methods"""
@@ -89,3 +183,34 @@ def encrypt_question(question, method, keys):
         return chacha20_encrypt(question, keys["chacha20"]["key"], keys["chacha20"]["nonce"])
     else:
         return question  # No encryption
+
+def encrypt_questions(questions, method, keys):
+    """Encrypt many questions with one method and key set, setting each cipher up once"""
+    if method == "1":  # Caesar
+        return caesar_encrypt_batch(questions, keys["caesar"])
+    elif method == "2":  # DES
+        return des_encrypt_batch(questions, keys["des"])
+    elif method == "3":  # AES
+        return aes_encrypt_batch(questions, keys["aes"]["key"], keys["aes"]["iv"])
+    elif method == "4":  # ChaCha20
+        return chacha20_encrypt_batch(questions, keys["chacha20"]["key"], keys["chacha20"]["nonce"])
+    else:
+        return list(questions)  # No encryption
+
+def encrypt_stream(source, method, keys, chunk_size=STREAM_CHUNK_SIZE):
+    """Encrypt a large payload piece by piece, yielding hex ciphertext.
+    
+    source can be a string, an iterable of str/bytes chunks or a file-like object
+    (text or binary). Joining the yielded pieces gives the same result as
+    encrypt_question on the whole text.
+    """
+    if method == "1":  # Caesar
+        return caesar_encrypt_stream(source, keys["caesar"], chunk_size)
+    elif method == "2":  # DES
+        return des_encrypt_stream(source, keys["des"], chunk_size)
+    elif method == "3":  # AES
+        return aes_encrypt_stream(source, keys["aes"]["key"], keys["aes"]["iv"], chunk_size)
+    elif method == "4":  # ChaCha20
+        return chacha20_encrypt_stream(source, keys["chacha20"]["key"], keys["chacha20"]["nonce"], chunk_size)
+    else:
+        return _text_chunks(source, chunk_size)  # No encryption
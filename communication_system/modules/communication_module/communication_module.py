@@ -1,81 +1,323 @@
+import asyncio
+import os
 import openai
+from ga.apiScheduler import get_shared_async_client, get_shared_client
+from ga.metrics import METRICS
 from modules.instruction_module.instruction_module import (
+    PROFILE_CACHE,
+    async_generate_guide_text,
     get_assistant_configs,
     generate_guide_text
 )
+from modules.communication_module.assistant_registry import AssistantRegistry
+from modules.communication_module.stream_handler import AsyncStreamPrinter, StreamPrinter
 from modules.communication_module.communication_encryptor import (
     ENCRYPTION_METHODS,
     encrypt_question,
     generate_encryption_keys
 )
 
-def setup_client(api_key):
-    """Set up and return the OpenAI client"""
-    return openai.OpenAI(api_key=api_key)
+# Assistant IDs resolved so far; run_cli points it at a file so they persist across sessions
+ASSISTANT_REGISTRY = AssistantRegistry()
 
-def get_or_create_assistant(client, assistant_config):
-    """Get existing assistant or create a new one based on configuration"""
-    assistants = client.beta.assistants.list()
-    
-    # Check if assistant already exists
-    for a in assistants.data:
-        if a.name == assistant_config["name"]:
-            print(f"Using existing assistant: {assistant_config['name']}")
-            return a
+# Assistants requested per page when scanning the organization's list
+ASSISTANT_PAGE_SIZE = 100
+
+# Messages requested per page when reading a run's response
+MESSAGE_PAGE_SIZE = 100
+
+def setup_client(api_key, base_url=None):
+    """Return the process-wide, rate-limited OpenAI client (base_url can point at a stub server)"""
+    return get_shared_client(api_key, base_url)
+
+def get_or_create_assistant(client, assistant_config, registry=None):
+    """Get existing assistant or create a new one based on configuration.
     
-    # Create new assistant if it doesn't exist
-    print(f"Creating new assistant: {assistant_config['name']}")
-    return client.beta.assistants.create(
-        name=assistant_config["name"],
-        instructions=assistant_config["instructions"],
-        model="gpt-4o",
-        tools=[{"type": "code_interpreter"}]
-    )
+    A registered ID is verified with one retrieve call. Only on a miss are all
+    pages of the assistant list scanned; a same-named assistant with outdated
+    instructions is updated rather than duplicated.
+    """
+    if registry is None:
+        registry = ASSISTANT_REGISTRY
+    with METRICS.span("assistant_lookup"):
+        assistant_id = registry.get(assistant_config)
+        if assistant_id is not None:
+            try:
+                assistant = client.beta.assistants.retrieve(assistant_id)
+            except openai.NotFoundError:
+                assistant = None
+            if _matches_config(assistant, assistant_config):
+                print(f"Using existing assistant: {assistant_config['name']}")
+                return assistant
+            registry.remove(assistant_config)
+        
+        # Check if assistant already exists, following every page of the list
+        for a in client.beta.assistants.list(limit=ASSISTANT_PAGE_SIZE, order="desc"):
+            if a.name == assistant_config["name"]:
+                assistant = _refresh_instructions(client, a, assistant_config)
+                registry.put(assistant_config, assistant.id)
+                return assistant
+        
+        # Create new assistant if it doesn't exist
+        print(f"Creating new assistant: {assistant_config['name']}")
+        assistant = client.beta.assistants.create(
+            name=assistant_config["name"],
+            instructions=assistant_config["instructions"],
+            model="gpt-4o",
+            tools=[{"type": "code_interpreter"}]
+        )
+        registry.put(assistant_config, assistant.id)
+        return assistant
+
+def _matches_config(assistant, assistant_config):
+    """Check that a retrieved assistant still has the config's name and instructions"""
+    return (assistant is not None and assistant.name == assistant_config["name"]
+            and assistant.instructions == assistant_config["instructions"])
+
+def _refresh_instructions(client, assistant, assistant_config):
+    """Reuse a same-named assistant, updating its instructions if the config changed"""
+    if assistant.instructions == assistant_config["instructions"]:
+        print(f"Using existing assistant: {assistant_config['name']}")
+        return assistant
+    print(f"Updating instructions of assistant: {assistant_config['name']}")
+    return client.beta.assistants.update(assistant.id, instructions=assistant_config["instructions"])
 
 def create_new_thread(client):
     """Create a new conversation thread"""
     return client.beta.threads.create()
 
-def send_message_to_assistant(client, assistant, thread, message_content):
-    """Send a message to the assistant and get the response"""
+def send_message_to_assistant(client, assistant, thread, message_content, stream=False):
+    """Send a message to the assistant and get the response.
+    
+    With stream=True the run's events are consumed as they arrive: text is
+    printed token by token and code_interpreter progress is shown, and the full
+    response is still returned at the end.
+    """
     # Add user message to thread
-    client.beta.threads.messages.create(
-        thread_id=thread.id,
-        role="user",
-        content=message_content
-    )
+    with METRICS.span("message_create"):
+        client.beta.threads.messages.create(
+            thread_id=thread.id,
+            role="user",
+            content=message_content
+        )
+    
+    if stream:
+        return stream_run(client, assistant, thread)
     
     # Start a run and wait for completion
     print(f"Processing...")
-    run = client.beta.threads.runs.create_and_poll(
-        thread_id=thread.id,
-        assistant_id=assistant.id
-    )
+    with METRICS.span("run_poll"):
+        run = client.beta.threads.runs.create_and_poll(
+            thread_id=thread.id,
+            assistant_id=assistant.id
+        )
         
     # Check if the run is completed and return response
     if run.status == "completed":
-        messages = client.beta.threads.messages.list(thread_id=thread.id, order="asc")  # Ensure messages are retrieved in correct order
-
-        assistant_responses = []
-        for msg in messages.data:
-            if msg.role == "assistant":
-                # Extract text from all messages by assistant
-                assistant_responses.append(msg.content[0].text.value)
-
-        # Join all responses together to get the full output
-        full_response = "\n".join(assistant_responses)
-        return full_response
+        # Only this run's messages, so the cost per turn does not grow with the thread
+        with METRICS.span("messages_list"):
+            messages = client.beta.threads.messages.list(
+                thread_id=thread.id,
+                run_id=run.id,
+                order="asc",  # Ensure messages are retrieved in correct order
+                limit=MESSAGE_PAGE_SIZE
+            )
+            return join_assistant_responses(messages)
 
     else:
         return f"Run Status: {run.status}"
 
+def stream_run(client, assistant, thread, event_handler=None):
+    """Run the assistant on the thread as an event stream and return the response text"""
+    if event_handler is None:
+        event_handler = StreamPrinter()
+    with METRICS.span("run_stream"):
+        with client.beta.threads.runs.stream(
+            thread_id=thread.id,
+            assistant_id=assistant.id,
+            event_handler=event_handler
+        ) as stream:
+            stream.until_done()
+    
+    run = event_handler.current_run
+    if run is not None and run.status == "completed":
+        return join_assistant_responses(event_handler.completed_messages)
+    return f"Run Status: {run.status if run is not None else 'unknown'}"
+
+def join_assistant_responses(messages):
+    """Join the text parts of every assistant message, following all pages of a message list"""
+    assistant_responses = []
+    for msg in messages:
+        if msg.role == "assistant":
+            # A message can hold several text parts alongside images or files
+            parts = [part.text.value for part in msg.content if part.type == "text"]
+            if parts:
+                assistant_responses.append("\n".join(parts))
+
+    # Join all responses together to get the full output
+    return "\n".join(assistant_responses)
+
 def encrypt_user_question(question, encryption_method, encryption_keys):
     """Encrypt a user question using the specified method and keys"""
     return encrypt_question(question, encryption_method, encryption_keys)
 
-def run_cli(api_key):
-    """Run the CLI in interactive mode"""
-    client = setup_client(api_key)
+def async_setup_client(api_key, base_url=None):
+    """Return the process-wide, rate-limited AsyncOpenAI client"""
+    return get_shared_async_client(api_key, base_url)
+
+async def async_get_or_create_assistant(client, assistant_config, registry=None):
+    """Async version of get_or_create_assistant"""
+    if registry is None:
+        registry = ASSISTANT_REGISTRY
+    with METRICS.span("assistant_lookup"):
+        assistant_id = registry.get(assistant_config)
+        if assistant_id is not None:
+            try:
+                assistant = await client.beta.assistants.retrieve(assistant_id)
+            except openai.NotFoundError:
+                assistant = None
+            if _matches_config(assistant, assistant_config):
+                print(f"Using existing assistant: {assistant_config['name']}")
+                return assistant
+            registry.remove(assistant_config)
+        
+        page = await client.beta.assistants.list(limit=ASSISTANT_PAGE_SIZE, order="desc")
+        async for a in page:
+            if a.name == assistant_config["name"]:
+                if a.instructions == assistant_config["instructions"]:
+                    print(f"Using existing assistant: {assistant_config['name']}")
+                    assistant = a
+                else:
+                    print(f"Updating instructions of assistant: {assistant_config['name']}")
+                    assistant = await client.beta.assistants.update(
+                        a.id, instructions=assistant_config["instructions"]
+                    )
+                registry.put(assistant_config, assistant.id)
+                return assistant
+        
+        print(f"Creating new assistant: {assistant_config['name']}")
+        assistant = await client.beta.assistants.create(
+            name=assistant_config["name"],
+            instructions=assistant_config["instructions"],
+            model="gpt-4o",
+            tools=[{"type": "code_interpreter"}]
+        )
+        registry.put(assistant_config, assistant.id)
+        return assistant
+
+async def async_create_new_thread(client):
+    """Create a new conversation thread"""
+    return await client.beta.threads.create()
+
+async def async_send_message_to_assistant(client, assistant, thread, message_content, stream=False):
+    """Async version of send_message_to_assistant; the run is polled without blocking the loop"""
+    with METRICS.span("message_create"):
+        await client.beta.threads.messages.create(
+            thread_id=thread.id,
+            role="user",
+            content=message_content
+        )
+    
+    if stream:
+        return await async_stream_run(client, assistant, thread)
+    
+    with METRICS.span("run_poll"):
+        run = await client.beta.threads.runs.create_and_poll(
+            thread_id=thread.id,
+            assistant_id=assistant.id
+        )
+    
+    if run.status == "completed":
+        with METRICS.span("messages_list"):
+            page = await client.beta.threads.messages.list(
+                thread_id=thread.id,
+                run_id=run.id,
+                order="asc",
+                limit=MESSAGE_PAGE_SIZE
+            )
+            return join_assistant_responses([msg async for msg in page])
+
+    else:
+        return f"Run Status: {run.status}"
+
+async def async_stream_run(client, assistant, thread, event_handler=None):
+    """Async version of stream_run"""
+    if event_handler is None:
+        event_handler = AsyncStreamPrinter()
+    with METRICS.span("run_stream"):
+        async with client.beta.threads.runs.stream(
+            thread_id=thread.id,
+            assistant_id=assistant.id,
+            event_handler=event_handler
+        ) as stream:
+            await stream.until_done()
+    
+    run = event_handler.current_run
+    if run is not None and run.status == "completed":
+        return join_assistant_responses(event_handler.completed_messages)
+    return f"Run Status: {run.status if run is not None else 'unknown'}"
+
+async def async_process_question(client, assistant, question, assistant_approach, encryption_method,
+                                 encryption_keys=None, min_unchanged_weight=None, api_key=None, thread=None,
+                                 base_url=None):
+    """Encrypt a question, build its guide text and ask the assistant in a new (or given) thread.
+    
+    Guide generation and thread creation are awaited together, so many of these
+    conversations can run concurrently in one event loop.
+    """
+    with METRICS.turn(method=ENCRYPTION_METHODS.get(encryption_method), approach=assistant_approach):
+        if encryption_keys is None:
+            with METRICS.span("key_generation"):
+                encryption_keys = generate_encryption_keys()
+        with METRICS.span("encrypt_question"):
+            encrypted_question = encrypt_user_question(question, encryption_method, encryption_keys)
+        
+        async def guide():
+            with METRICS.span("guide_text", approach=assistant_approach):
+                return await async_generate_guide_text(assistant_approach, encryption_method, encryption_keys,
+                                                       min_unchanged_weight, api_key, base_url=base_url)
+        
+        guide_text, thread = await asyncio.gather(
+            guide(),
+            async_create_new_thread(client) if thread is None else asyncio.sleep(0, thread)
+        )
+        
+        user_message = f"{guide_text}\nEncrypted question: {encrypted_question}"
+        return await async_send_message_to_assistant(client, assistant, thread, user_message)
+
+def load_profile_table(profile_table_path):
+    """Load pretrained distortion profiles so Approach 3 can skip GA training"""
+    if profile_table_path is None or not os.path.exists(profile_table_path):
+        return 0
+    count = PROFILE_CACHE.load_table(profile_table_path)
+    print(f"Loaded {count} pretrained distortion profiles from {profile_table_path}")
+    return count
+
+def load_assistant_registry(registry_path):
+    """Persist resolved assistant IDs in registry_path so later sessions skip the list scan"""
+    if registry_path is None:
+        return 0
+    return ASSISTANT_REGISTRY.load(registry_path)
+
+def run_cli(api_key, profile_table_path=None, base_url=None, metrics_path=None, registry_path=None,
+            stream=False):
+    """Run the CLI in interactive mode, writing stage metrics to metrics_path on exit if given.
+    
+    With stream=True responses are printed as they arrive rather than after the run.
+    """
+    if metrics_path is not None:
+        METRICS.enable()
+    load_assistant_registry(registry_path)
+    try:
+        _run_cli(api_key, profile_table_path, base_url, stream)
+    finally:
+        if metrics_path is not None:
+            METRICS.dump(metrics_path)
+            print(f"Wrote metrics to {metrics_path}")
+
+def _run_cli(api_key, profile_table_path, base_url, stream):
+    client = setup_client(api_key, base_url)
+    load_profile_table(profile_table_path)
     
     print("Welcome to the OpenAI Assistant CLI")
     print("==================================")
@@ -112,7 +354,8 @@ def run_cli(api_key):
             print(f"Using {ENCRYPTION_METHODS[encryption_method]} for encryption")
             
             # Generate new encryption keys for this session
-            encryption_keys = generate_encryption_keys()
+            with METRICS.span("key_generation"):
+                encryption_keys = generate_encryption_keys()
             
             # Then select assistant
             print("\nSelect an assistant:")
@@ -183,29 +426,38 @@ def run_cli(api_key):
             print("Question cannot be empty.")
             continue
         
-        # Encrypt the question using the communication module
-        encrypted_question = encrypt_user_question(question, encryption_method, encryption_keys)
+        with METRICS.turn(method=ENCRYPTION_METHODS[encryption_method], approach=assistant_approach):
+            # Encrypt the question using the communication module
+            with METRICS.span("encrypt_question"):
+                encrypted_question = encrypt_user_question(question, encryption_method, encryption_keys)
         
-        # Generate guide text using the instruction module
-        guide_text = generate_guide_text(
-            assistant_approach, 
-            encryption_method, 
-            encryption_keys,
-            min_unchanged_weight,
-            api_key  # Pass the API key to the instruction module
-        )
+            # Generate guide text using the instruction module
+            with METRICS.span("guide_text", approach=assistant_approach):
+                guide_text = generate_guide_text(
+                    assistant_approach, 
+                    encryption_method, 
+                    encryption_keys,
+                    min_unchanged_weight,
+                    api_key,  # Pass the API key to the instruction module
+                    base_url=base_url
+                )
             
-        print("\nProcessing your request... This may take a moment.")
-        print(f"Encrypted question: {encrypted_question}")
+            print("\nProcessing your request... This may take a moment.")
+            print(f"Encrypted question: {encrypted_question}")
         
-        # Prepare the user message
-        user_message = f"{guide_text}\nEncrypted question: {encrypted_question}"
-        print(user_message)
+            # Prepare the user message
+            user_message = f"{guide_text}\nEncrypted question: {encrypted_question}"
+            print(user_message)
         
-        # Process the question using the communication module
-        response = send_message_to_assistant(client, current_assistant, current_thread, user_message)
+            # Process the question using the communication module
+            if stream:
+                print("\nResponse:")
+            response = send_message_to_assistant(client, current_assistant, current_thread, user_message,
+                                                 stream=stream)
         
-        print("\nResponse:")
-        print(response)
+        # A streamed response has already been printed as it arrived
+        if not stream:
+            print("\nResponse:")
+            print(response)
         
         print("\n" + "-" * 50)
\ No newline at end of file
@@ -0,0 +1,112 @@
+import sys
+import time
+from openai import AssistantEventHandler, AsyncAssistantEventHandler
+from ga.metrics import METRICS
+
+class _StreamProgress:
+    """Printing and bookkeeping shared by the sync and async stream handlers"""
+
+    def _setup(self, output, show_tools):
+        self.output = output if output is not None else sys.stdout
+        self.show_tools = show_tools
+        self.completed_messages = []
+        self._finished_tool_calls = set()
+        self.started_at = time.perf_counter()
+        self.first_token_seconds = None
+
+    def _write(self, text):
+        self.output.write(text)
+        self.output.flush()
+
+    def _text_delta(self, delta):
+        if not delta.value:
+            return
+        if self.first_token_seconds is None:
+            # Time-to-first-token, the delay a user actually waits before seeing output
+            self.first_token_seconds = time.perf_counter() - self.started_at
+            METRICS.record("first_token", self.first_token_seconds, start=self.started_at)
+        self._write(delta.value)
+
+    def _end(self):
+        # Finish the line the streamed text was printed on
+        if self.first_token_seconds is not None:
+            self._write("\n")
+
+    def _tool_call_created(self, tool_call):
+        if self.show_tools:
+            self._write(f"\n[{tool_call.type}] running...\n")
+            # The call arrives with its first delta already applied
+            self._code_progress(tool_call)
+
+    def _tool_call_delta(self, delta):
+        if self.show_tools:
+            self._code_progress(delta)
+
+    def _code_progress(self, tool_call):
+        if tool_call.type != "code_interpreter" or tool_call.code_interpreter is None:
+            return
+        if tool_call.code_interpreter.input:
+            self._write(tool_call.code_interpreter.input)
+        for output in tool_call.code_interpreter.outputs or []:
+            if output.type == "logs" and output.logs:
+                self._write(f"\n[output] {output.logs}")
+
+    def _tool_call_done(self, tool_call):
+        # The SDK can report a call as done again when later steps finish
+        if self.show_tools and tool_call.id not in self._finished_tool_calls:
+            self._finished_tool_calls.add(tool_call.id)
+            self._write(f"\n[{tool_call.type}] done\n")
+
+class StreamPrinter(_StreamProgress, AssistantEventHandler):
+    """Prints a streamed run's text as it arrives and shows code_interpreter progress.
+
+    Completed messages are kept in completed_messages so the caller can still
+    return the run's full text once the stream ends.
+    """
+
+    def __init__(self, output=None, show_tools=True):
+        super().__init__()
+        self._setup(output, show_tools)
+
+    def on_text_delta(self, delta, snapshot):
+        self._text_delta(delta)
+
+    def on_tool_call_created(self, tool_call):
+        self._tool_call_created(tool_call)
+
+    def on_tool_call_delta(self, delta, snapshot):
+        self._tool_call_delta(delta)
+
+    def on_tool_call_done(self, tool_call):
+        self._tool_call_done(tool_call)
+
+    def on_message_done(self, message):
+        self.completed_messages.append(message)
+
+    def on_end(self):
+        self._end()
+
+class AsyncStreamPrinter(_StreamProgress, AsyncAssistantEventHandler):
+    """Async version of StreamPrinter for AsyncOpenAI run streams"""
+
+    def __init__(self, output=None, show_tools=True):
+        super().__init__()
+        self._setup(output, show_tools)
+
+    async def on_text_delta(self, delta, snapshot):
+        self._text_delta(delta)
+
+    async def on_tool_call_created(self, tool_call):
+        self._tool_call_created(tool_call)
+
+    async def on_tool_call_delta(self, delta, snapshot):
+        self._tool_call_delta(delta)
+
+    async def on_tool_call_done(self, tool_call):
+        self._tool_call_done(tool_call)
+
+    async def on_message_done(self, message):
+        self.completed_messages.append(message)
+
+    async def on_end(self):
+        self._end()
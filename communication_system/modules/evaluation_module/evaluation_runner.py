@@ -0,0 +1,287 @@
+import asyncio
+import csv
+import difflib
+import json
+import os
+import re
+import numpy as np
+from ga.metrics import METRICS
+from modules.instruction_module.instruction_module import get_assistant_configs
+from modules.communication_module.communication_encryptor import ENCRYPTION_METHODS
+from modules.communication_module.communication_module import (
+    async_setup_client,
+    load_assistant_registry,
+    load_profile_table
+)
+from modules.communication_module.batch_runner import DEFAULT_PARALLELISM, BatchRunner, completed_ids
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+# Distortion levels swept for Approach 3, matching pretrain_profiles.py
+DEFAULT_MIN_UNCHANGED_WEIGHTS = [30.0, 40.0, 50.0, 60.0, 70.0]
+
+# Used when no question file is given; "expected" lists accepted answers
+DEFAULT_QUESTIONS = [
+    {"id": "capital", "question": "What is the capital of France?", "expected": ["Paris"]},
+    {"id": "arithmetic", "question": "What is 12 multiplied by 12?", "expected": ["144"]},
+    {"id": "planet", "question": "Which planet is known as the Red Planet?", "expected": ["Mars"]},
+    {"id": "water", "question": "What is the chemical formula of water?", "expected": ["H2O"]},
+    {"id": "author", "question": "Who wrote Romeo and Juliet?", "expected": ["Shakespeare"]}
+]
+
+# Asked of every assistant so the decrypted question can be checked against the plaintext
+DECRYPTION_MARKER = "Decrypted question:"
+EVALUATION_SUFFIX = f"Begin your reply with a line '{DECRYPTION_MARKER} ' followed by the decrypted question."
+
+# Similarity to the plaintext above which a decryption counts as correct
+DECRYPTION_THRESHOLD = 0.9
+
+def load_evaluation_questions(questions_path=None):
+    """Read {"id", "question", "expected"} objects from JSONL, or return the default set"""
+    if questions_path is None:
+        return DEFAULT_QUESTIONS
+    questions = []
+    with open(questions_path, "r") as f:
+        for line_number, line in enumerate(f, 1):
+            if line.strip():
+                record = json.loads(line)
+                expected = record.get("expected", [])
+                questions.append({
+                    "id": str(record.get("id", line_number)),
+                    "question": record["question"],
+                    "expected": [expected] if isinstance(expected, str) else list(expected)
+                })
+    return questions
+
+def build_matrix(questions, approaches=None, methods=None, min_unchanged_weights=None, repeats=1):
+    """Return one item per (approach, method, min_unchanged_weight, question, repeat).
+
+    min_unchanged_weight only affects Approach 3, so the other approaches get a
+    single level. Item ids are stable, which is what makes resuming possible.
+    """
+    approaches = approaches or list(get_assistant_configs())
+    methods = methods or list(ENCRYPTION_METHODS)
+    min_unchanged_weights = min_unchanged_weights or DEFAULT_MIN_UNCHANGED_WEIGHTS
+    items = []
+    for approach in approaches:
+        levels = min_unchanged_weights if approach == "3" else [None]
+        for method in methods:
+            for weight in levels:
+                for question in questions:
+                    for repeat in range(repeats):
+                        items.append({
+                            "id": f"{approach}-{method}-{weight}-{question['id']}-{repeat}",
+                            "question": question["question"],
+                            "expected": question.get("expected", []),
+                            "method": method,
+                            "approach": approach,
+                            "min_unchanged_weight": weight
+                        })
+    return items
+
+def _normalize(text):
+    return re.sub(r"[^a-z0-9]+", " ", text.lower()).strip()
+
+def decryption_score(response, plaintext):
+    """Similarity (0-1) between the plaintext and the question the assistant says it decrypted"""
+    decrypted = response
+    for line in response.splitlines():
+        if DECRYPTION_MARKER.lower() in line.lower():
+            decrypted = line[line.lower().index(DECRYPTION_MARKER.lower()) + len(DECRYPTION_MARKER):]
+            break
+    decrypted, plaintext = _normalize(decrypted), _normalize(plaintext)
+    if plaintext and plaintext in decrypted and len(decrypted) <= 2 * len(plaintext):
+        return 1.0
+    return difflib.SequenceMatcher(None, decrypted, plaintext).ratio()
+
+def answer_correct(response, expected):
+    """Whether any accepted answer appears in the response; None when there is none to check.
+
+    The decrypted question line is left out: it echoes the question, which can
+    itself contain an accepted answer and would otherwise always count as correct.
+    """
+    if not expected:
+        return None
+    body = "\n".join(line for line in response.splitlines()
+                     if DECRYPTION_MARKER.lower() not in line.lower())
+    normalized = f" {_normalize(body)} "
+    return any(f" {_normalize(answer)} " in normalized for answer in expected)
+
+class EvaluationRunner(BatchRunner):
+    """Runs evaluation items and scores each response against its known plaintext.
+
+    Assistants and guide texts are resolved for every cell before any trial
+    starts, so GA training does not share the event loop with timed trials and
+    inflate their latencies. The generation time of each cell's guide text, which
+    for Approach 3 includes the GA training, is reported separately in every
+    record as guide_seconds.
+    """
+
+    async def prepare(self, items):
+        """Resolve the assistants and guide texts the items need"""
+        cells = {(item["approach"], item["method"], item["min_unchanged_weight"]) for item in items
+                 if item["approach"] in get_assistant_configs() and item["method"] in ENCRYPTION_METHODS}
+        # Failures are left for the trials, which retry them and record the error
+        await asyncio.gather(*[self.assistant(approach) for approach in {cell[0] for cell in cells}],
+                             *[self.guide_text(*cell) for cell in cells],
+                             return_exceptions=True)
+
+    async def run(self, items, output_path):
+        done = completed_ids(output_path)
+        await self.prepare([item for item in items if item["id"] not in done])
+        return await super().run(items, output_path)
+
+    def build_message(self, guide_text, encrypted_question):
+        return f"{super().build_message(guide_text, encrypted_question)}\n{EVALUATION_SUFFIX}"
+
+    async def process(self, item):
+        record = await super().process(item)
+        record["question"] = item["question"]
+        # One-off cost of the cell's guide text, kept out of the trial's own latency
+        record["guide_seconds"] = self.guide_seconds.get(
+            (item["approach"], item["method"], item["min_unchanged_weight"]))
+        if record["status"] == "ok":
+            score = decryption_score(record["response"], item["question"])
+            record["decryption_score"] = round(score, 4)
+            record["decrypted"] = score >= DECRYPTION_THRESHOLD
+            record["answer_correct"] = answer_correct(record["response"], item["expected"])
+            record["success"] = record["decrypted"] and record["answer_correct"] is not False
+        else:
+            record["success"] = False
+        return record
+
+def load_records(checkpoint_path):
+    """Latest record per item id from the JSONL checkpoint"""
+    records = {}
+    with open(checkpoint_path, "r") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            records[record["id"]] = record
+    return list(records.values())
+
+def to_rows(records):
+    """Flatten records into table rows, with one <stage>_seconds column per stage"""
+    rows = []
+    for record in records:
+        row = {key: value for key, value in record.items() if key != "stages"}
+        for stage, seconds in (record.get("stages") or {}).items():
+            row[f"{stage}_seconds"] = seconds
+        rows.append(row)
+    return rows
+
+def write_table(rows, output_path):
+    """Write rows as Parquet when pyarrow is installed, otherwise as CSV; return the path used"""
+    columns = []
+    for row in rows:
+        for key in row:
+            if key not in columns:
+                columns.append(key)
+
+    if output_path.endswith(".parquet"):
+        if pa is not None:
+            table = pa.table({column: [row.get(column) for row in rows] for column in columns})
+            pq.write_table(table, output_path)
+            return output_path
+        output_path = output_path[:-len(".parquet")] + ".csv"
+        print("pyarrow is not installed; writing CSV instead")
+
+    with open(output_path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=columns)
+        writer.writeheader()
+        writer.writerows(rows)
+    return output_path
+
+def summarize(records):
+    """Success rate and latency for each (approach, method, min_unchanged_weight) cell"""
+    cells = {}
+    for record in records:
+        key = (record["approach"], record["method"], record["min_unchanged_weight"])
+        cells.setdefault(key, []).append(record)
+
+    summary = []
+    for (approach, method, weight), cell in sorted(cells.items(), key=lambda c: tuple(map(str, c[0]))):
+        answered = [record for record in cell if record["status"] == "ok"]
+        seconds = np.array([record["seconds"] for record in answered])
+        throttled = np.array([record.get("throttled_seconds", 0.0) for record in answered])
+        # Every trial of a run reports its cell's guide time; a resumed cell may have two runs
+        guide = np.array([record["guide_seconds"] for record in cell if record.get("guide_seconds") is not None])
+        summary.append({
+            "approach": approach,
+            "method": method,
+            "min_unchanged_weight": weight,
+            "trials": len(cell),
+            "errors": sum(record["status"] != "ok" for record in cell),
+            "success_rate": sum(bool(record.get("success")) for record in cell) / len(cell),
+            "decryption_rate": sum(bool(record.get("decrypted")) for record in cell) / len(cell),
+            "mean_seconds": float(seconds.mean()) if len(seconds) else None,
+            "p50_seconds": float(np.percentile(seconds, 50)) if len(seconds) else None,
+            "p90_seconds": float(np.percentile(seconds, 90)) if len(seconds) else None,
+            "mean_throttled_seconds": float(throttled.mean()) if len(throttled) else None,
+            "guide_seconds": float(guide.mean()) if len(guide) else None
+        })
+    return summary
+
+def print_summary(summary):
+    """Print the per-cell table.
+
+    "Throttled" is the mean wait on the client-side rate limits and "Guide s" the
+    one-off time to generate the cell's guide text, which p50/p90 leave out.
+    """
+    print(f"\n{'Approach':<9}{'Method':<15}{'Weight':>7}{'Trials':>8}{'Success':>9}{'Decrypt':>9}"
+          f"{'p50 s':>8}{'p90 s':>8}{'Throttled':>11}{'Guide s':>9}")
+    for cell in summary:
+        weight = "-" if cell["min_unchanged_weight"] is None else f"{cell['min_unchanged_weight']:g}"
+        timings = [
+            "-" if cell[key] is None else f"{cell[key]:.2f}"
+            for key in ("p50_seconds", "p90_seconds", "mean_throttled_seconds", "guide_seconds")
+        ]
+        print(f"{cell['approach']:<9}{cell['method']:<15}{weight:>7}{cell['trials']:>8}"
+              f"{cell['success_rate']:>9.0%}{cell['decryption_rate']:>9.0%}"
+              f"{timings[0]:>8}{timings[1]:>8}{timings[2]:>11}{timings[3]:>9}")
+
+def run_evaluation(api_key, output_path, questions_path=None, approaches=None, methods=None,
+                   min_unchanged_weights=None, repeats=1, parallelism=DEFAULT_PARALLELISM,
+                   checkpoint_path=None, profile_table_path=None, base_url=None, metrics_path=None,
+                   registry_path=None):
+    """Evaluate every cell of the approach x method x weight matrix over the question set.
+
+    Raw records are appended to a JSONL checkpoint (output_path with a .jsonl
+    suffix by default) as they complete; rerunning skips answered items. The
+    columnar table and the per-cell summary are rebuilt from the checkpoint at
+    the end.
+    """
+    if checkpoint_path is None:
+        checkpoint_path = os.path.splitext(output_path)[0] + ".jsonl"
+    METRICS.enable()
+    load_assistant_registry(registry_path)
+    load_profile_table(profile_table_path)
+    items = build_matrix(load_evaluation_questions(questions_path), approaches, methods,
+                         min_unchanged_weights, repeats)
+    print(f"Evaluating {len(items)} trials")
+
+    async def main():
+        runner = EvaluationRunner(async_setup_client(api_key, base_url), api_key, parallelism, base_url)
+        return await runner.run(items, checkpoint_path)
+
+    try:
+        asyncio.run(main())
+    finally:
+        if metrics_path is not None:
+            METRICS.dump(metrics_path)
+            print(f"Wrote metrics to {metrics_path}")
+
+    # Only this matrix's items, in case the checkpoint is shared with another sweep
+    item_ids = {item["id"] for item in items}
+    records = [record for record in load_records(checkpoint_path) if record["id"] in item_ids]
+    table_path = write_table(to_rows(records), output_path)
+    print(f"Wrote {len(records)} results to {table_path}")
+    summary = summarize(records)
+    print_summary(summary)
+    return summary
@@ -1,6 +1,16 @@
 import binascii
-from ga.gaDistorter import GeneticTextDistorter
+from ga.gaDistorter import AsyncGeneticTextDistorter, GeneticTextDistorter
+from ga.distortionFuntions import distort_text
 from modules.instruction_module.instruction_encryptor import encrypt
+from modules.instruction_module.profile_cache import DistortionProfileCache
+
+# GA settings used for Approach 3 guide texts
+GUIDE_ALPHA = 0.5
+GUIDE_EMBEDDING_MODEL = "text-embedding-3-small"
+GUIDE_GENERATIONS = 5
+
+# Trained weight profiles shared by every guide text in this process
+PROFILE_CACHE = DistortionProfileCache()
 
 # Assistant configurations
 ASSISTANT_CONFIGS = {
@@ -88,11 +98,44 @@ def generate_text_key_guide_text(method, keys):
     else:
         return ""
 
+async def async_generate_guide_text(assistant_approach, encryption_method, encryption_keys, min_unchanged_weight=None,
+                                    api_key=None, profile_cache=None, base_url=None):
+    """Async version of generate_guide_text; Approach 3 training is awaited on AsyncOpenAI"""
+    
+    # Approaches 1 and 2 make no API calls
+    if assistant_approach != "3":
+        return generate_guide_text(assistant_approach, encryption_method, encryption_keys)
+    
+    encryption_info = generate_text_key_guide_text(encryption_method, encryption_keys)
+    profile_cache, profile_key, weights = lookup_guide_profile(encryption_method, min_unchanged_weight, profile_cache)
+    if weights is not None:
+        print("Distorting encryption information with cached profile...")
+        return distort_text(encryption_info, weights)
+    
+    if api_key is None:
+        raise ValueError("API key is required for Approach 3 but was not provided")
+    
+    distorter = AsyncGeneticTextDistorter(api_key=api_key, min_unchanged_weight=min_unchanged_weight,
+                                          alpha=GUIDE_ALPHA, embedding_model=GUIDE_EMBEDDING_MODEL,
+                                          base_url=base_url)
+    print("Distorting encryption information...")
+    results = await distorter.train(encryption_info, generations=GUIDE_GENERATIONS)
+    profile_cache.put(profile_key, results['weights'])
+    return results['text']['distorted_text']
+
 def get_assistant_configs():
     """Return the assistant configurations"""
     return ASSISTANT_CONFIGS
 
-def generate_guide_text(assistant_approach, encryption_method, encryption_keys, min_unchanged_weight=None, api_key=None):
+def lookup_guide_profile(encryption_method, min_unchanged_weight=None, profile_cache=None):
+    """Return the profile cache, key and cached weights (None on a miss) for an Approach 3 guide text"""
+    if profile_cache is None:
+        profile_cache = PROFILE_CACHE
+    profile_key = profile_cache.make_key(encryption_method, min_unchanged_weight, GUIDE_ALPHA, GUIDE_EMBEDDING_MODEL)
+    return profile_cache, profile_key, profile_cache.get(profile_key)
+
+def generate_guide_text(assistant_approach, encryption_method, encryption_keys, min_unchanged_weight=None, api_key=None,
+                        profile_cache=None, base_url=None):
     """Generate guide text based on assistant approach and encryption method"""
     
     # For Approach 1, include encryption info
@@ -110,12 +153,21 @@ def generate_guide_text(assistant_approach, encryption_method, encryption_keys,
     elif assistant_approach == "3":
         encryption_info = generate_text_key_guide_text(encryption_method, encryption_keys)
         
+        # Reuse trained weights for this configuration instead of retraining the GA
+        profile_cache, profile_key, weights = lookup_guide_profile(encryption_method, min_unchanged_weight, profile_cache)
+        if weights is not None:
+            print("Distorting encryption information with cached profile...")
+            return distort_text(encryption_info, weights)
+        
         if api_key is None:
             raise ValueError("API key is required for Approach 3 but was not provided")
             
-        distorter = GeneticTextDistorter(api_key=api_key, min_unchanged_weight=min_unchanged_weight)
+        distorter = GeneticTextDistorter(api_key=api_key, min_unchanged_weight=min_unchanged_weight,
+                                         alpha=GUIDE_ALPHA, embedding_model=GUIDE_EMBEDDING_MODEL,
+                                         base_url=base_url)
         print("Distorting encryption information...")
-        results = distorter.train(encryption_info, generations=5)
+        results = distorter.train(encryption_info, generations=GUIDE_GENERATIONS)
+        profile_cache.put(profile_key, results['weights'])
         return results['text']['distorted_text']
     
-    return ""
\ No newline at end of file
+    return ""
@@ -0,0 +1,118 @@
+import json
+import os
+import threading
+import time
+from ga.gaOperations import normalize_weights
+
+class DistortionProfileCache:
+    """Best GA weight vectors keyed on (encryption method, min_unchanged_weight, alpha, model).
+
+    An entry is refreshed (retrained) once it is older than ttl_seconds or has been
+    reused max_reuses times; either limit can be disabled with None. With a path,
+    reuse counts are saved with the entries, so the limit spans sessions. Profiles loaded
+    from a pretrained table never expire and back every lookup the session misses.
+    """
+
+    def __init__(self, ttl_seconds=None, max_reuses=25, path=None):
+        self.ttl_seconds = ttl_seconds
+        self.max_reuses = max_reuses
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._profiles = {}
+        self._pretrained = {}
+        self._lock = threading.Lock()
+
+        if path is not None and os.path.exists(path):
+            self._load()
+
+    @staticmethod
+    def make_key(method, min_unchanged_weight, alpha, model):
+        """Build the cache key for a training configuration"""
+        return (str(method), float(min_unchanged_weight or 0.0), float(alpha), model)
+
+    def _is_stale(self, entry):
+        """Check whether an entry has hit its refresh policy"""
+        if self.ttl_seconds is not None and time.time() - entry["created_at"] > self.ttl_seconds:
+            return True
+        if self.max_reuses is not None and entry["uses"] >= self.max_reuses:
+            return True
+        return False
+
+    def get(self, key):
+        """Return cached weights for key, or None if missing or due for a refresh"""
+        with self._lock:
+            entry = self._profiles.get(key)
+            if entry is None or self._is_stale(entry):
+                if self._profiles.pop(key, None) is not None and self.path is not None:
+                    self._save()
+                weights = self._lookup_pretrained(key)
+                if weights is not None:
+                    self.hits += 1
+                    return weights
+                self.misses += 1
+                return None
+
+            entry["uses"] += 1
+            # Persist the count so max_reuses spans sessions, not just this process
+            if self.path is not None:
+                self._save()
+            self.hits += 1
+            return dict(entry["weights"])
+
+    def put(self, key, weights):
+        """Store the best weights found by a training run"""
+        with self._lock:
+            self._profiles[key] = {
+                "weights": dict(weights),
+                "created_at": time.time(),
+                "uses": 0
+            }
+            if self.path is not None:
+                self._save()
+
+    def load_table(self, path):
+        """Load a pretrained weight table written by pretrain_profiles.py"""
+        with open(path, "r") as f:
+            table = json.load(f)
+
+        types = table["distortion_types"]
+        with self._lock:
+            for profile in table["profiles"]:
+                key = self.make_key(profile["method"], profile["min_unchanged_weight"],
+                                    profile["alpha"], profile["model"])
+                self._pretrained[key] = dict(zip(types, profile["weights"]))
+        return len(table["profiles"])
+
+    def _lookup_pretrained(self, key):
+        """Find the pretrained profile for key, or the nearest min_unchanged_weight grid point"""
+        if key in self._pretrained:
+            return dict(self._pretrained[key])
+
+        method, min_unchanged_weight, alpha, model = key
+        candidates = [k for k in self._pretrained if k[0] == method and k[2] == alpha and k[3] == model]
+        if not candidates:
+            return None
+
+        nearest = min(candidates, key=lambda k: abs(k[1] - min_unchanged_weight))
+        # Repair the grid profile so it honours the requested minimum
+        return normalize_weights(self._pretrained[nearest], min_unchanged_weight)
+
+    def clear(self):
+        """Drop every cached profile"""
+        with self._lock:
+            self._profiles.clear()
+            if self.path is not None:
+                self._save()
+
+    def _load(self):
+        """Read profiles saved by a previous session"""
+        with open(self.path, "r") as f:
+            for item in json.load(f):
+                self._profiles[tuple(item["key"])] = item["entry"]
+
+    def _save(self):
+        """Write all profiles to the JSON file"""
+        items = [{"key": list(key), "entry": entry} for key, entry in self._profiles.items()]
+        with open(self.path, "w") as f:
+            json.dump(items, f, indent=2)
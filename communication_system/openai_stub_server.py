@@ -0,0 +1,520 @@
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+import uuid
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+import numpy as np
+from ga.fitnessBackends import TableInversionUsabilityBackend
+
+# Local stand-in for the OpenAI endpoints this project calls, for offline load tests.
+# Point a client at it with base_url="http://127.0.0.1:8089/v1" (or OPENAI_BASE_URL) and any API key.
+
+LATENCY_DISTRIBUTIONS = ["fixed", "uniform", "exponential", "lognormal"]
+
+class LatencyModel:
+    """Samples a response delay in seconds from the configured distribution"""
+
+    def __init__(self, distribution="fixed", mean_ms=0.0, spread=0.5, seed=None):
+        if distribution not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"Unknown latency distribution: {distribution}")
+        self.distribution = distribution
+        self.mean = mean_ms / 1000
+        self.spread = spread
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def sample(self):
+        """Draw one delay; spread is the relative half-width (uniform) or sigma (lognormal)"""
+        if self.mean <= 0:
+            return 0.0
+        with self._lock:
+            if self.distribution == "uniform":
+                return self._rng.uniform(self.mean * (1 - self.spread), self.mean * (1 + self.spread))
+            if self.distribution == "exponential":
+                return self._rng.expovariate(1 / self.mean)
+            if self.distribution == "lognormal":
+                # Parameterized so the distribution mean equals mean_ms
+                return self._rng.lognormvariate(np.log(self.mean) - self.spread ** 2 / 2, self.spread)
+            return self.mean
+
+class FaultInjector:
+    """Decides, reproducibly for a seed, which requests fail with a 429 or a 500"""
+
+    def __init__(self, rate_limit_rate=0.0, error_rate=0.0, retry_after=1.0, seed=None):
+        self.rate_limit_rate = rate_limit_rate
+        self.error_rate = error_rate
+        self.retry_after = retry_after
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def draw(self):
+        """Return None, "rate_limit" or "server_error" for the next request"""
+        with self._lock:
+            roll = self._rng.random()
+        if roll < self.rate_limit_rate:
+            return "rate_limit"
+        if roll < self.rate_limit_rate + self.error_rate:
+            return "server_error"
+        return None
+
+class StubStore:
+    """In-memory assistants, threads, messages and runs"""
+
+    def __init__(self, run_seconds=0.0):
+        self.run_seconds = run_seconds
+        self.assistants = {}
+        self.threads = {}
+        self.messages = {}
+        self.runs = {}
+        self.stats = {}
+        self._lock = threading.Lock()
+
+    def count(self, endpoint):
+        with self._lock:
+            self.stats[endpoint] = self.stats.get(endpoint, 0) + 1
+
+    @staticmethod
+    def new_id(prefix):
+        return f"{prefix}_{uuid.uuid4().hex[:24]}"
+
+    def create_assistant(self, body):
+        assistant = {
+            "id": self.new_id("asst"),
+            "object": "assistant",
+            "created_at": int(time.time()),
+            "name": body.get("name"),
+            "description": body.get("description"),
+            "instructions": body.get("instructions"),
+            "model": body.get("model", "gpt-4o"),
+            "tools": body.get("tools", []),
+            "metadata": body.get("metadata", {})
+        }
+        with self._lock:
+            self.assistants[assistant["id"]] = assistant
+        return assistant
+
+    def update_assistant(self, assistant_id, body):
+        with self._lock:
+            assistant = self.assistants[assistant_id]
+            for field in ("name", "description", "instructions", "model", "tools", "metadata"):
+                if field in body:
+                    assistant[field] = body[field]
+            return assistant
+
+    def create_thread(self, body):
+        thread = {
+            "id": self.new_id("thread"),
+            "object": "thread",
+            "created_at": int(time.time()),
+            "metadata": body.get("metadata", {})
+        }
+        with self._lock:
+            self.threads[thread["id"]] = thread
+            self.messages[thread["id"]] = []
+        for message in body.get("messages", []):
+            self.create_message(thread["id"], message)
+        return thread
+
+    def create_message(self, thread_id, body, run_id=None, assistant_id=None):
+        content = body.get("content", "")
+        if isinstance(content, list):
+            content = "".join(part.get("text", "") for part in content if isinstance(part, dict))
+        message = {
+            "id": self.new_id("msg"),
+            "object": "thread.message",
+            "created_at": int(time.time()),
+            "thread_id": thread_id,
+            "role": body.get("role", "user"),
+            "content": [{"type": "text", "text": {"value": content, "annotations": []}}],
+            "assistant_id": assistant_id,
+            "run_id": run_id,
+            "attachments": [],
+            "metadata": {}
+        }
+        with self._lock:
+            self.messages[thread_id].append(message)
+        return message
+
+    def create_run(self, thread_id, body):
+        run = {
+            "id": self.new_id("run"),
+            "object": "thread.run",
+            "created_at": int(time.time()),
+            "thread_id": thread_id,
+            "assistant_id": body.get("assistant_id"),
+            "status": "queued",
+            "model": body.get("model", "gpt-4o"),
+            "instructions": body.get("instructions", ""),
+            "tools": [],
+            "metadata": {}
+        }
+        with self._lock:
+            self.runs[run["id"]] = (run, time.monotonic() + self.run_seconds)
+        return run
+
+    def retrieve_run(self, run_id):
+        """Return the run, completing it with a deterministic reply once its time is up"""
+        with self._lock:
+            run, finishes_at = self.runs[run_id]
+            if run["status"] in ("completed", "failed", "cancelled", "expired"):
+                return run
+            if time.monotonic() < finishes_at:
+                run["status"] = "in_progress"
+                return run
+            run["status"] = "completed"
+            prompt = [m for m in self.messages[run["thread_id"]] if m["role"] == "user"]
+        reply = assistant_reply(prompt[-1]["content"][0]["text"]["value"] if prompt else "")
+        self.create_message(run["thread_id"], {"role": "assistant", "content": reply},
+                            run_id=run_id, assistant_id=run["assistant_id"])
+        return run
+
+    def stream_run(self, thread_id, body, token_seconds=0.0):
+        """Create a run and yield its server-sent events until it completes.
+
+        Assistants with code_interpreter get a tool-call step first, as the real
+        assistants run their decryption there. The reply is then streamed word by
+        word as message deltas, token_seconds apart.
+        """
+        run = self.create_run(thread_id, body)
+        assistant = self.assistants.get(run["assistant_id"]) or {}
+        run["tools"] = assistant.get("tools", [])
+        yield "thread.run.created", dict(run)
+        run["status"] = "in_progress"
+        yield "thread.run.in_progress", dict(run)
+
+        started = time.monotonic()
+        if any(tool.get("type") == "code_interpreter" for tool in run["tools"]):
+            call_id = self.new_id("call")
+            step = self._run_step(run, {"type": "tool_calls", "tool_calls": []})
+            yield "thread.run.step.created", dict(step)
+            yield "thread.run.step.delta", self._step_delta(step, {
+                "index": 0, "id": call_id, "type": "code_interpreter",
+                "code_interpreter": {"input": "decrypted = decrypt(question)\n", "outputs": []}})
+            time.sleep(self.run_seconds)
+            yield "thread.run.step.delta", self._step_delta(step, {
+                "index": 0, "type": "code_interpreter",
+                "code_interpreter": {"outputs": [{"index": 0, "type": "logs", "logs": "decrypted"}]}})
+            step["status"] = "completed"
+            step["step_details"]["tool_calls"] = [{
+                "id": call_id, "type": "code_interpreter",
+                "code_interpreter": {"input": "decrypted = decrypt(question)\n",
+                                     "outputs": [{"type": "logs", "logs": "decrypted"}]}}]
+            yield "thread.run.step.completed", dict(step)
+        else:
+            time.sleep(self.run_seconds)
+
+        with self._lock:
+            prompt = [m for m in self.messages[thread_id] if m["role"] == "user"]
+        reply = assistant_reply(prompt[-1]["content"][0]["text"]["value"] if prompt else "")
+        message = self.create_message(thread_id, {"role": "assistant", "content": reply},
+                                      run_id=run["id"], assistant_id=run["assistant_id"])
+        step = self._run_step(run, {"type": "message_creation",
+                                    "message_creation": {"message_id": message["id"]}})
+        yield "thread.run.step.created", dict(step)
+        yield "thread.message.created", dict(message, status="in_progress", content=[])
+        for i, word in enumerate(reply.split(" ")):
+            if i and token_seconds > 0:
+                time.sleep(token_seconds)
+            yield "thread.message.delta", {
+                "id": message["id"],
+                "object": "thread.message.delta",
+                "delta": {"content": [{"index": 0, "type": "text",
+                                       "text": {"value": word if i == 0 else " " + word, "annotations": []}}]}
+            }
+        yield "thread.message.completed", dict(message, status="completed")
+        step["status"] = "completed"
+        yield "thread.run.step.completed", dict(step)
+
+        with self._lock:
+            run["status"] = "completed"
+            self.runs[run["id"]] = (run, started)
+        yield "thread.run.completed", dict(run)
+
+    def _run_step(self, run, step_details):
+        return {
+            "id": self.new_id("step"),
+            "object": "thread.run.step",
+            "created_at": int(time.time()),
+            "run_id": run["id"],
+            "assistant_id": run["assistant_id"],
+            "thread_id": run["thread_id"],
+            "type": step_details["type"],
+            "status": "in_progress",
+            "step_details": step_details,
+            "cancelled_at": None,
+            "completed_at": None,
+            "expired_at": None,
+            "failed_at": None,
+            "last_error": None,
+            "usage": None,
+            "metadata": {}
+        }
+
+    @staticmethod
+    def _step_delta(step, tool_call):
+        return {
+            "id": step["id"],
+            "object": "thread.run.step.delta",
+            "delta": {"step_details": {"type": "tool_calls", "tool_calls": [tool_call]}}
+        }
+
+def assistant_reply(prompt):
+    """Deterministic assistant answer for a prompt"""
+    digest = hashlib.sha256(prompt.encode()).hexdigest()[:16]
+    return f"Stub answer {digest} for a {len(prompt)}-character message."
+
+def fake_embedding(text, dimensions):
+    """Deterministic unit vector from hashed character trigrams, so similar texts embed nearby"""
+    vector = np.zeros(dimensions)
+    encoded = text.encode()
+    for i in range(max(1, len(encoded) - 2)):
+        vector[zlib.crc32(encoded[i:i + 3]) % dimensions] += 1.0
+    norm = np.linalg.norm(vector)
+    return (vector / norm if norm > 0 else vector).round(6).tolist()
+
+def paginate(items, query):
+    """Apply the list endpoints' order, after and limit parameters"""
+    if query.get("order", ["desc"])[0] == "desc":
+        items = items[::-1]
+    after = query.get("after", [None])[0]
+    if after is not None:
+        ids = [item["id"] for item in items]
+        items = items[ids.index(after) + 1:] if after in ids else []
+    limit = int(query.get("limit", ["20"])[0])
+    page = items[:limit]
+    return {
+        "object": "list",
+        "data": page,
+        "first_id": page[0]["id"] if page else None,
+        "last_id": page[-1]["id"] if page else None,
+        "has_more": len(items) > limit
+    }
+
+class StubRequestHandler(BaseHTTPRequestHandler):
+    """Routes /v1 requests to the stub store; configured through the server attributes"""
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _send_json(self, status, payload, headers=None):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_events(self, events):
+        """Write (event, data) pairs as a server-sent event stream, then close the connection"""
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+        for event, data in events:
+            self.wfile.write(f"event: {event}\ndata: {json.dumps(data)}\n\n".encode())
+            self.wfile.flush()
+        self.wfile.write(b"event: done\ndata: [DONE]\n\n")
+        self.wfile.flush()
+
+    def _send_error(self, status, message, error_type, headers=None):
+        self._send_json(status, {"error": {"message": message, "type": error_type, "code": None}}, headers)
+
+    def _read_body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length) or b"{}") if length else {}
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def _handle(self, method):
+        url = urlparse(self.path)
+        parts = [part for part in url.path.split("/") if part]
+        if parts[:1] == ["v1"]:
+            parts = parts[1:]
+        query = parse_qs(url.query)
+        body = self._read_body() if method == "POST" else {}
+        store = self.server.store
+
+        time.sleep(self.server.latency.sample())
+        fault = self.server.faults.draw()
+        if fault == "rate_limit":
+            store.count("rate_limited")
+            return self._send_error(429, "Rate limit reached (injected)", "rate_limit_exceeded",
+                                    {"Retry-After": str(self.server.faults.retry_after)})
+        if fault == "server_error":
+            store.count("server_errors")
+            return self._send_error(500, "Internal server error (injected)", "server_error")
+
+        try:
+            route = self._route(method, parts)
+        except KeyError as e:
+            return self._send_error(404, f"No such object: {e}", "invalid_request_error")
+        if route is None:
+            return self._send_error(404, f"Unknown endpoint {method} {url.path}", "invalid_request_error")
+        endpoint, handler = route
+        store.count(endpoint)
+        try:
+            status, payload, headers = handler(body, query)
+        except KeyError as e:
+            return self._send_error(404, f"No such object: {e}", "invalid_request_error")
+        if status == "stream":
+            return self._send_events(payload)
+        self._send_json(status, payload, headers)
+
+    def _route(self, method, parts):
+        """Return (endpoint name, handler) for a request path, or None"""
+        store = self.server.store
+        if method == "POST" and parts == ["embeddings"]:
+            return "embeddings", self._embeddings
+        if method == "POST" and parts == ["chat", "completions"]:
+            return "chat.completions", self._chat_completion
+        if parts[:1] == ["assistants"]:
+            if len(parts) == 1 and method == "GET":
+                return "assistants.list", lambda body, query: (
+                    200, paginate(list(store.assistants.values()), query), None)
+            if len(parts) == 1 and method == "POST":
+                return "assistants.create", lambda body, query: (200, store.create_assistant(body), None)
+            if len(parts) == 2 and method == "GET":
+                return "assistants.retrieve", lambda body, query: (200, store.assistants[parts[1]], None)
+            if len(parts) == 2 and method == "POST":
+                return "assistants.update", lambda body, query: (200, store.update_assistant(parts[1], body), None)
+        if parts[:1] == ["threads"]:
+            if len(parts) == 1 and method == "POST":
+                return "threads.create", lambda body, query: (200, store.create_thread(body), None)
+            thread_id = parts[1] if len(parts) > 1 else None
+            if thread_id is not None and thread_id not in store.threads:
+                raise KeyError(thread_id)
+            if parts[2:] == ["messages"] and method == "POST":
+                return "messages.create", lambda body, query: (
+                    200, store.create_message(thread_id, body), None)
+            if parts[2:] == ["messages"] and method == "GET":
+                return "messages.list", lambda body, query: (
+                    200, paginate(self._thread_messages(thread_id, query), query), None)
+            if parts[2:] == ["runs"] and method == "POST":
+                return "runs.create", self._create_run(thread_id)
+            if len(parts) == 4 and parts[2] == "runs" and method == "GET":
+                return "runs.retrieve", lambda body, query: (
+                    200, store.retrieve_run(parts[3]),
+                    {"openai-poll-after-ms": str(self.server.poll_interval_ms)})
+        return None
+
+    def _thread_messages(self, thread_id, query):
+        messages = list(self.server.store.messages[thread_id])
+        run_id = query.get("run_id", [None])[0]
+        if run_id is not None:
+            messages = [message for message in messages if message["run_id"] == run_id]
+        return messages
+
+    def _create_run(self, thread_id):
+        def handler(body, query):
+            if body.get("stream"):
+                return "stream", self.server.store.stream_run(thread_id, body, self.server.token_ms / 1000), None
+            return 200, self.server.store.create_run(thread_id, body), None
+        return handler
+
+    def _embeddings(self, body, query):
+        inputs = body.get("input", "")
+        texts = [inputs] if isinstance(inputs, str) else list(inputs)
+        dimensions = int(body.get("dimensions") or self.server.embedding_dimensions)
+        tokens = sum(len(text) // 4 + 1 for text in texts)
+        return 200, {
+            "object": "list",
+            "data": [{"object": "embedding", "index": i, "embedding": fake_embedding(text, dimensions)}
+                     for i, text in enumerate(texts)],
+            "model": body.get("model", "text-embedding-3-small"),
+            "usage": {"prompt_tokens": tokens, "total_tokens": tokens}
+        }, None
+
+    def _chat_completion(self, body, query):
+        prompt = body.get("messages", [{}])[-1].get("content", "") or ""
+        # Undo the distortion tables locally so usability scores behave like a real model's
+        with self.server.reconstruction_lock:
+            content = self.server.reconstructor.reconstruct("", prompt)
+        prompt_tokens = sum(len(str(m.get("content", ""))) // 4 + 1 for m in body.get("messages", []))
+        completion_tokens = len(content) // 4 + 1
+        return 200, {
+            "id": f"chatcmpl-{uuid.uuid4().hex[:24]}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "gpt-4o-mini"),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content},
+                         "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                      "total_tokens": prompt_tokens + completion_tokens}
+        }, None
+
+def make_server(host="127.0.0.1", port=8089, latency_distribution="fixed", latency_ms=0.0,
+                latency_spread=0.5, rate_limit_rate=0.0, error_rate=0.0, retry_after=1.0,
+                run_seconds=0.0, poll_interval_ms=100, embedding_dimensions=256, seed=None,
+                verbose=False, token_ms=0.0):
+    """Build (but do not start) a stub server; port 0 picks a free port"""
+    server = ThreadingHTTPServer((host, port), StubRequestHandler)
+    server.daemon_threads = True
+    server.latency = LatencyModel(latency_distribution, latency_ms, latency_spread, seed)
+    server.faults = FaultInjector(rate_limit_rate, error_rate, retry_after,
+                                  None if seed is None else seed + 1)
+    server.store = StubStore(run_seconds)
+    server.poll_interval_ms = poll_interval_ms
+    server.token_ms = token_ms
+    server.embedding_dimensions = embedding_dimensions
+    server.reconstructor = TableInversionUsabilityBackend()
+    server.reconstruction_lock = threading.Lock()
+    server.verbose = verbose
+    return server
+
+def serve_in_background(**options):
+    """Start a stub server on a daemon thread and return (server, base_url)"""
+    server = make_server(**options)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    host, port = server.server_address[:2]
+    return server, f"http://{host}:{port}/v1"
+
+def main():
+    parser = argparse.ArgumentParser(description="Local OpenAI stand-in for offline load tests")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency-distribution", choices=LATENCY_DISTRIBUTIONS, default="fixed")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Mean delay added to every request")
+    parser.add_argument("--latency-spread", type=float, default=0.5,
+                        help="Relative half-width (uniform) or sigma (lognormal)")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Fraction of requests answered with 429")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 500")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="Retry-After seconds sent with a 429")
+    parser.add_argument("--run-seconds", type=float, default=0.0, help="Time before an assistant run completes")
+    parser.add_argument("--poll-interval-ms", type=int, default=100)
+    parser.add_argument("--token-ms", type=float, default=0.0,
+                        help="Delay between streamed words of an assistant reply")
+    parser.add_argument("--embedding-dimensions", type=int, default=256)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    server = make_server(args.host, args.port, args.latency_distribution, args.latency_ms,
+                         args.latency_spread, args.rate_limit_rate, args.error_rate, args.retry_after,
+                         args.run_seconds, args.poll_interval_ms, args.embedding_dimensions, args.seed,
+                         args.verbose, args.token_ms)
+    print(f"Stub OpenAI server listening on http://{args.host}:{server.server_address[1]}/v1")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from ga.gaDistorter import GeneticTextDistorter
+from ga.gaOperations import normalize_weights
+from ga.distortionFuntions import DISTORTION_TYPES
+from modules.communication_module.communication_encryptor import (
+    ENCRYPTION_METHODS,
+    generate_encryption_keys
+)
+from modules.instruction_module.instruction_module import (
+    GUIDE_EMBEDDING_MODEL,
+    GUIDE_GENERATIONS,
+    generate_text_key_guide_text
+)
+
+# OpenAI API Key - typically this would be stored securely or passed as an environment variable
+api_key = os.environ.get("OPENAI_API_KEY", "")
+
+def build_corpus(method, samples):
+    """Generate representative guide texts for a method, each with fresh keys"""
+    return [generate_text_key_guide_text(method, generate_encryption_keys()) for _ in range(samples)]
+
+def train_cell(api_key, method, min_unchanged_weight, alpha, samples, generations, seed):
+    """Train the GA over a method's corpus and average the best weights into one profile"""
+    corpus = build_corpus(method, samples)
+    weight_sums = dict.fromkeys(DISTORTION_TYPES, 0.0)
+    rewards = []
+
+    for i, text in enumerate(corpus):
+        distorter = GeneticTextDistorter(
+            api_key=api_key,
+            alpha=alpha,
+            embedding_model=GUIDE_EMBEDDING_MODEL,
+            min_unchanged_weight=min_unchanged_weight,
+            seed=None if seed is None else seed + i
+        )
+        results = distorter.train(text, generations=generations)
+        rewards.append(results['reward'])
+        for key in DISTORTION_TYPES:
+            weight_sums[key] += results['weights'][key]
+
+    # Averaging keeps the profile robust to any single key; repair the minimum afterwards
+    weights = normalize_weights(
+        {key: total / len(corpus) for key, total in weight_sums.items()}, min_unchanged_weight
+    )
+    return {
+        "method": method,
+        "min_unchanged_weight": min_unchanged_weight,
+        "alpha": alpha,
+        "model": GUIDE_EMBEDDING_MODEL,
+        "weights": [round(weights[key], 4) for key in DISTORTION_TYPES],
+        "mean_reward": round(sum(rewards) / len(rewards), 4)
+    }
+
+def pretrain(api_key, output, min_unchanged_weights, alphas, samples, generations, workers, seed=None):
+    """Train every (method, min_unchanged_weight, alpha) cell in parallel and write the table"""
+    cells = [(method, weight, alpha)
+             for method in ENCRYPTION_METHODS
+             for weight in min_unchanged_weights
+             for alpha in alphas]
+    profiles = []
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(train_cell, api_key, method, weight, alpha, samples, generations,
+                            None if seed is None else seed + 1000 * index): (method, weight, alpha)
+            for index, (method, weight, alpha) in enumerate(cells)
+        }
+        for future in as_completed(futures):
+            method, weight, alpha = futures[future]
+            try:
+                profile = future.result()
+            except Exception as e:
+                print(f"Failed {ENCRYPTION_METHODS[method]} weight={weight} alpha={alpha}: {e}")
+                continue
+            profiles.append(profile)
+            print(f"Trained {ENCRYPTION_METHODS[method]} weight={weight} alpha={alpha}: "
+                  f"reward {profile['mean_reward']:.4f} ({len(profiles)}/{len(cells)})")
+
+    profiles.sort(key=lambda p: (p["method"], p["min_unchanged_weight"], p["alpha"]))
+    with open(output, "w") as f:
+        json.dump({"distortion_types": DISTORTION_TYPES, "profiles": profiles}, f, separators=(",", ":"))
+    print(f"Wrote {len(profiles)} profiles to {output}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Pretrain GA distortion profiles for Approach 3")
+    parser.add_argument("--output", default="distortion_profiles.json")
+    parser.add_argument("--min-unchanged-weights", type=float, nargs="+", default=[30.0, 40.0, 50.0, 60.0, 70.0])
+    parser.add_argument("--alphas", type=float, nargs="+", default=[0.5])
+    parser.add_argument("--samples", type=int, default=3, help="Guide texts per method in the corpus")
+    parser.add_argument("--generations", type=int, default=GUIDE_GENERATIONS)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    pretrain(api_key, args.output, args.min_unchanged_weights, args.alphas,
+             args.samples, args.generations, args.workers, args.seed)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Tests import the project the same way the entry points do, from communication_system
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
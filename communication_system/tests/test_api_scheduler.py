@@ -0,0 +1,88 @@
+import asyncio
+import httpx2
+import openai
+import pytest
+from ga.apiScheduler import RequestScheduler
+
+def scheduler(max_retries=3, **kwargs):
+    return RequestScheduler(requests_per_minute=None, tokens_per_minute=None, max_retries=max_retries,
+                            base_delay=0, max_delay=0, **kwargs)
+
+def connection_error():
+    return openai.APIConnectionError(request=httpx2.Request("GET", "http://localhost"))
+
+def flaky(failures, result="ok"):
+    """A request that fails with a retryable error the first failures times"""
+    calls = []
+
+    def request():
+        calls.append(None)
+        if len(calls) <= failures:
+            raise connection_error()
+        return result
+    return request, calls
+
+def test_retries_transient_errors_until_success():
+    s = scheduler()
+    request, calls = flaky(2)
+    assert s.call("chat.completions", request) == "ok"
+    assert len(calls) == 3
+    assert s.stats()["retries"] == 2 and s.stats()["failures"] == 0
+
+def test_raises_last_error_once_retries_are_used_up():
+    s = scheduler(max_retries=3)
+    request, calls = flaky(10)
+    with pytest.raises(openai.APIConnectionError):
+        s.call("chat.completions", request)
+    assert len(calls) == 4
+    assert s.stats()["retries"] == 3 and s.stats()["failures"] == 1
+
+def test_other_errors_are_not_retried():
+    s = scheduler()
+    calls = []
+
+    def request():
+        calls.append(None)
+        raise ValueError("bad request")
+
+    with pytest.raises(ValueError):
+        s.call("chat.completions", request)
+    assert len(calls) == 1
+    assert s.stats()["retries"] == 0
+
+def test_async_calls_retry_and_await_results():
+    s = scheduler()
+    request, calls = flaky(2)
+
+    async def request_async():
+        return request()
+
+    assert asyncio.run(s.acall("chat.completions", request_async)) == "ok"
+    assert len(calls) == 3
+
+def test_async_calls_raise_once_retries_are_used_up():
+    s = scheduler(max_retries=1)
+    request, calls = flaky(10)
+
+    async def request_async():
+        return request()
+
+    with pytest.raises(openai.APIConnectionError):
+        asyncio.run(s.acall("chat.completions", request_async))
+    assert len(calls) == 2
+
+def test_endpoint_limit_caps_concurrent_requests():
+    s = scheduler(endpoint_limits={"embeddings": 2})
+    running = {"now": 0, "peak": 0}
+
+    async def request():
+        running["now"] += 1
+        running["peak"] = max(running["peak"], running["now"])
+        await asyncio.sleep(0.01)
+        running["now"] -= 1
+
+    async def main():
+        await asyncio.gather(*[s.acall("embeddings.create", request) for _ in range(6)])
+
+    asyncio.run(main())
+    assert running["peak"] == 2
@@ -0,0 +1,69 @@
+import json
+import openai
+import pytest
+from openai_stub_server import serve_in_background
+from modules.communication_module.assistant_registry import AssistantRegistry
+from modules.communication_module.communication_module import get_or_create_assistant
+
+CONFIG = {"name": "Registry Test Assistant", "instructions": "Decrypt the question, then answer it."}
+
+@pytest.fixture
+def stub():
+    server, base_url = serve_in_background(port=0, seed=0)
+    yield server.store, openai.OpenAI(api_key="test", base_url=base_url, max_retries=0)
+    server.shutdown()
+    server.server_close()
+
+def calls(store, endpoint):
+    return store.stats.get(endpoint, 0)
+
+def test_registered_assistant_is_retrieved_without_listing(stub, tmp_path):
+    store, client = stub
+    registry = AssistantRegistry(str(tmp_path / "registry.json"))
+    first = get_or_create_assistant(client, CONFIG, registry)
+    assert calls(store, "assistants.create") == 1
+
+    again = get_or_create_assistant(client, CONFIG, registry)
+    assert again.id == first.id
+    assert calls(store, "assistants.retrieve") == 1
+    assert calls(store, "assistants.list") == 1  # only the first lookup scanned the list
+
+def test_deleted_assistant_falls_back_to_creating_one(stub, tmp_path):
+    store, client = stub
+    path = tmp_path / "registry.json"
+    registry = AssistantRegistry(str(path))
+    stale = get_or_create_assistant(client, CONFIG, registry)
+    del store.assistants[stale.id]
+
+    fresh = get_or_create_assistant(client, CONFIG, registry)
+    assert fresh.id != stale.id
+    assert calls(store, "assistants.create") == 2
+    assert registry.get(CONFIG) == fresh.id
+    assert [entry["assistant_id"] for entry in json.loads(path.read_text()).values()] == [fresh.id]
+
+def test_changed_instructions_update_the_same_named_assistant(stub, tmp_path):
+    store, client = stub
+    registry = AssistantRegistry(str(tmp_path / "registry.json"))
+    assistant = get_or_create_assistant(client, CONFIG, registry)
+    # Someone else edited the assistant since it was registered
+    store.assistants[assistant.id]["instructions"] = "Outdated instructions."
+
+    refreshed = get_or_create_assistant(client, CONFIG, registry)
+    assert refreshed.id == assistant.id
+    assert refreshed.instructions == CONFIG["instructions"]
+    assert calls(store, "assistants.update") == 1
+    assert calls(store, "assistants.create") == 1
+    assert registry.get(CONFIG) == assistant.id
+
+def test_entries_persist_and_are_keyed_by_instructions(tmp_path):
+    path = str(tmp_path / "registry.json")
+    AssistantRegistry(path).put(CONFIG, "asst_saved")
+
+    registry = AssistantRegistry(path)
+    assert registry.get(CONFIG) == "asst_saved"
+    changed = {**CONFIG, "instructions": CONFIG["instructions"] + " Be brief."}
+    assert AssistantRegistry.make_key(changed) != AssistantRegistry.make_key(CONFIG)
+    assert registry.get(changed) is None
+
+    registry.remove(CONFIG)
+    assert AssistantRegistry(path).get(CONFIG) is None
@@ -0,0 +1,95 @@
+import asyncio
+import json
+import threading
+import openai
+import pytest
+from ga.apiScheduler import RequestScheduler, ScheduledClient
+from openai_stub_server import serve_in_background
+from modules.communication_module.batch_runner import RUNS_ENDPOINT, BatchRunner, completed_ids
+
+def write_lines(path, lines):
+    path.write_text("".join(lines))
+
+def test_completed_ids_skips_failed_and_truncated_records(tmp_path):
+    path = tmp_path / "results.jsonl"
+    write_lines(path, [json.dumps({"id": "a", "status": "ok"}) + "\n",
+                       json.dumps({"id": "b", "status": "error"}) + "\n",
+                       '{"id": "c", "status": "o'])
+    assert completed_ids(str(path)) == {"a"}
+    assert completed_ids(str(tmp_path / "missing.jsonl")) == set()
+
+@pytest.fixture
+def stub():
+    server, base_url = serve_in_background(port=0, seed=0, run_seconds=0.5, poll_interval_ms=50)
+    yield server, base_url
+    server.shutdown()
+    server.server_close()
+
+def runner(base_url, parallelism):
+    client = ScheduledClient(openai.AsyncOpenAI(api_key="test", base_url=base_url, max_retries=0),
+                             RequestScheduler())
+    return BatchRunner(client, "test", parallelism, base_url)
+
+def items(count):
+    return [{"id": str(i), "question": f"What is {i} plus {i}?", "method": "1", "approach": "1",
+             "min_unchanged_weight": None} for i in range(count)]
+
+def track_runs_in_flight(store):
+    """Wrap the stub's run handlers to record the most runs queued or in progress at once"""
+    in_flight, lock, peak = set(), threading.Lock(), [0]
+    create_run, retrieve_run = store.create_run, store.retrieve_run
+
+    def tracked_create(thread_id, body):
+        run = create_run(thread_id, body)
+        with lock:
+            in_flight.add(run["id"])
+            peak[0] = max(peak[0], len(in_flight))
+        return run
+
+    def tracked_retrieve(run_id):
+        run = retrieve_run(run_id)
+        if run["status"] == "completed":
+            with lock:
+                in_flight.discard(run_id)
+        return run
+
+    store.create_run, store.retrieve_run = tracked_create, tracked_retrieve
+    return peak
+
+def test_resume_appends_after_a_truncated_record(stub, tmp_path):
+    server, base_url = stub
+    path = tmp_path / "results.jsonl"
+    write_lines(path, [json.dumps({"id": "0", "status": "ok"}) + "\n", '{"id": "1", "sta'])
+
+    counts = asyncio.run(runner(base_url, 4).run(items(3), str(path)))
+    assert counts == {"ok": 2, "error": 0}
+    lines = path.read_text().splitlines()
+    assert lines[1] == '{"id": "1", "sta'
+    assert sorted(json.loads(line)["id"] for line in lines[2:]) == ["1", "2"]
+    assert completed_ids(str(path)) == {"0", "1", "2"}
+
+def test_parallelism_above_the_default_runs_cap_raises_runs_in_flight(stub, tmp_path):
+    server, base_url = stub
+    peak = track_runs_in_flight(server.store)
+    batch = runner(base_url, 16)
+    assert batch.client.scheduler._limit(RUNS_ENDPOINT) == 16
+
+    counts = asyncio.run(batch.run(items(16), str(tmp_path / "results.jsonl")))
+    assert counts == {"ok": 16, "error": 0}
+    assert peak[0] > 8
+
+def test_runs_cap_is_never_lowered():
+    scheduler = RequestScheduler(endpoint_limits={RUNS_ENDPOINT: 32, "embeddings": None})
+    scheduler.raise_endpoint_limit(RUNS_ENDPOINT, 16)
+    scheduler.raise_endpoint_limit("embeddings", 4)
+    assert scheduler._limit(f"{RUNS_ENDPOINT}.create") == 32
+    assert scheduler._limit("embeddings") is None
+
+def test_aes_items_get_a_fresh_iv_under_the_run_key():
+    batch = BatchRunner(None)
+    first, second = batch.message_keys("3"), batch.message_keys("3")
+    assert first["aes"]["key"] == second["aes"]["key"] == batch.encryption_keys["3"]["aes"]["key"]
+    assert first["aes"]["iv"] != second["aes"]["iv"]
+    # The run's key set itself is left alone, so the cell's guide text stays valid
+    assert batch.encryption_keys["3"]["aes"]["iv"] not in (first["aes"]["iv"], second["aes"]["iv"])
+    assert batch.message_keys("4") is batch.encryption_keys["4"]
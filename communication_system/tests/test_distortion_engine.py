@@ -0,0 +1,89 @@
+import numpy as np
+import pytest
+from ga.distortionFuntions import (
+    DISTORTION_TYPES,
+    apply_distortion,
+    assign_distortions,
+    distort_text,
+    distort_texts,
+    keyboard_adjacent,
+    punctuation,
+    symbol_map
+)
+
+def only(distortion_type):
+    return {t: (100.0 if t == distortion_type else 0.0) for t in DISTORTION_TYPES}
+
+def rng(seed=0):
+    return np.random.default_rng(seed)
+
+def test_unchanged_weights_return_the_text():
+    text = "The key is Alpha Bravo 1234."
+    assert distort_text(text, only("unchanged"), rng=rng()) == text
+
+def test_capitals_are_never_distorted():
+    assert distort_text("Hello World", only("capitalization"), rng=rng()) == "HELLO WORLD"
+    for distortion_type in DISTORTION_TYPES:
+        assignments = assign_distortions("ABC def GHI", only(distortion_type), rng=rng())
+        assert all(assignments[i] == "unchanged" for i, char in enumerate("ABC def GHI") if char.isupper())
+
+def test_blanks_are_kept():
+    assert distort_text("ab cd", only("repeat"), rng=rng()) == "aabb ccdd"
+
+def test_swaps_alternate_along_a_run():
+    # A swapped pair consumes the next position, so positions 0 and 2 swap and the
+    # last character has no successor
+    assert distort_text("abcde", only("swap"), rng=rng()) == "badce"
+    assert distort_text("abcdef", only("swap"), rng=rng()) == "badcfe"
+
+def test_swaps_skip_a_following_capital():
+    assert distort_text("aBcd", only("swap"), rng=rng()) == "aBdc"
+
+def test_replacements_come_from_the_tables():
+    text = "abcdefghijklmnopqrstuvwxyz"
+    symbols = distort_texts(text, [only("symbol")] * 20, rng=rng())
+    adjacent = distort_texts(text, [only("adjacent")] * 20, rng=rng())
+    for row in adjacent:
+        assert len(row) == len(text)
+        assert all(c == o or c in keyboard_adjacent.get(o, ()) for c, o in zip(row, text))
+    # Symbols can be several characters long, so compare character sets
+    symbol_chars = set("".join(s for options in symbol_map.values() for s in options))
+    for row in symbols:
+        assert row != text
+        assert set(row) <= symbol_chars | set(text)
+
+def test_type_counts_follow_the_weights():
+    text = "abcdefghij" * 3
+    weights = {"unchanged": 50.0, "capitalization": 20.0, "repeat": 30.0}
+    assignments = assign_distortions(text, weights, rng=rng())
+    assert assignments.count("capitalization") == 6
+    assert assignments.count("repeat") == 9
+    assert assignments.count("unchanged") == 15
+
+def test_truncated_counts_leave_positions_unchanged():
+    # int() truncation can leave positions over; they must stay unchanged, never overflow
+    weights = {"unchanged": 33.3, "capitalization": 33.3, "repeat": 33.4}
+    assignments = assign_distortions("abcdefg", weights, rng=rng())
+    assert assignments.count("capitalization") == 2
+    assert assignments.count("repeat") == 2
+    assert assignments.count("unchanged") == 3
+
+def test_batch_rows_match_single_calls_with_per_row_streams():
+    text = "Decrypt with key Charlie Delta nine"
+    weights = [dict(zip(DISTORTION_TYPES, row)) for row in rng(1).random((5, len(DISTORTION_TYPES)))]
+    batch = distort_texts(text, weights, rng=[rng(seed) for seed in range(5)])
+    singles = [distort_text(text, w, rng=rng(seed)) for seed, w in enumerate(weights)]
+    assert batch == singles
+
+def test_stream_count_must_match_rows():
+    with pytest.raises(ValueError):
+        distort_texts("abc", [only("swap")] * 3, rng=[rng(0), rng(1)])
+
+def test_apply_distortion_takes_a_numpy_generator():
+    assert apply_distortion("a", "symbol", rng=rng(0)) in symbol_map["a"]
+    assert apply_distortion("a", "adjacent", rng=rng(0)) in keyboard_adjacent["a"]
+    assert apply_distortion("a", "punctuation", rng=rng(0))[1] in punctuation
+    assert [apply_distortion("s", "insert", rng=rng(5)) for _ in range(3)] == \
+        [apply_distortion("s", "insert", rng=rng(5)) for _ in range(3)]
+    assert apply_distortion("A", "symbol", rng=rng(0)) == "A"
+    assert apply_distortion("b", "repeat") == "bb"
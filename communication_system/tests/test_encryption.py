@@ -0,0 +1,67 @@
+import io
+import string
+import pytest
+from Crypto.Cipher import AES, DES, ChaCha20
+from modules.communication_module.communication_encryptor import (
+    ENCRYPTION_METHODS,
+    _caesar_shift_char,
+    caesar_encrypt,
+    caesar_table,
+    encrypt_question,
+    encrypt_questions,
+    encrypt_stream,
+    generate_encryption_keys
+)
+
+QUESTIONS = ["What is the capital of France?", "", "short", "exactly 16 bytes", "Ünïcödé — naïve café?"]
+
+@pytest.fixture
+def keys():
+    return generate_encryption_keys()
+
+@pytest.mark.parametrize("method", list(ENCRYPTION_METHODS))
+def test_batch_matches_one_at_a_time(method, keys):
+    assert encrypt_questions(QUESTIONS, method, keys) == [encrypt_question(q, method, keys) for q in QUESTIONS]
+
+@pytest.mark.parametrize("shift", range(1, 26))
+def test_caesar_table_matches_the_formula(shift):
+    letters = string.ascii_letters
+    assert letters.translate(caesar_table(shift)) == "".join(_caesar_shift_char(c, shift) for c in letters)
+    assert caesar_encrypt("Hi, Zé!", shift) == "".join(
+        _caesar_shift_char(c, shift) if c.isalpha() else c for c in "Hi, Zé!")
+
+def test_ciphertexts_decrypt_to_the_question(keys):
+    for question in QUESTIONS:
+        des = DES.new(keys["des"], DES.MODE_ECB).decrypt(bytes.fromhex(encrypt_question(question, "2", keys)))
+        assert des.decode().rstrip(" ") == question.rstrip(" ")
+
+        aes = bytes.fromhex(encrypt_question(question, "3", keys))
+        assert aes[:16] == keys["aes"]["iv"]
+        plain = AES.new(keys["aes"]["key"], AES.MODE_CBC, aes[:16]).decrypt(aes[16:])
+        assert plain[:-plain[-1]].decode() == question
+
+        chacha = ChaCha20.new(key=keys["chacha20"]["key"], nonce=keys["chacha20"]["nonce"])
+        assert chacha.decrypt(bytes.fromhex(encrypt_question(question, "4", keys))).decode() == question
+
+def test_unknown_method_passes_questions_through(keys):
+    assert encrypt_questions(QUESTIONS, "9", keys) == QUESTIONS
+
+LONG_TEXT = "The quick brown fox jumps over the lazy dog. Ünïcödé — naïve café! " * 40
+
+@pytest.mark.parametrize("method", list(ENCRYPTION_METHODS) + ["9"])
+@pytest.mark.parametrize("chunk_size", [1, 3, 7, 8, 16, 100, 1 << 16])
+def test_stream_matches_whole_text(method, chunk_size, keys):
+    whole = encrypt_question(LONG_TEXT, method, keys)
+    assert "".join(encrypt_stream(LONG_TEXT, method, keys, chunk_size)) == whole
+    # Byte chunks split multi-byte characters at most of these sizes
+    assert "".join(encrypt_stream(io.BytesIO(LONG_TEXT.encode()), method, keys, chunk_size)) == whole
+    assert "".join(encrypt_stream(io.StringIO(LONG_TEXT), method, keys, chunk_size)) == whole
+
+@pytest.mark.parametrize("method", list(ENCRYPTION_METHODS))
+def test_stream_accepts_uneven_chunks(method, keys):
+    pieces = [LONG_TEXT[:5], LONG_TEXT[5:6], "", LONG_TEXT[6:500], LONG_TEXT[500:]]
+    assert "".join(encrypt_stream(pieces, method, keys)) == encrypt_question(LONG_TEXT, method, keys)
+
+@pytest.mark.parametrize("method", list(ENCRYPTION_METHODS))
+def test_stream_of_empty_text(method, keys):
+    assert "".join(encrypt_stream("", method, keys)) == encrypt_question("", method, keys)
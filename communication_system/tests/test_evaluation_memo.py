@@ -0,0 +1,42 @@
+from ga.fitnessBackends import NgramPrivacyBackend, TableInversionUsabilityBackend
+from ga.gaDistorter import GeneticTextDistorter
+from ga.gaOperations import Individual
+
+WEIGHTS_A = {"unchanged": 60.0, "swap": 25.0, "repeat": 15.0}
+WEIGHTS_B = {"unchanged": 50.0, "swap": 30.0, "repeat": 20.0}
+
+def distorter():
+    return GeneticTextDistorter(api_key=None, seed=0, privacy_backend=NgramPrivacyBackend(),
+                                usability_backend=TableInversionUsabilityBackend())
+
+def evaluate(distorter, individuals, replies):
+    """Drive _evaluation_steps, answering its score request with replies; return what it asked for"""
+    steps = distorter._evaluation_steps(individuals, "text")
+    try:
+        kind, (requested, _) = next(steps)
+    except StopIteration:
+        return []
+    assert kind == "score"
+    try:
+        steps.send(replies[:len(requested)])
+    except StopIteration:
+        pass
+    return requested
+
+def test_duplicates_in_a_generation_are_scored_once():
+    d = distorter()
+    individuals = [Individual(weights=dict(WEIGHTS_A)), Individual(weights=dict(WEIGHTS_A)),
+                   Individual(weights=dict(WEIGHTS_B))]
+    requested = evaluate(d, individuals, [(0.5, 0.4, 0.6), (0.7, 0.8, 0.6)])
+    assert len(requested) == 2
+    assert [ind.fitness for ind in individuals] == [0.5, 0.5, 0.7]
+    assert d.evaluation_stats == {"evaluations": 2, "memo_hits": 1}
+
+def test_genomes_seen_earlier_in_the_run_are_not_rescored():
+    d = distorter()
+    evaluate(d, [Individual(weights=dict(WEIGHTS_A))], [(0.5, 0.4, 0.6)])
+    # Within the memo resolution of an earlier genome
+    repeat = Individual(weights={**WEIGHTS_A, "swap": WEIGHTS_A["swap"] + 0.001})
+    assert evaluate(d, [repeat], []) == []
+    assert (repeat.fitness, repeat.privacy_score, repeat.usability_score) == (0.5, 0.4, 0.6)
+    assert d.evaluation_stats == {"evaluations": 1, "memo_hits": 1}
@@ -0,0 +1,36 @@
+import asyncio
+import openai
+import pytest
+from ga.apiScheduler import RequestScheduler, ScheduledClient
+from openai_stub_server import serve_in_background
+from modules.instruction_module.profile_cache import DistortionProfileCache
+from modules.instruction_module import instruction_module
+from modules.evaluation_module.evaluation_runner import EvaluationRunner, build_matrix, load_records, summarize
+
+QUESTIONS = [{"id": "capital", "question": "What is the capital of France?", "expected": ["Paris"]}]
+
+@pytest.fixture
+def stub(monkeypatch):
+    server, base_url = serve_in_background(port=0, seed=0, poll_interval_ms=10)
+    # Train Approach 3 guide texts afresh rather than reusing a process-wide profile
+    monkeypatch.setattr(instruction_module, "PROFILE_CACHE", DistortionProfileCache())
+    yield base_url
+    server.shutdown()
+    server.server_close()
+
+def test_guide_generation_time_is_reported_per_cell(stub, tmp_path):
+    client = ScheduledClient(openai.AsyncOpenAI(api_key="test", base_url=stub, max_retries=0),
+                             RequestScheduler())
+    runner = EvaluationRunner(client, "test", 4, stub)
+    items = build_matrix(QUESTIONS, approaches=["1", "3"], methods=["1"], min_unchanged_weights=[50.0],
+                         repeats=2)
+    checkpoint = str(tmp_path / "results.jsonl")
+    asyncio.run(runner.run(items, checkpoint))
+
+    records = load_records(checkpoint)
+    assert len(records) == 4
+    assert all(record["guide_seconds"] is not None for record in records)
+    cells = {cell["approach"]: cell for cell in summarize(records)}
+    # Approach 3 trains the GA for its guide text; the trials themselves do not include that time
+    assert cells["3"]["guide_seconds"] > cells["1"]["guide_seconds"]
+    assert cells["3"]["guide_seconds"] == runner.guide_seconds[("3", "1", 50.0)]
@@ -0,0 +1,16 @@
+from modules.evaluation_module.evaluation_runner import answer_correct, decryption_score
+
+def test_answer_in_the_decrypted_question_does_not_count():
+    response = "Decrypted question: Is the answer 144 or 12?\nI am not sure."
+    assert answer_correct(response, ["144"]) is False
+    assert answer_correct("decrypted QUESTION: Is it 144?\nIt is 144.", ["144"]) is True
+
+def test_answer_matches_whole_words_only():
+    assert answer_correct("The answer is Paris.", ["Paris"]) is True
+    assert answer_correct("The answer is Parisian.", ["Paris"]) is False
+    assert answer_correct("Anything", []) is None
+
+def test_decryption_score_reads_the_marker_line():
+    response = "Decrypted question: What is the capital of France?\nParis."
+    assert decryption_score(response, "What is the capital of France?") == 1.0
+    assert decryption_score("Decrypted question: Wxyz\nParis.", "What is the capital of France?") < 0.5
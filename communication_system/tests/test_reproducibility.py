@@ -0,0 +1,48 @@
+import numpy as np
+from ga.distortionFuntions import DISTORTION_TYPES, distort_texts
+from ga.fitnessBackends import NgramPrivacyBackend, TableInversionUsabilityBackend
+from ga.gaDistorter import GeneticTextDistorter
+
+TEXT = "Use AES with key Alpha Bravo Charlie one two three four"
+
+def train(seed, **kwargs):
+    distorter = GeneticTextDistorter(
+        api_key=None,
+        population_size=8,
+        seed=seed,
+        min_unchanged_weight=50.0,
+        privacy_backend=NgramPrivacyBackend(),
+        usability_backend=TableInversionUsabilityBackend(),
+        **kwargs
+    )
+    return distorter.train(TEXT, generations=3)
+
+def test_seeded_generator_reproduces_distortions():
+    weights = np.random.default_rng(0).random((6, len(DISTORTION_TYPES)))
+    first = distort_texts(TEXT, weights, rng=np.random.default_rng(42))
+    second = distort_texts(TEXT, weights, rng=np.random.default_rng(42))
+    assert first == second
+
+def test_row_result_does_not_depend_on_the_rest_of_the_batch():
+    weights = np.random.default_rng(0).random((4, len(DISTORTION_TYPES)))
+    streams = lambda: [np.random.default_rng(seed) for seed in range(4)]
+    full = distort_texts(TEXT, weights, rng=streams())
+    partial = distort_texts(TEXT, weights[:2], rng=streams()[:2])
+    assert full[:2] == partial
+
+def test_common_random_numbers_give_equal_weights_equal_texts():
+    weights = np.tile(np.random.default_rng(0).random(len(DISTORTION_TYPES)), (5, 1))
+    texts = distort_texts(TEXT, weights, rng=np.random.default_rng(3), common_random_numbers=True)
+    assert len(set(texts)) == 1
+
+def test_seeded_training_is_reproducible():
+    first, second = train(7), train(7)
+    assert first["weights"] == second["weights"]
+    assert first["reward"] == second["reward"]
+    assert first["text"] == second["text"]
+
+def test_seeded_training_is_reproducible_with_common_random_numbers():
+    assert train(7, common_random_numbers=True)["weights"] == train(7, common_random_numbers=True)["weights"]
+
+def test_different_seeds_explore_differently():
+    assert train(1)["weights"] != train(2)["weights"]
@@ -0,0 +1,52 @@
+import pytest
+from openai_stub_server import serve_in_background
+from ga.fitnessBackends import NgramPrivacyBackend, TableInversionUsabilityBackend
+from ga.gaDistorter import GeneticTextDistorter
+
+TEXT = "Shift every letter of the question back by three places to decrypt it."
+
+@pytest.fixture(scope="module")
+def base_url():
+    server, base_url = serve_in_background(port=0, seed=0)
+    yield base_url
+    server.shutdown()
+    server.server_close()
+
+def api_distorter(base_url, **kwargs):
+    # Embeddings and reconstructions both go to the stub, one request per call counted
+    return GeneticTextDistorter(api_key="test", seed=0, base_url=base_url, **kwargs)
+
+@pytest.mark.parametrize("budget", [3, 5, 12, 30])
+def test_api_budget_bounds_every_request(base_url, budget):
+    distorter = api_distorter(base_url)
+    results = distorter.train(TEXT, generations=5, max_api_calls=budget)
+    assert distorter.fitness_calculator.api_calls <= budget
+    assert results['stopping']['api_calls'] == distorter.fitness_calculator.api_calls
+    assert results['stopping']['rule'] == "api_budget"
+
+def test_small_budget_shrinks_the_initial_population(base_url):
+    distorter = api_distorter(base_url)
+    # One reference embedding, one batched embedding and three reconstructions
+    results = distorter.train(TEXT, generations=5, max_api_calls=5)
+    assert results['stopping']['evaluations'] == 3
+    assert results['stopping']['generations_run'] == 0
+
+def test_budget_too_small_for_one_individual_fails_fast(base_url):
+    distorter = api_distorter(base_url)
+    with pytest.raises(ValueError, match="api_budget"):
+        distorter.train(TEXT, max_api_calls=2)
+    assert distorter.fitness_calculator.api_calls == 0
+
+def test_expired_deadline_fails_before_any_request(base_url):
+    distorter = api_distorter(base_url)
+    with pytest.raises(ValueError, match="deadline"):
+        distorter.train(TEXT, deadline=0.0)
+    assert distorter.fitness_calculator.api_calls == 0
+    assert distorter.evaluation_stats['evaluations'] == 0
+
+def test_local_backends_are_not_limited_by_the_budget():
+    distorter = GeneticTextDistorter(api_key=None, seed=0, privacy_backend=NgramPrivacyBackend(),
+                                     usability_backend=TableInversionUsabilityBackend())
+    results = distorter.train(TEXT, generations=3, max_api_calls=0)
+    assert results['stopping']['rule'] == "generations"
+    assert results['stopping']['api_calls'] == 0
@@ -0,0 +1,34 @@
+import numpy as np
+from ga.fitnessBackends import NgramPrivacyBackend, TableInversionUsabilityBackend
+from ga.gaDistorter import GeneticTextDistorter
+
+TEXT = "Shift every letter of the question back by three places to decrypt it."
+
+def surrogate_distorter(**kwargs):
+    return GeneticTextDistorter(api_key=None, seed=0, surrogate_top_k=2, surrogate_explore=1,
+                                privacy_backend=NgramPrivacyBackend(),
+                                usability_backend=TableInversionUsabilityBackend(), **kwargs)
+
+def test_surrogate_is_fit_on_the_evaluated_texts():
+    distorter = surrogate_distorter()
+    distorter.train(TEXT, generations=3)
+    surrogate = distorter.surrogate
+    assert len(surrogate._features) == len(surrogate._targets) > 0
+
+    # Refitting spends no random draws and reuses the texts behind each fitness
+    individuals = [ind for ind in [distorter.best_solution] if ind.evaluated]
+    spawned = distorter._seed_sequence.n_children_spawned
+    observed = len(surrogate._features)
+    distorter._observe_evaluations(individuals, TEXT)
+    assert distorter._seed_sequence.n_children_spawned == spawned
+
+    row = surrogate._features[observed]
+    expected = surrogate.text_features(individuals, TEXT, [individuals[0].distorted_text])[0]
+    np.testing.assert_allclose(row, expected)
+    assert surrogate._targets[observed] == individuals[0].fitness
+
+def test_surrogate_training_is_reproducible():
+    first = surrogate_distorter().train(TEXT, generations=3)
+    second = surrogate_distorter().train(TEXT, generations=3)
+    assert first['weights'] == second['weights']
+    assert first['convergence'] == second['convergence']